@@ -0,0 +1,391 @@
+"""
+Binary Change Codec for OfflineSync
+Compact encoding of Change records: author ids and keys are interned into
+tables, vector clocks are delta-encoded against the previous record, and
+change ids are derived from (author, counter) instead of stored
+
+The codec is pure Python, so the win is mostly size (about 8x smaller
+than the JSON-lines log). Against the C-accelerated json module it is
+only modestly faster (roughly 1.1x to encode, 1.3x to decode in
+tests/benchmarks/bench_offline_change_codec.py); the hot paths read
+one-byte uvarints inline and parse all values of a decode() call with
+a single json.loads to get there.
+"""
+
+import json
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+MAGIC = b'SCC\x01'
+
+# Record tags; every record is tag, uvarint body length, body
+TAG_AUTHOR = 0x01  # body: author id (utf-8), appended to the author table
+TAG_KEY = 0x02     # body: key (utf-8), appended to the key table
+TAG_CHANGE = 0x03
+
+OPERATIONS = ('update', 'create', 'delete')
+OPERATION_CODES = {name: code for code, name in enumerate(OPERATIONS)}
+
+# Change flags (bits 0-1 hold the operation code)
+FLAG_VALUE = 0x04       # value present (JSON)
+FLAG_COLLECTION = 0x08  # collection other than 'default'
+FLAG_ID = 0x10          # id that make_change_id() does not reproduce
+
+DEFAULT_COLLECTION = 'default'
+
+_DOUBLE = struct.Struct('<d')
+
+# One encoder instance: json.dumps with non-default separators builds a new one per call
+_encode_json = json.JSONEncoder(separators=(',', ':')).encode
+
+
+def make_change_id(author: str, counter: int) -> str:
+    """
+    Change id from the author and its counter
+
+    An author's counter (its own vector clock entry) increases with every
+    change it makes, so the pair is unique without hashing anything.
+    """
+    return f'{author}:{counter}'
+
+
+def _put_uvarint(out: bytearray, n: int):
+    while n > 0x7f:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _uvarint(n: int) -> bytes:
+    out = bytearray()
+    _put_uvarint(out, n)
+    return bytes(out)
+
+
+# Encodings of every one- and two-byte uvarint, indexed by value
+_SMALL_UVARINTS = [_uvarint(n) for n in range(1 << 14)]
+
+
+def _get_uvarint(buf: bytes, pos: int) -> Tuple[int, int]:
+    byte = buf[pos]
+    pos += 1
+    if byte < 0x80:
+        return byte, pos
+    result = byte & 0x7f
+    shift = 7
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _put_bytes(out: bytearray, data: bytes):
+    _put_uvarint(out, len(data))
+    out += data
+
+
+def _put_record(out: bytearray, tag: int, body: bytes):
+    out.append(tag)
+    _put_uvarint(out, len(body))
+    out += body
+
+
+class ChangeEncoder:
+    """
+    Stateful encoder for one change stream (a log file or a sync batch)
+
+    The first encode() output starts with MAGIC. Authors and keys are
+    written once, as table records ahead of the first change that uses
+    them; each change then refers to them by index. The encoder keeps a
+    reference to the last change's vector_clock, which must not be
+    mutated afterwards (Change clocks never are).
+
+    Change layout (uvarints unless noted):
+        flags (byte), author index, key index, timestamp (float64),
+        clock entries changed since the previous change: count, then
+        (author index, zigzag difference) pairs,
+        clock entries dropped since the previous change: count, then
+        author indexes,
+        [collection], [value as JSON], [id]  -- present per flags
+    """
+
+    def __init__(self):
+        self.authors: Dict[str, int] = {}
+        self.keys: Dict[str, int] = {}
+        self.clock: Dict[str, int] = {}
+        self.started = False
+
+    def _intern(self, out: bytearray, table: Dict[str, int], tag: int, name: str) -> int:
+        index = table.get(name)
+        if index is None:
+            index = table[name] = len(table)
+            _put_record(out, tag, name.encode())
+        return index
+
+    def encode(self, change: Dict[str, Any]) -> bytes:
+        """Encode one change (in Change.to_dict() form), with any new table records"""
+        try:
+            flags = OPERATION_CODES[change['operation']]
+        except KeyError:
+            raise ValueError(f"Unknown operation: {change['operation']}") from None
+        # Serialize the value first: nothing below may fail once tables change
+        value = change['value']
+        if value is not None:
+            flags |= FLAG_VALUE
+            value_json = _encode_json(value).encode()
+        collection = change['collection']
+        if collection != DEFAULT_COLLECTION:
+            flags |= FLAG_COLLECTION
+        author = change['author']
+        vector_clock = change['vector_clock']
+        if change['id'] != make_change_id(author, vector_clock.get(author, 0)):
+            flags |= FLAG_ID
+
+        out = bytearray()
+        if not self.started:
+            out += MAGIC
+            self.started = True
+
+        # Interning may emit table records ahead of the change record
+        authors = self.authors
+        author_index = self._intern(out, authors, TAG_AUTHOR, author)
+        key_index = self._intern(out, self.keys, TAG_KEY, change['key'])
+
+        changed = []
+        previous = self.clock
+        for clock_author, counter in vector_clock.items():
+            difference = counter - previous.get(clock_author, 0)
+            if difference or clock_author not in previous:
+                changed.append((self._intern(out, authors, TAG_AUTHOR, clock_author), difference))
+        dropped = [authors[name] for name in previous if name not in vector_clock]
+        self.clock = vector_clock
+
+        small = _SMALL_UVARINTS
+        body = bytearray((flags,))
+        body += small[author_index] if author_index < 0x4000 else _uvarint(author_index)
+        body += small[key_index] if key_index < 0x4000 else _uvarint(key_index)
+        body += _DOUBLE.pack(change['timestamp'])
+        _put_uvarint(body, len(changed))
+        for index, difference in changed:
+            # zigzag: small negative differences stay small
+            zigzag = difference << 1 if difference >= 0 else (-difference << 1) - 1
+            body += small[index] if index < 0x4000 else _uvarint(index)
+            body += small[zigzag] if zigzag < 0x4000 else _uvarint(zigzag)
+        _put_uvarint(body, len(dropped))
+        for index in dropped:
+            _put_uvarint(body, index)
+        if flags & FLAG_COLLECTION:
+            _put_bytes(body, collection.encode())
+        if flags & FLAG_VALUE:
+            _put_bytes(body, value_json)
+        if flags & FLAG_ID:
+            _put_bytes(body, change['id'].encode())
+
+        _put_record(out, TAG_CHANGE, body)
+        return bytes(out)
+
+
+class ChangeDecoder:
+    """
+    Decoder for a stream written by ChangeEncoder
+
+    decode() consumes whole records only: a record cut short by a crash is
+    left unconsumed and reported through the returned byte count, so the
+    caller can truncate the file there before appending again. A malformed
+    record (unknown tag, table index out of range, bad value JSON) ends
+    decoding the same way, with the reason in error; the decoder is left at
+    the last good record, so its encoder() continues from there. Values of
+    one decode() call are parsed with a single json.loads.
+    """
+
+    def __init__(self):
+        self.authors: List[str] = []
+        self.keys: List[str] = []
+        self.clock: Dict[str, int] = {}
+        self.started = False
+        self.error: Optional[str] = None
+
+    def decode(self, data: bytes) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Decode every complete record in data
+
+        Returns:
+            (changes in Change.to_dict() form, bytes consumed)
+        """
+        changes: List[Dict[str, Any]] = []
+        pos = 0
+        if not self.started:
+            if len(data) < len(MAGIC):
+                return changes, 0
+            if data[:len(MAGIC)] != MAGIC:
+                raise ValueError("Not a change stream (bad magic)")
+            pos = len(MAGIC)
+            self.started = True
+
+        # Decoder state to roll back to if a value turns out to be corrupt
+        initial = (pos, self.clock, len(self.authors), len(self.keys))
+        # (change, JSON value, record offset) for changes that carry a value
+        with_values: List[Tuple[Dict[str, Any], bytes, int]] = []
+        end = len(data)
+        while pos < end:
+            try:
+                tag = data[pos]
+                length = data[pos + 1]
+                start = pos + 2
+                if length >= 0x80:
+                    length, start = _get_uvarint(data, pos + 1)
+            except IndexError:
+                break
+            stop = start + length
+            if stop > end:
+                break
+
+            clock = self.clock
+            try:
+                if tag == TAG_CHANGE:
+                    changes.append(self._decode_change(data, start, pos, with_values))
+                elif tag == TAG_AUTHOR:
+                    self.authors.append(data[start:stop].decode())
+                elif tag == TAG_KEY:
+                    self.keys.append(data[start:stop].decode())
+                else:
+                    raise ValueError(f"unknown record tag {tag:#x}")
+            except (IndexError, KeyError, ValueError) as e:
+                self.clock = clock
+                self.error = f"Corrupt record at offset {pos}: {e.__class__.__name__}: {e}"
+                break
+            pos = stop
+
+        if with_values:
+            try:
+                values = json.loads(b'[' + b','.join(value for _, value, _ in with_values) + b']')
+                if len(values) != len(with_values):
+                    raise ValueError("value count mismatch")
+            except ValueError:
+                return self._salvage(data, initial, with_values)
+            for (change, _, _), value in zip(with_values, values):
+                change['value'] = value
+
+        return changes, pos
+
+    def _salvage(self, data: bytes, initial: tuple,
+                 with_values: List[Tuple[Dict[str, Any], bytes, int]]) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Redo a decode() whose batched value parse failed, stopping at the first bad value
+
+        The decoder is rolled back to where decode() started and decodes
+        again up to the record holding the bad value, which is reported in
+        error and left unconsumed with everything after it.
+        """
+        for _, value, pos in with_values:
+            try:
+                json.loads(value)
+            except ValueError as e:
+                error = f"Corrupt record at offset {pos}: bad value JSON: {e}"
+                break
+        else:
+            error, pos = "Corrupt value JSON", with_values[0][2]
+
+        start, self.clock, authors, keys = initial
+        del self.authors[authors:], self.keys[keys:]
+        changes, consumed = self.decode(data[start:pos])
+        self.error = error
+        return changes, start + consumed
+
+    def _decode_change(self, buf: bytes, pos: int, record: int,
+                       with_values: List[Tuple[Dict[str, Any], bytes, int]]) -> Dict[str, Any]:
+        # Hot path: uvarints below 0x80 are read inline, longer ones via _get_uvarint
+        authors = self.authors
+        flags = buf[pos]
+        author_index = buf[pos + 1]
+        pos += 2
+        if author_index >= 0x80:
+            author_index, pos = _get_uvarint(buf, pos - 1)
+        key_index = buf[pos]
+        pos += 1
+        if key_index >= 0x80:
+            key_index, pos = _get_uvarint(buf, pos - 1)
+        timestamp, = _DOUBLE.unpack_from(buf, pos)
+        pos += 8
+
+        # Each change gets its own clock dict, shared with self.clock until the next one
+        clock = self.clock.copy()
+        count = buf[pos]
+        pos += 1
+        if count >= 0x80:
+            count, pos = _get_uvarint(buf, pos - 1)
+        for _ in range(count):
+            index = buf[pos]
+            pos += 1
+            if index >= 0x80:
+                index, pos = _get_uvarint(buf, pos - 1)
+            zigzag = buf[pos]
+            pos += 1
+            if zigzag >= 0x80:
+                zigzag, pos = _get_uvarint(buf, pos - 1)
+            name = authors[index]
+            clock[name] = clock.get(name, 0) + ((zigzag >> 1) ^ -(zigzag & 1))
+        count = buf[pos]
+        pos += 1
+        if count:
+            if count >= 0x80:
+                count, pos = _get_uvarint(buf, pos - 1)
+            for _ in range(count):
+                index, pos = _get_uvarint(buf, pos)
+                del clock[authors[index]]
+        self.clock = clock
+
+        author = authors[author_index]
+        change = {
+            'id': None,
+            'timestamp': timestamp,
+            'operation': OPERATIONS[flags & 0x03],
+            'collection': DEFAULT_COLLECTION,
+            'key': self.keys[key_index],
+            'value': None,
+            'author': author,
+            'vector_clock': clock,
+        }
+        if flags & FLAG_COLLECTION:
+            length, pos = _get_uvarint(buf, pos)
+            change['collection'] = buf[pos:pos + length].decode()
+            pos += length
+        if flags & FLAG_VALUE:
+            length, pos = _get_uvarint(buf, pos)
+            with_values.append((change, buf[pos:pos + length], record))
+            pos += length
+        if flags & FLAG_ID:
+            length, pos = _get_uvarint(buf, pos)
+            change['id'] = buf[pos:pos + length].decode()
+        else:
+            change['id'] = f'{author}:{clock.get(author, 0)}'
+        return change
+
+    def encoder(self) -> ChangeEncoder:
+        """Encoder that continues this stream (for appending to a decoded log)"""
+        encoder = ChangeEncoder()
+        encoder.authors = {name: index for index, name in enumerate(self.authors)}
+        encoder.keys = {name: index for index, name in enumerate(self.keys)}
+        encoder.clock = dict(self.clock)
+        encoder.started = self.started
+        return encoder
+
+
+def encode_changes(changes: List[Dict[str, Any]]) -> bytes:
+    """Encode a batch of changes as one self-contained stream"""
+    encoder = ChangeEncoder()
+    return b''.join(encoder.encode(change) for change in changes)
+
+
+def decode_changes(data: bytes, decoder: Optional[ChangeDecoder] = None) -> List[Dict[str, Any]]:
+    """Decode a complete stream from encode_changes()"""
+    decoder = decoder or ChangeDecoder()
+    changes, consumed = decoder.decode(data)
+    if decoder.error:
+        raise ValueError(decoder.error)
+    if consumed != len(data):
+        raise ValueError(f"Truncated change stream ({len(data) - consumed} trailing bytes)")
+    return changes
@@ -0,0 +1,246 @@
+"""
+Group-Commit Change Log for OfflineSync
+Keeps the change log open and commits appended records in batches, with
+one write (and at most one fsync) per batch
+"""
+
+import atexit
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DURABILITY_LEVELS = ('none', 'flush', 'fsync')
+
+# Granularity at which the kernel writes file data back
+PAGE_SIZE = 4096
+
+
+class CommitTicket:
+    """
+    Handle for the batch a record joined
+
+    wait() returns True once the batch is committed, and False on timeout
+    or if the commit failed (error then holds the exception).
+    """
+
+    __slots__ = ('records', 'nbytes', 'first_enqueued', 'error', '_done')
+
+    def __init__(self):
+        self.records: List[bytes] = []
+        self.nbytes = 0
+        self.first_enqueued = 0.0
+        self.error: Optional[BaseException] = None
+        self._done = threading.Event()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout) and self.error is None
+
+    @property
+    def committed(self) -> bool:
+        return self._done.is_set() and self.error is None
+
+
+class GroupCommitLog:
+    """
+    Append-only log with group commit
+
+    Records appended while a batch is open share its commit: the committer
+    thread waits up to flush_interval after the first record of a batch (or
+    until max_batch_bytes), then writes the batch with a single write call.
+
+    Each batch is written with one write call on an unbuffered file. The
+    durability level says what a committed ticket guarantees and whether
+    the owner waits for it:
+    - none:  callers do not wait; records still in a batch are lost if the
+      process dies before the committer writes them (close() and
+      interpreter exit commit them)
+    - flush: callers wait until their batch is handed to the OS, so it
+      survives a process crash and is lost only if the machine dies
+    - fsync: each batch is fsynced before its waiters are released
+
+    A failed write (ENOSPC, EIO) fails its batch: its tickets report the
+    error and the partial write is truncated away. Records may depend on
+    earlier ones (the change codec's tables and clock deltas), so later
+    batches fail with the same error, unwritten, until the owner has
+    rebuilt what was lost and calls truncate(). failed holds the error
+    meanwhile.
+
+    Usage:
+        log = GroupCommitLog(path, durability='fsync', flush_interval=0.002)
+        ticket = log.append(b'{"op": "set"}\\n')
+        ticket.wait()   # durable per the durability level
+    """
+
+    def __init__(self, path: Path, durability: str = 'flush', flush_interval: float = 0.005,
+                 max_batch_bytes: int = 1024 * 1024):
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Unknown durability level: {durability}")
+
+        self.path = Path(path)
+        self.durability = durability
+        self.flush_interval = flush_interval
+        self.max_batch_bytes = max_batch_bytes
+
+        self._file = open(self.path, 'ab', buffering=0)
+        self._offset = self._file.seek(0, os.SEEK_END)
+
+        self._cond = threading.Condition()
+        self._batch = CommitTicket()
+        self._closing = False
+        # Error of the first failed commit since the last truncate()
+        self.failed: Optional[BaseException] = None
+
+        self._metrics = {
+            'records': 0,
+            'commits': 0,
+            'logical_bytes': 0,
+            'write_calls': 0,
+            'fsyncs': 0,
+            'device_bytes': 0,
+            'failed_commits': 0,
+        }
+        # Append-to-commit latency of the oldest record of recent batches
+        self._latencies = deque(maxlen=1024)
+
+        self._committer = threading.Thread(target=self._run, name='offline-sync-change-log', daemon=True)
+        self._committer.start()
+        # The committer is a daemon thread; commit the open batch at interpreter exit
+        atexit.register(self.close)
+
+    def append(self, record: bytes) -> CommitTicket:
+        """Queue one record for the next group commit"""
+        with self._cond:
+            if self._closing:
+                raise ValueError("Change log is closed")
+            batch = self._batch
+            if not batch.records:
+                batch.first_enqueued = time.perf_counter()
+                self._cond.notify()
+            batch.records.append(record)
+            batch.nbytes += len(record)
+            if batch.nbytes >= self.max_batch_bytes:
+                self._cond.notify()
+            return batch
+
+    def sync(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything appended so far is committed; False if that batch failed"""
+        with self._cond:
+            batch = self._batch
+            if not batch.records:
+                return True
+            self._cond.notify()
+        return batch.wait(timeout)
+
+    def truncate(self, size: int) -> None:
+        """
+        Cut the file to size bytes and resume committing after a failure
+
+        Commits everything appended so far first (or fails it, after a
+        failure); the caller must not append meanwhile.
+        """
+        self.sync()
+        os.ftruncate(self._file.fileno(), size)
+        self._offset = size
+        self.failed = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._batch.records and not self._closing:
+                    self._cond.wait()
+                if not self._batch.records:
+                    break
+
+                # Group window: let more records join the batch
+                deadline = self._batch.first_enqueued + self.flush_interval
+                while not self._closing and self._batch.nbytes < self.max_batch_bytes:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batch, self._batch = self._batch, CommitTicket()
+
+            self._commit(batch)
+
+    def _commit(self, batch: CommitTicket):
+        if self.failed is not None:
+            # Written after a lost batch, these records may refer to it
+            batch.error = self.failed
+            self._metrics['failed_commits'] += 1
+            batch._done.set()
+            return
+
+        data = b''.join(batch.records)
+        try:
+            written = 0
+            while written < len(data):
+                written += self._file.write(data[written:])
+            self._metrics['write_calls'] += 1
+            if self.durability == 'fsync':
+                os.fsync(self._file.fileno())
+                self._metrics['fsyncs'] += 1
+                # Each fsync writes back every page the batch touched, including
+                # the partially filled last page that the next batch writes again
+                first_page = self._offset // PAGE_SIZE
+                last_page = (self._offset + batch.nbytes - 1) // PAGE_SIZE
+                self._metrics['device_bytes'] += (last_page - first_page + 1) * PAGE_SIZE
+            else:
+                # Without fsync the kernel coalesces appends before write-back
+                self._metrics['device_bytes'] += batch.nbytes
+        except Exception as e:
+            batch.error = self.failed = e
+            self._metrics['failed_commits'] += 1
+            try:
+                # Drop a partial write so the next batch starts on a record boundary
+                os.ftruncate(self._file.fileno(), self._offset)
+            except OSError:
+                pass
+        else:
+            self._offset += batch.nbytes
+            self._metrics['records'] += len(batch.records)
+            self._metrics['commits'] += 1
+            self._metrics['logical_bytes'] += batch.nbytes
+            self._latencies.append(time.perf_counter() - batch.first_enqueued)
+        finally:
+            batch._done.set()
+
+    def close(self) -> None:
+        """Commit pending records and close the file (safe to call twice)"""
+        atexit.unregister(self.close)
+        with self._cond:
+            if self._closing:
+                return
+            self._closing = True
+            self._cond.notify()
+        self._committer.join()
+        self._file.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Commit counts, write amplification and commit latency"""
+        metrics = dict(self._metrics)
+        commits = metrics['commits']
+        logical = metrics['logical_bytes']
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+        return {
+            'durability': self.durability,
+            'flush_interval_ms': self.flush_interval * 1000,
+            **metrics,
+            'records_per_commit': metrics['records'] / commits if commits else 0.0,
+            # Estimated bytes written to the device per byte of log
+            'write_amplification': metrics['device_bytes'] / logical if logical else 0.0,
+            'commit_latency_ms': {
+                'p50': percentile(0.50),
+                'p99': percentile(0.99),
+                'max': latencies[-1] * 1000 if latencies else 0.0,
+            },
+        }
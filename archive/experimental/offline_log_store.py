@@ -0,0 +1,279 @@
+"""
+Log-Structured Store for OfflineSync
+Append-only record log plus periodic snapshots, so a write costs one
+record instead of a rewrite of all local data
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# (data, vector_clock, tombstones) as held by the CRDT; tombstones map each
+# deleted key to the [author, counter, timestamp] of its delete, or None
+Tombstones = Dict[str, Optional[List[Any]]]
+State = Tuple[Dict[str, Any], Dict[str, int], Tombstones]
+
+SNAPSHOT_VERSION = 1
+
+
+class LogStructuredStore:
+    """
+    Snapshot + generation-numbered record logs
+
+    Files in the storage directory:
+    - snapshot.json: full state, tagged with the log generation that
+      follows it
+    - data.<generation>.log: one compact JSON record per line
+        ["s", key, entry, clock_delta]   set key to entry
+        ["d", key, clock_delta, dot]     delete key (tombstone with its dot)
+        ["c", clock_delta]               vector clock advanced by a merge
+      clock_delta holds only the vector clock entries that changed since
+      the previous record
+
+    Compaction rotates to a new log generation while the owner's lock is
+    held (so no record is lost or duplicated), then writes the snapshot and
+    drops older logs without blocking writers. Loading reads the snapshot
+    and replays logs from its generation on; a torn final record from a
+    crash is truncated away, so appends after a restart load again.
+    """
+
+    def __init__(self, directory: Path, compact_min_bytes: int = 256 * 1024,
+                 compact_ratio: float = 1.0, compact_interval: float = 30.0):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.snapshot_file = self.directory / 'snapshot.json'
+
+        # Compact once the log exceeds both compact_min_bytes and
+        # compact_ratio x the snapshot size; this bounds replay on load
+        self.compact_min_bytes = compact_min_bytes
+        self.compact_ratio = compact_ratio
+        self.compact_interval = compact_interval
+
+        self._lock = threading.Lock()
+        # One compaction at a time, so an older snapshot never replaces a newer one
+        self._compact_lock = threading.Lock()
+        self._log = None
+        self._generation = 0
+        self._log_bytes = 0
+        self._snapshot_bytes = 0
+        self._logged_clock: Dict[str, int] = {}
+
+        self._stop = threading.Event()
+        self._compactor: Optional[threading.Thread] = None
+
+        self._metrics = {
+            'records': 0,
+            'compactions': 0,
+            'replayed': 0,
+            'truncated': 0,
+        }
+
+    def _log_path(self, generation: int) -> Path:
+        return self.directory / f'data.{generation:08d}.log'
+
+    def _log_generations(self) -> List[int]:
+        generations = []
+        for path in self.directory.glob('data.*.log'):
+            try:
+                generations.append(int(path.name.split('.')[1]))
+            except ValueError:
+                continue
+        return sorted(generations)
+
+    def load(self) -> Optional[State]:
+        """
+        Read snapshot and replay logs
+
+        Returns:
+            (data, vector_clock, tombstones), or None if nothing is stored
+        """
+        with self._lock:
+            data: Dict[str, Any] = {}
+            clock: Dict[str, int] = {}
+            tombstones: Tombstones = {}
+            found = False
+
+            snapshot_generation = 0
+            if self.snapshot_file.exists():
+                with open(self.snapshot_file, 'r') as f:
+                    snapshot = json.load(f)
+                data = snapshot.get('data', {})
+                clock = snapshot.get('vector_clock', {})
+                tombstones = snapshot.get('tombstones', {})
+                if isinstance(tombstones, list):
+                    # Written before tombstones carried dots
+                    tombstones = dict.fromkeys(tombstones)
+                snapshot_generation = snapshot.get('generation', 0)
+                self._snapshot_bytes = self.snapshot_file.stat().st_size
+                found = True
+
+            generations = [g for g in self._log_generations() if g >= snapshot_generation]
+            log_bytes = 0
+            for generation in generations:
+                path = self._log_path(generation)
+                with open(path, 'r+b') as f:
+                    complete = 0
+                    for line in f:
+                        try:
+                            if not line.endswith(b'\n'):
+                                raise ValueError("record without newline")
+                            record = json.loads(line)
+                        except ValueError:
+                            # Torn write at the end of the log: cut it off so the
+                            # next append starts a fresh line instead of joining it
+                            f.truncate(complete)
+                            self._metrics['truncated'] += 1
+                            break
+                        complete += len(line)
+                        self._replay(record, data, clock, tombstones)
+                        self._metrics['replayed'] += 1
+                        found = True
+                log_bytes += complete
+
+            self._generation = generations[-1] if generations else snapshot_generation
+            self._log_bytes = log_bytes
+            self._logged_clock = dict(clock)
+            self._open_log()
+
+        return (data, clock, tombstones) if found else None
+
+    @staticmethod
+    def _replay(record: List[Any], data: Dict[str, Any], clock: Dict[str, int],
+                tombstones: Tombstones):
+        if record[0] == 's':
+            _, key, entry, clock_delta = record
+            data[key] = entry
+            tombstones.pop(key, None)
+        elif record[0] == 'd':
+            key, clock_delta = record[1], record[2]
+            data.pop(key, None)
+            tombstones[key] = record[3] if len(record) > 3 else None
+        else:
+            _, clock_delta = record
+        clock.update(clock_delta)
+
+    def _open_log(self):
+        if self._log is not None:
+            self._log.close()
+        self._log = open(self._log_path(self._generation), 'a', encoding='utf-8')
+
+    def _clock_delta(self, vector_clock: Dict[str, int]) -> Dict[str, int]:
+        delta = {author: counter for author, counter in vector_clock.items()
+                 if self._logged_clock.get(author) != counter}
+        self._logged_clock.update(delta)
+        return delta
+
+    def _append(self, record: List[Any]):
+        line = json.dumps(record, separators=(',', ':')) + '\n'
+        with self._lock:
+            if self._log is None:
+                self._open_log()
+            self._log.write(line)
+            self._log.flush()
+            self._log_bytes += len(line)
+            self._metrics['records'] += 1
+
+    def append_set(self, key: str, entry: Dict[str, Any], vector_clock: Dict[str, int]):
+        """Log key -> entry (value, timestamp, author, counter)"""
+        self._append(['s', key, entry, self._clock_delta(vector_clock)])
+
+    def append_delete(self, key: str, vector_clock: Dict[str, int],
+                      dot: Optional[List[Any]] = None):
+        """Log a deletion (tombstone) of key, with the delete's [author, counter, timestamp]"""
+        self._append(['d', key, self._clock_delta(vector_clock), dot])
+
+    def append_clock(self, vector_clock: Dict[str, int]):
+        """Log vector clock entries that advanced without a data change"""
+        delta = self._clock_delta(vector_clock)
+        if delta:
+            self._append(['c', delta])
+
+    def needs_compaction(self) -> bool:
+        return self._log_bytes >= max(self.compact_min_bytes,
+                                      self.compact_ratio * self._snapshot_bytes)
+
+    def rotate(self) -> int:
+        """
+        Start a new log generation
+
+        Call while holding the lock that serializes writes, together with
+        copying the state to snapshot. Returns the new generation.
+        """
+        with self._lock:
+            self._generation += 1
+            self._log_bytes = 0
+            self._open_log()
+            return self._generation
+
+    def write_snapshot(self, state: State, generation: int):
+        """Persist state as of the start of generation and drop older logs"""
+        data, clock, tombstones = state
+        snapshot = {
+            'version': SNAPSHOT_VERSION,
+            'generation': generation,
+            'data': data,
+            'vector_clock': clock,
+            'tombstones': tombstones,
+        }
+
+        temp_file = self.snapshot_file.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        temp_file.replace(self.snapshot_file)
+
+        self._snapshot_bytes = self.snapshot_file.stat().st_size
+        for old in self._log_generations():
+            if old < generation:
+                self._log_path(old).unlink(missing_ok=True)
+        self._metrics['compactions'] += 1
+
+    def compact(self, snapshot_state: Callable[[], State], lock) -> None:
+        """
+        Snapshot the owner's state and truncate the log
+
+        Args:
+            snapshot_state: Returns a copy of (data, vector_clock, tombstones)
+            lock: The owner's write lock; held only for the copy and rotation
+        """
+        with self._compact_lock:
+            with lock:
+                state = snapshot_state()
+                generation = self.rotate()
+            self.write_snapshot(state, generation)
+
+    def start_compactor(self, snapshot_state: Callable[[], State], lock) -> None:
+        """Compact in a background thread whenever the log has grown enough"""
+        def run():
+            while not self._stop.wait(self.compact_interval):
+                if self.needs_compaction():
+                    try:
+                        self.compact(snapshot_state, lock)
+                    except OSError:
+                        # Retry at the next interval; the log still has every record
+                        pass
+
+        self._compactor = threading.Thread(target=run, name='offline-sync-compactor', daemon=True)
+        self._compactor.start()
+
+    def close(self) -> None:
+        """Stop the compactor and close the log"""
+        self._stop.set()
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'generation': self._generation,
+            'log_bytes': self._log_bytes,
+            'snapshot_bytes': self._snapshot_bytes,
+            **self._metrics,
+        }
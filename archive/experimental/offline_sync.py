@@ -3,16 +3,21 @@ Offline-First Architecture - Innovation 20
 100% offline functionality with local-first data and conflict-free sync
 """
 
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 from threading import RLock
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
+from bisect import bisect_right
 import json
-import hashlib
+import math
+import shutil
 import time
 
 from base.component import BaseComponent
+from offline_change_codec import ChangeDecoder, ChangeEncoder, make_change_id
+from offline_change_log import GroupCommitLog
+from offline_log_store import LogStructuredStore
 
 
 @dataclass
@@ -43,36 +48,48 @@ class Change:
     def from_dict(cls, data: Dict[str, Any]) -> 'Change':
         return cls(**data)
 
+    @property
+    def counter(self) -> int:
+        """Position of this change in its author's history"""
+        return self.vector_clock.get(self.author, 0)
+
 
 class CRDT:
     """
     Conflict-Free Replicated Data Type
 
-    Last-Write-Wins Register implementation
+    Last-Write-Wins Register implementation. Entries and tombstones carry
+    the dot (author, counter) of the change that wrote them instead of a
+    copy of the whole vector clock.
     """
 
     def __init__(self, author_id: str):
         self.author_id = author_id
         self.data: Dict[str, Any] = {}
         self.vector_clock: Dict[str, int] = {author_id: 0}
-        self.tombstones: Set[str] = set()  # Track deletions
+        # Track deletions: key -> [author, counter, timestamp] of the delete
+        # (None for tombstones written before deletes carried a dot)
+        self.tombstones: Dict[str, Optional[List[Any]]] = {}
+        # Newest timestamp written or merged; local writes are stamped after it
+        self.last_timestamp = 0.0
 
     def set(self, key: str, value: Any) -> Change:
         """Set a value"""
-        self.vector_clock[self.author_id] = self.vector_clock.get(self.author_id, 0) + 1
+        counter = self._tick()
+        now = self._timestamp()
 
-        if key in self.tombstones:
-            self.tombstones.remove(key)
+        self.tombstones.pop(key, None)
 
         self.data[key] = {
             'value': value,
-            'timestamp': time.time(),
-            'vector_clock': self.vector_clock.copy(),
+            'timestamp': now,
+            'author': self.author_id,
+            'counter': counter,
         }
 
         return Change(
-            id=self._generate_change_id(),
-            timestamp=time.time(),
+            id=make_change_id(self.author_id, counter),
+            timestamp=now,
             operation='update',
             collection='default',
             key=key,
@@ -93,16 +110,17 @@ class CRDT:
 
     def delete(self, key: str) -> Change:
         """Delete a value"""
-        self.vector_clock[self.author_id] = self.vector_clock.get(self.author_id, 0) + 1
+        counter = self._tick()
+        now = self._timestamp()
 
         if key in self.data:
             del self.data[key]
 
-        self.tombstones.add(key)
+        self.tombstones[key] = [self.author_id, counter, now]
 
         return Change(
-            id=self._generate_change_id(),
-            timestamp=time.time(),
+            id=make_change_id(self.author_id, counter),
+            timestamp=now,
             operation='delete',
             collection='default',
             key=key,
@@ -111,70 +129,87 @@ class CRDT:
             vector_clock=self.vector_clock.copy(),
         )
 
-    def merge(self, change: Change) -> bool:
+    def merge(self, change: Change, update_clock: bool = True) -> bool:
         """
         Merge a change from another replica
 
+        Args:
+            change: Remote change
+            update_clock: Advance our clock to the change's own dot; delta
+                sync passes False and merges the sender's clock once per batch
+
+        Only the dot is merged, not the rest of change.vector_clock: that
+        clock also covers changes the sender had seen, which are not
+        necessarily part of this batch, and get_delta trusts our clock to
+        mean we hold everything it covers.
+
         Returns:
             True if change was applied
         """
-        # Update vector clock
-        for author, clock in change.vector_clock.items():
-            self.vector_clock[author] = max(
-                self.vector_clock.get(author, 0),
-                clock
-            )
-
-        # Handle operation
-        if change.operation == 'delete':
-            self.tombstones.add(change.key)
-            if change.key in self.data:
-                del self.data[change.key]
-            return True
-
-        elif change.operation in ('create', 'update'):
-            # Check if we should apply this change
-            if change.key in self.tombstones:
-                # Already deleted, check if this is newer
-                pass
-
-            if change.key not in self.data:
-                # New key, apply change
-                self.data[change.key] = {
-                    'value': change.value,
-                    'timestamp': change.timestamp,
-                    'vector_clock': change.vector_clock.copy(),
-                }
-                return True
+        if update_clock and change.counter > self.vector_clock.get(change.author, 0):
+            self.vector_clock[change.author] = change.counter
 
-            # Conflict resolution: Last-Write-Wins
-            existing = self.data[change.key]
+        if change.operation not in ('create', 'update', 'delete'):
+            return False
+        if change.timestamp > self.last_timestamp:
+            self.last_timestamp = change.timestamp
 
-            if change.timestamp > existing['timestamp']:
-                # Newer timestamp wins
-                self.data[change.key] = {
-                    'value': change.value,
-                    'timestamp': change.timestamp,
-                    'vector_clock': change.vector_clock.copy(),
-                }
-                return True
+        # Conflict resolution: Last-Write-Wins on (timestamp, author, counter);
+        # the counter orders an author's writes that share a timestamp
+        current = self.version(change.key)
+        if current is not None and (change.timestamp, change.author, change.counter) <= current:
+            return False
 
-            elif change.timestamp == existing['timestamp']:
-                # Same timestamp, use author ID as tiebreaker
-                if change.author > self.author_id:
-                    self.data[change.key] = {
-                        'value': change.value,
-                        'timestamp': change.timestamp,
-                        'vector_clock': change.vector_clock.copy(),
-                    }
-                    return True
+        counter = change.counter
+        if change.operation == 'delete':
+            self.data.pop(change.key, None)
+            self.tombstones[change.key] = [change.author, counter, change.timestamp]
+        else:
+            self.tombstones.pop(change.key, None)
+            self.data[change.key] = {
+                'value': change.value,
+                'timestamp': change.timestamp,
+                'author': change.author,
+                'counter': counter,
+            }
+        return True
+
+    def version(self, key: str) -> Optional[Tuple[float, str, int]]:
+        """(timestamp, author, counter) of the write or delete that key currently reflects"""
+        entry = self.data.get(key)
+        if entry is not None:
+            return entry['timestamp'], entry.get('author', ''), entry.get('counter', 0)
+        dot = self.tombstones.get(key)
+        if dot is not None:
+            return dot[2], dot[0], dot[1]
+        # Unknown key, or a legacy tombstone that any write supersedes
+        return None
 
-        return False
+    def _timestamp(self) -> float:
+        """
+        Timestamp for a local write, after every write seen so far
+
+        A local write always replaces the value here, so it must also win
+        on every other replica, including against a change from a clock
+        that runs ahead (or a collected tombstone of one). Like a Lamport
+        clock, the wall clock is bumped past the newest timestamp seen.
+        """
+        now = time.time()
+        if now <= self.last_timestamp:
+            now = math.nextafter(self.last_timestamp, math.inf)
+        self.last_timestamp = now
+        return now
+
+    def restore_last_timestamp(self) -> None:
+        """Recompute last_timestamp from the stored entries and tombstones after loading"""
+        stamps = [entry['timestamp'] for entry in self.data.values()]
+        stamps += [dot[2] for dot in self.tombstones.values() if dot is not None]
+        self.last_timestamp = max(stamps, default=0.0)
 
-    def _generate_change_id(self) -> str:
-        """Generate unique change ID"""
-        data = f"{self.author_id}{time.time()}{id(object())}"
-        return hashlib.sha256(data.encode()).hexdigest()[:16]
+    def _tick(self) -> int:
+        counter = self.vector_clock.get(self.author_id, 0) + 1
+        self.vector_clock[self.author_id] = counter
+        return counter
 
 
 class OfflineSync(BaseComponent):
@@ -209,6 +244,10 @@ class OfflineSync(BaseComponent):
         # ... send to remote
         remote_changes = # ... receive from remote
         sync.apply_remote_changes(remote_changes)
+
+        # Delta-state sync: ship only what the peer has not seen
+        delta = sync.get_delta(peer.get_sync_state())
+        peer.apply_delta(delta)
     """
 
     def __init__(self, author_id: Optional[str] = None):
@@ -225,6 +264,12 @@ class OfflineSync(BaseComponent):
         # Change log (append-only)
         self._change_log: List[Change] = []
 
+        # Applied changes per author, ordered by counter: author -> (counters, changes)
+        self._changes_by_author: Dict[str, Tuple[List[int], List[Change]]] = {}
+
+        # Vector clock each known replica last acknowledged
+        self._peer_clocks: Dict[str, Dict[str, int]] = {}
+
         # Sync state
         self._last_sync: Optional[datetime] = None
         self._sync_in_progress = False
@@ -235,14 +280,39 @@ class OfflineSync(BaseComponent):
             'auto_sync': False,
             'sync_interval_seconds': 300,  # 5 minutes
             'max_change_log_size': 10000,
+            'compact_interval_seconds': 30,
+            'compact_min_bytes': 256 * 1024,
+            'compact_ratio': 1.0,  # log may grow to this multiple of the snapshot
+            'change_log_durability': 'flush',  # none / flush / fsync
+            # Group commit window (seconds); writers wait for their batch, so
+            # 0 commits at once and batches whatever arrives meanwhile
+            'change_log_flush_interval': 0.0,
         }
 
         # Storage
         self._storage_dir = Path.home() / '.claude' / 'data' / 'offline'
         self._storage_dir.mkdir(parents=True, exist_ok=True)
 
+        # Legacy full-rewrite file, imported once into the log-structured store
         self._data_file = self._storage_dir / 'local_data.json'
-        self._change_log_file = self._storage_dir / 'change_log.jsonl'
+        self._peer_clocks_file = self._storage_dir / 'peer_clocks.json'
+        # Binary change log (offline_change_codec); the JSON-lines log is imported once
+        self._change_log_file = self._storage_dir / 'change_log.bin'
+        self._legacy_change_log_file = self._storage_dir / 'change_log.jsonl'
+        self._corrupt_change_log_file = self._storage_dir / 'change_log.bin.corrupt'
+        # Set once the existing log has been read, so appends continue its stream
+        self._change_encoder: Optional[ChangeEncoder] = None
+        self._store = LogStructuredStore(
+            self._storage_dir / 'store',
+            compact_min_bytes=self._config['compact_min_bytes'],
+            compact_ratio=self._config['compact_ratio'],
+            compact_interval=self._config['compact_interval_seconds'],
+        )
+        self._change_log_writer = GroupCommitLog(
+            self._change_log_file,
+            durability=self._config['change_log_durability'],
+            flush_interval=self._config['change_log_flush_interval'],
+        )
 
         # Metrics
         self._metrics = {
@@ -251,6 +321,11 @@ class OfflineSync(BaseComponent):
             'syncs': 0,
             'conflicts_resolved': 0,
             'changes_applied': 0,
+            'delta_changes_sent': 0,
+            'delta_changes_collapsed': 0,
+            'tombstones_collected': 0,
+            'change_log_failures': 0,
+            'change_log_corruptions': 0,
         }
 
     def initialize(self) -> None:
@@ -258,6 +333,8 @@ class OfflineSync(BaseComponent):
         with self._lock:
             self._load_local_data()
             self._load_change_log()
+            self._load_peer_clocks()
+        self._store.start_compactor(self._snapshot_state, self._lock)
 
     def set(self, key: str, value: Any) -> None:
         """
@@ -272,14 +349,17 @@ class OfflineSync(BaseComponent):
 
             # Add to change log
             self._change_log.append(change)
+            self._index_change(change)
             self._pending_changes.append(change)
 
             # Persist
-            self._save_local_data()
-            self._append_to_change_log(change)
+            self._persist_key(key)
+            ticket = self._append_to_change_log(change)
 
             self._metrics['writes'] += 1
 
+        self._wait_durable(ticket)
+
     def get(self, key: str) -> Optional[Any]:
         """
         Get a value (works offline)
@@ -301,14 +381,17 @@ class OfflineSync(BaseComponent):
 
             # Add to change log
             self._change_log.append(change)
+            self._index_change(change)
             self._pending_changes.append(change)
 
             # Persist
-            self._save_local_data()
-            self._append_to_change_log(change)
+            self._persist_key(key)
+            ticket = self._append_to_change_log(change)
 
             self._metrics['writes'] += 1
 
+        self._wait_durable(ticket)
+
     def get_all(self) -> Dict[str, Any]:
         """Get all data"""
         with self._lock:
@@ -354,13 +437,17 @@ class OfflineSync(BaseComponent):
 
                     # Add to change log
                     self._change_log.append(change)
+                    self._index_change(change)
+                    self._append_to_change_log(change)
+
+                    # Persist the merged key
+                    self._persist_key(change.key)
                 else:
                     conflicts += 1
                     self._metrics['conflicts_resolved'] += 1
 
-            # Persist if any changes applied
-            if applied > 0:
-                self._save_local_data()
+            # Rejected changes still advance the vector clock
+            self._persist_clock()
 
             # Clear pending changes (they've been synced)
             self._pending_changes.clear()
@@ -373,6 +460,206 @@ class OfflineSync(BaseComponent):
                 'total': len(remote_changes),
             }
 
+    def get_sync_state(self) -> Dict[str, Any]:
+        """This replica's id and vector clock, sent to a peer to request a delta"""
+        with self._lock:
+            return {'replica': self._author_id, 'clock': dict(self._crdt.vector_clock)}
+
+    def get_delta(self, peer_state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Changes the peer has not seen, one per key
+
+        Selects applied changes whose counter is above the peer's clock entry
+        for their author, then keeps only the winning change per key. The
+        peer's clock also acknowledges everything it covers, which may let
+        tombstones be collected.
+
+        Args:
+            peer_state: The peer's get_sync_state()
+
+        Returns:
+            Delta for the peer's apply_delta(): this replica's id and clock
+            plus the collapsed changes, each carrying only its own dot
+        """
+        peer_clock = peer_state.get('clock', {})
+        with self._lock:
+            self._acknowledge(peer_state.get('replica'), peer_clock)
+
+            winners: Dict[str, Change] = {}
+            selected = 0
+            for author, (counters, changes) in self._changes_by_author.items():
+                start = bisect_right(counters, peer_clock.get(author, 0))
+                for change in changes[start:]:
+                    selected += 1
+                    best = winners.get(change.key)
+                    if best is None or (change.timestamp, change.author, change.counter) > \
+                            (best.timestamp, best.author, best.counter):
+                        winners[change.key] = change
+
+            self._metrics['delta_changes_sent'] += len(winners)
+            self._metrics['delta_changes_collapsed'] += selected - len(winners)
+
+            return {
+                'replica': self._author_id,
+                'clock': dict(self._crdt.vector_clock),
+                'changes': [
+                    {**change.to_dict(), 'vector_clock': {change.author: change.counter}}
+                    for change in winners.values()
+                ],
+            }
+
+    def apply_delta(self, delta: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Apply a delta from a peer's get_delta()
+
+        Changes are merged without touching the vector clock; the sender's
+        clock is folded in once at the end. Superseded changes the sender
+        collapsed away are covered by that clock.
+
+        Returns:
+            Sync result statistics
+        """
+        with self._lock:
+            applied = 0
+            conflicts = 0
+
+            for change_data in delta.get('changes', []):
+                change = Change.from_dict(change_data)
+                if self._crdt.merge(change, update_clock=False):
+                    applied += 1
+                    self._metrics['changes_applied'] += 1
+                    self._change_log.append(change)
+                    self._index_change(change)
+                    self._append_to_change_log(change)
+                    self._persist_key(change.key)
+                else:
+                    conflicts += 1
+                    self._metrics['conflicts_resolved'] += 1
+
+            clock = self._crdt.vector_clock
+            for author, counter in delta.get('clock', {}).items():
+                if counter > clock.get(author, 0):
+                    clock[author] = counter
+            self._persist_clock()
+
+            # The sender holds everything up to its clock
+            collected = self._acknowledge(delta.get('replica'), delta.get('clock', {}))
+
+            self._last_sync = datetime.now()
+            self._metrics['syncs'] += 1
+
+            return {
+                'applied': applied,
+                'conflicts': conflicts,
+                'total': len(delta.get('changes', [])),
+                'tombstones_collected': collected,
+            }
+
+    def add_replica(self, replica_id: str) -> None:
+        """
+        Register a replica that has not synced yet
+
+        Tombstones are kept until every known replica acknowledges them, so
+        registering peers up front keeps deletes from being collected before
+        a slow peer has seen them.
+        """
+        with self._lock:
+            if replica_id != self._author_id and replica_id not in self._peer_clocks:
+                self._peer_clocks[replica_id] = {}
+                self._save_peer_clocks()
+
+    def collect_tombstones(self) -> int:
+        """
+        Drop tombstones of deletes that are causally stable
+
+        A delete is stable once every known replica's acknowledged clock
+        covers its dot and our own clock covers every acknowledged clock:
+        then no replica can still ship a concurrent write the tombstone is
+        needed to reject, because we hold everything any of them had. The
+        store drops collected tombstones at its next compaction.
+        """
+        with self._lock:
+            if not self._peer_clocks:
+                return 0
+
+            peers = list(self._peer_clocks.values())
+            own = self._crdt.vector_clock
+            if any(counter > own.get(author, 0) for peer in peers for author, counter in peer.items()):
+                return 0
+
+            collectable = [
+                key for key, dot in self._crdt.tombstones.items()
+                if dot is not None and all(clock.get(dot[0], 0) >= dot[1] for clock in peers)
+            ]
+            for key in collectable:
+                del self._crdt.tombstones[key]
+
+            self._metrics['tombstones_collected'] += len(collectable)
+            return len(collectable)
+
+    def _acknowledge(self, replica_id: Optional[str], clock: Dict[str, int]) -> int:
+        """Record that replica_id holds everything up to clock; collect tombstones"""
+        if not replica_id or replica_id == self._author_id:
+            return 0
+
+        acked = self._peer_clocks.setdefault(replica_id, {})
+        advanced = {author: counter for author, counter in clock.items()
+                    if counter > acked.get(author, 0)}
+        if advanced:
+            acked.update(advanced)
+            self._save_peer_clocks()
+
+        # Pending changes every known replica holds no longer need shipping
+        peers = list(self._peer_clocks.values())
+        self._pending_changes = [
+            change for change in self._pending_changes
+            if any(change.counter > peer.get(change.author, 0) for peer in peers)
+        ]
+        return self.collect_tombstones()
+
+    def _load_peer_clocks(self):
+        """Load acknowledged peer clocks, so a restart does not forget slow peers"""
+        try:
+            if self._peer_clocks_file.exists():
+                with open(self._peer_clocks_file, 'r') as f:
+                    peer_clocks = json.load(f)
+                # Keep only well-formed entries: replica -> {author: counter}
+                if isinstance(peer_clocks, dict):
+                    self._peer_clocks = {
+                        replica: {author: counter for author, counter in clock.items()
+                                  if isinstance(counter, int)}
+                        for replica, clock in peer_clocks.items() if isinstance(clock, dict)
+                    }
+
+        except Exception:
+            pass
+
+    def _save_peer_clocks(self):
+        """Write acknowledged peer clocks (small; replaced atomically)"""
+        try:
+            temp_file = self._peer_clocks_file.with_suffix('.tmp')
+            with open(temp_file, 'w') as f:
+                json.dump(self._peer_clocks, f)
+            temp_file.replace(self._peer_clocks_file)
+
+        except Exception:
+            pass
+
+    def _index_change(self, change: Change):
+        """Add an applied change to the per-author index used by get_delta"""
+        counters, changes = self._changes_by_author.setdefault(change.author, ([], []))
+        counter = change.counter
+        if counters and counter <= counters[-1]:
+            # Out of order (e.g. replayed from the change log): keep sorted, skip duplicates
+            position = bisect_right(counters, counter)
+            if position and counters[position - 1] == counter:
+                return
+            counters.insert(position, counter)
+            changes.insert(position, change)
+        else:
+            counters.append(counter)
+            changes.append(change)
+
     def is_online(self) -> bool:
         """Check if online (placeholder - will integrate with network check)"""
         # For now, assume always offline
@@ -411,7 +698,10 @@ class OfflineSync(BaseComponent):
                 'pending_changes': len(self._pending_changes),
                 'total_keys': len(self._crdt.data),
                 'tombstones': len(self._crdt.tombstones),
+                'known_replicas': len(self._peer_clocks),
                 'last_sync': self._last_sync.isoformat() if self._last_sync else None,
+                'store': self._store.get_stats(),
+                'change_log': self._change_log_writer.get_stats(),
                 **self._metrics,
             }
 
@@ -426,37 +716,57 @@ class OfflineSync(BaseComponent):
         return f"{hostname}-{int(time.time())}"
 
     def _load_local_data(self):
-        """Load local data from disk"""
+        """Load local data from disk (snapshot + log replay)"""
         try:
-            if self._data_file.exists():
+            state = self._store.load()
+            if state is not None:
+                data, vector_clock, tombstones = state
+                self._crdt.data = data
+                self._crdt.vector_clock = vector_clock or {self._author_id: 0}
+                self._crdt.tombstones = tombstones
+
+            elif self._data_file.exists():
+                # Import data written by the full-rewrite format
                 with open(self._data_file, 'r') as f:
                     data = json.load(f)
 
                 self._crdt.data = data.get('data', {})
                 self._crdt.vector_clock = data.get('vector_clock', {self._author_id: 0})
-                self._crdt.tombstones = set(data.get('tombstones', []))
+                self._crdt.tombstones = dict.fromkeys(data.get('tombstones', []))
+                self._save_local_data()
+            self._crdt.restore_last_timestamp()
 
         except Exception:
             pass
 
-    def _save_local_data(self):
-        """Save local data to disk"""
+    def _snapshot_state(self):
+        """Copy of the CRDT state for a snapshot (called with self._lock held)"""
+        return (
+            dict(self._crdt.data),
+            dict(self._crdt.vector_clock),
+            dict(self._crdt.tombstones),
+        )
+
+    def _persist_key(self, key: str):
+        """Append the current state of key to the store: O(size of the change)"""
         try:
-            data = {
-                'version': '3.0.0',
-                'author_id': self._author_id,
-                'data': self._crdt.data,
-                'vector_clock': self._crdt.vector_clock,
-                'tombstones': list(self._crdt.tombstones),
-                'last_updated': datetime.now().isoformat(),
-            }
+            if key in self._crdt.data and key not in self._crdt.tombstones:
+                self._store.append_set(key, self._crdt.data[key], self._crdt.vector_clock)
+            else:
+                self._store.append_delete(key, self._crdt.vector_clock, self._crdt.tombstones.get(key))
+        except Exception:
+            pass
 
-            # Atomic write
-            temp_file = self._data_file.with_suffix('.tmp')
-            with open(temp_file, 'w') as f:
-                json.dump(data, f, indent=2)
+    def _persist_clock(self):
+        try:
+            self._store.append_clock(self._crdt.vector_clock)
+        except Exception:
+            pass
 
-            temp_file.replace(self._data_file)
+    def _save_local_data(self):
+        """Write a full snapshot now and truncate the store log"""
+        try:
+            self._store.compact(self._snapshot_state, self._lock)
 
         except Exception:
             pass
@@ -464,27 +774,111 @@ class OfflineSync(BaseComponent):
     def _load_change_log(self):
         """Load change log from disk"""
         try:
-            if self._change_log_file.exists():
-                with open(self._change_log_file, 'r') as f:
+            for change in self._read_change_log():
+                self._change_log.append(change)
+                self._index_change(change)
+
+            if self._legacy_change_log_file.exists():
+                # Re-encode the JSON-lines log, skipping changes already imported
+                known = {change.id for change in self._change_log}
+                with open(self._legacy_change_log_file, 'r') as f:
                     for line in f:
-                        if line.strip():
-                            change_data = json.loads(line)
-                            change = Change.from_dict(change_data)
+                        if not line.strip():
+                            continue
+                        try:
+                            change = Change.from_dict(json.loads(line))
+                        except ValueError:
+                            # Torn write at the end of the log
+                            break
+                        if change.id not in known:
                             self._change_log.append(change)
+                            self._index_change(change)
+                            self._append_to_change_log(change)
+                self._change_log_writer.sync()
+                self._legacy_change_log_file.unlink()
 
         except Exception:
             pass
 
+    def _read_change_log(self) -> List[Change]:
+        """
+        Decode the binary change log and resume its encoder
+
+        A record cut short by a crash or a failed commit is truncated away
+        so later appends start on a record boundary. A corrupt stream is
+        cut back to its last good record the same way, after copying the
+        whole file aside to change_log.bin.corrupt.
+        """
+        decoder = ChangeDecoder()
+        changes: List[Change] = []
+        consumed = 0
+        if self._change_log_file.exists():
+            data = self._change_log_file.read_bytes()
+            try:
+                decoded, consumed = decoder.decode(data)
+            except ValueError as e:
+                # Not a change stream at all: keep nothing of it
+                decoder, decoded = ChangeDecoder(), []
+                decoder.error = str(e)
+            if decoder.error:
+                self._metrics['change_log_corruptions'] += 1
+                shutil.copyfile(self._change_log_file, self._corrupt_change_log_file)
+            changes = [Change.from_dict(change_data) for change_data in decoded]
+        self._change_log_writer.truncate(consumed)
+        self._change_encoder = decoder.encoder()
+        return changes
+
     def _append_to_change_log(self, change: Change):
-        """Append change to change log file"""
+        """Queue change for the next group commit of the change log file"""
         try:
-            with open(self._change_log_file, 'a') as f:
-                f.write(json.dumps(change.to_dict()) + '\n')
+            if self._change_log_writer.failed is not None:
+                # change is already in self._change_log, so this rewrites it too
+                return self._recover_change_log()
+            if self._change_encoder is None:
+                self._read_change_log()
+            return self._change_log_writer.append(self._change_encoder.encode(change.to_dict()))
 
         except Exception:
-            pass
+            return None
+
+    def _recover_change_log(self):
+        """
+        Rewrite changes lost to a failed group commit
+
+        The encoder assumed the lost records (table entries, clock deltas)
+        were written, so it is rebuilt from the file, and every change in
+        memory that the file is missing is appended again. Returns the
+        ticket of the last one.
+        """
+        self._change_encoder = None
+        written = {change.id for change in self._read_change_log()}
+        ticket = None
+        for change in self._change_log:
+            if change.id not in written:
+                ticket = self._change_log_writer.append(self._change_encoder.encode(change.to_dict()))
+        return ticket
+
+    def _wait_durable(self, ticket) -> None:
+        """
+        Return once the change is committed per the durability level
+
+        flush waits until the record is handed to the OS, fsync until it is
+        on disk; none does not wait. Called after releasing the lock, so
+        concurrent writers join the same group commit and share its write
+        (and fsync).
+        """
+        if ticket is not None and self._config['change_log_durability'] != 'none':
+            if not ticket.wait():
+                self._metrics['change_log_failures'] += 1
 
     def cleanup(self) -> None:
         """Cleanup - save all data"""
         with self._lock:
             self._save_local_data()
+            if self._change_log_writer.failed is not None:
+                try:
+                    self._recover_change_log()
+                except Exception:
+                    pass
+        self._store.close()
+        self._change_log_writer.close()
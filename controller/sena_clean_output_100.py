@@ -5,12 +5,48 @@ Filters tool execution markers (⏺) and all tool-related output
 """
 
 import sys
+import os
 import re
+import codecs
 import subprocess
 import json
-from typing import Optional
+from typing import List, Optional
 from pathlib import Path
 
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:  # Python 3.10
+    import sre_parse
+    import sre_constants
+
+# Non-ASCII characters that re.IGNORECASE matches against ASCII letters
+CASE_FOLD_SPECIALS = ('\u0130', '\u0131', '\u017f', '\u212a')
+
+
+def _required_literal(pattern: str) -> Optional[str]:
+    """Longest literal run every match of pattern must contain, if any"""
+    try:
+        items = list(sre_parse.parse(pattern))
+    except Exception:
+        return None
+
+    best, run = '', []
+    for op, av in items + [(None, None)]:
+        if op is sre_constants.LITERAL:
+            run.append(chr(av))
+            continue
+        if len(run) > len(best):
+            best = ''.join(run)
+        run = []
+
+    return best or None
+
+
+def _single_line(pattern: str) -> str:
+    """Rewrite a line pattern so it cannot match across a newline"""
+    return pattern.replace(r'\s', r'[^\S\n]').replace('[^)]', '[^)\\n]')
+
+
 class SENACleanOutput100:
     """Complete clean output implementation - v3.3.1 with ⏺ marker filtering"""
 
@@ -58,30 +94,115 @@ class SENACleanOutput100:
         # Thinking tags
         self.thinking_pattern = r'<thinking>.*?</thinking>'
 
+        # PERFORMANCE OPTIMIZATION: Compile all pattern lists into one regex
+        self.compile_patterns()
+
+    def compile_patterns(self):
+        """
+        Compile marker, tool and verbose patterns into combined regexes
+
+        Call again after modifying any of the pattern lists.
+        """
+        alternatives = (
+            self.tool_marker_patterns
+            + self.tool_patterns
+            + [f'(?i:{pattern})' for pattern in self.verbose_patterns]
+        )
+
+        # Per-line filter: one search replaces a loop over every pattern
+        self.line_regex = re.compile('|'.join(f'(?:{p})' for p in alternatives))
+
+        # Buffer filter: removes every matching line in a single pass. Patterns
+        # are restricted to one line so a match can never span a line break.
+        single_line = '|'.join(f'(?:{_single_line(p)})' for p in alternatives)
+        self.buffer_regex = re.compile(
+            rf'^[^\n]*?(?:{single_line})[^\n]*(?:\n|\Z)', re.MULTILINE
+        )
+
+        self.thinking_regex = re.compile(self.thinking_pattern, re.DOTALL)
+        self.blank_lines_regex = re.compile(r'\n{3,}')
+
+        # Literal gate: every pattern needs a literal, so only lines containing
+        # one are candidates. Case-insensitive literals are searched in an
+        # ASCII-lowered copy. Without a literal for every pattern, the buffer
+        # regex is used instead.
+        gate = []
+        for patterns, fold in ((self.tool_marker_patterns + self.tool_patterns, False),
+                               (self.verbose_patterns, True)):
+            for pattern in patterns:
+                literal = _required_literal(pattern)
+                if literal is None or (fold and not literal.isascii()):
+                    gate = None
+                    break
+                literal = literal.encode('utf-8')
+                gate.append((literal.lower() if fold else literal, fold))
+            if gate is None:
+                break
+        self.literal_gate = list(dict.fromkeys(gate)) if gate is not None else None
+
     def should_filter_line(self, line: str) -> bool:
         """Determine if line should be filtered out"""
-        line_stripped = line.strip()
+        # Empty lines are kept for formatting
+        if not line.strip():
+            return False
 
-        # Filter empty lines
-        if not line_stripped:
-            return False  # Keep for formatting
+        return self.line_regex.search(line) is not None
 
-        # Filter tool markers (⏺)
-        for pattern in self.tool_marker_patterns:
-            if re.search(pattern, line):
-                return True
+    def collapse_blank_lines(self, text: str) -> str:
+        """Replace runs of 3+ newlines with a single blank line"""
+        if '\n\n\n' not in text:
+            return text
+        return self.blank_lines_regex.sub('\n\n', text)
+
+    def filter_lines(self, text: str) -> str:
+        """Remove every line that should be filtered in one pass over the buffer"""
+        if self.literal_gate is None or any(ch in text for ch in CASE_FOLD_SPECIALS):
+            return self.buffer_regex.sub('', text)
 
-        # Filter tool execution patterns
-        for pattern in self.tool_patterns:
-            if re.search(pattern, line):
-                return True
+        data = text.encode('utf-8', 'surrogatepass')
+        return self.filter_lines_bytes(data).decode('utf-8', 'surrogatepass')
 
-        # Filter verbose messages
-        for pattern in self.verbose_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
-                return True
+    def filter_lines_bytes(self, data: bytes) -> bytes:
+        """
+        Remove filtered lines from UTF-8 data using the literal gate
 
-        return False
+        Literal searches run at memory speed, and the combined regex only
+        checks lines that contain a literal.
+        """
+        folded = None
+        candidates = set()
+
+        for literal, fold in self.literal_gate:
+            if fold:
+                if folded is None:
+                    folded = data.lower()
+                haystack = folded
+            else:
+                haystack = data
+
+            pos = haystack.find(literal)
+            while pos >= 0:
+                candidates.add(data.rfind(b'\n', 0, pos) + 1)
+                line_end = data.find(b'\n', pos)
+                if line_end < 0:
+                    break
+                pos = haystack.find(literal, line_end)
+
+        if not candidates:
+            return data
+
+        pieces = []
+        keep_from = 0
+        for start in sorted(candidates):
+            end = data.find(b'\n', start)
+            end = len(data) if end < 0 else end + 1
+            line = data[start:end].rstrip(b'\n').decode('utf-8', 'surrogatepass')
+            if self.should_filter_line(line):
+                pieces.append(data[keep_from:start])
+                keep_from = end
+
+        pieces.append(data[keep_from:])
+        return b''.join(pieces)
 
     def process_output(self, text: str) -> str:
         """Process entire output to remove all tool traces"""
@@ -89,21 +210,13 @@ class SENACleanOutput100:
             return text
 
         # Remove thinking tags
-        text = re.sub(self.thinking_pattern, '', text, flags=re.DOTALL)
-
-        lines = text.split('\n')
-        cleaned_lines = []
+        text = self.thinking_regex.sub('', text)
 
-        for line in lines:
-            # Skip lines that should be filtered
-            if not self.should_filter_line(line):
-                cleaned_lines.append(line)
-
-        # Join and remove excessive blank lines
-        result = '\n'.join(cleaned_lines)
+        # Drop filtered lines in a single multiline pass
+        result = self.filter_lines(text)
 
         # Remove more than 2 consecutive newlines
-        result = re.sub(r'\n{3,}', '\n\n', result)
+        result = self.collapse_blank_lines(result)
 
         return result.strip()
 
@@ -141,6 +254,235 @@ class SENACleanOutput100:
         marker.write_text('enabled')
         return True
 
+
+class SENACleanOutputStream:
+    """
+    Incremental clean output filter for transcripts produced in chunks
+
+    Produces the same text as SENACleanOutput100.process_output on the
+    concatenated input, but emits cleaned text as soon as each line is
+    complete. State kept between chunks is bounded: the current partial
+    line (capped at max_line_length), a possibly split thinking tag, and
+    deferred trailing whitespace.
+
+    Unlike the batch filter, an unterminated <thinking> block is dropped
+    rather than kept, since buffering it would make memory unbounded.
+
+    Usage:
+        stream = SENACleanOutputStream()
+        for chunk in chunks:
+            sys.stdout.write(stream.feed(chunk))
+        sys.stdout.write(stream.close())
+    """
+
+    THINKING_OPEN = '<thinking>'
+    THINKING_CLOSE = '</thinking>'
+
+    def __init__(self, cleaner: Optional[SENACleanOutput100] = None,
+                 max_line_length: int = 65536):
+        self.cleaner = cleaner or clean_output_100
+        self.max_line_length = max_line_length
+
+        self._in_thinking = False
+        self._tag_tail = ''       # Possible partial thinking tag from last chunk
+        self._line = ''           # Current incomplete line
+        self._line_mode = None    # None, 'pass' or 'drop' once a line overflows
+        self._any_kept = False    # Whether a line separator precedes the next line
+        self._started = False     # Whether any non-whitespace has been emitted
+        self._pending_ws = ''     # Whitespace held back until more text follows
+
+    def feed(self, chunk: str) -> str:
+        """Consume a chunk and return the cleaned text it completes"""
+        text = self._tag_tail + chunk
+        self._tag_tail = ''
+        visible = []
+        pos = 0
+
+        # Collect text outside thinking blocks, holding back a split tag
+        while pos < len(text):
+            if self._in_thinking:
+                end = text.find(self.THINKING_CLOSE, pos)
+                if end < 0:
+                    keep = _partial_suffix(text, self.THINKING_CLOSE, pos)
+                    self._tag_tail = text[len(text) - keep:] if keep else ''
+                    break
+                pos = end + len(self.THINKING_CLOSE)
+                self._in_thinking = False
+            else:
+                start = text.find(self.THINKING_OPEN, pos)
+                if start < 0:
+                    keep = _partial_suffix(text, self.THINKING_OPEN, pos)
+                    visible.append(text[pos:len(text) - keep])
+                    self._tag_tail = text[len(text) - keep:] if keep else ''
+                    break
+                visible.append(text[pos:start])
+                pos = start + len(self.THINKING_OPEN)
+                self._in_thinking = True
+
+        return self._feed_visible(''.join(visible))
+
+    def close(self) -> str:
+        """Flush the final partial line; trailing whitespace is dropped"""
+        output = []
+        if not self._in_thinking and self._tag_tail:
+            output.append(self._feed_visible(self._tag_tail))
+        self._tag_tail = ''
+
+        output.append(self._end_line())
+        self._pending_ws = ''
+        return ''.join(output)
+
+    def _feed_visible(self, text: str) -> str:
+        """Assemble visible text into lines and filter completed lines"""
+        output = []
+
+        # Finish an overlong line that was already decided
+        if self._line_mode is not None:
+            newline = text.find('\n')
+            if newline < 0:
+                return self._add_to_line(text)
+            output.append(self._add_to_line(text[:newline]))
+            output.append(self._end_line())
+            text = text[newline + 1:]
+
+        # Filter all completed lines as one block
+        cut = text.rfind('\n')
+        if cut >= 0:
+            block, self._line = self._line + text[:cut + 1], ''
+            kept = self.cleaner.filter_lines(block)
+            if kept:
+                output.append(self._emit_line(kept[:-1]))
+            text = text[cut + 1:]
+
+        output.append(self._add_to_line(text))
+        return ''.join(output)
+
+    def _add_to_line(self, segment: str) -> str:
+        """Append to the current line, deciding early if it grows too long"""
+        if self._line_mode == 'drop' or not segment:
+            return ''
+        if self._line_mode == 'pass':
+            return self._emit(segment)
+
+        self._line += segment
+        if len(self._line) <= self.max_line_length:
+            return ''
+
+        # Overlong line: decide on the prefix seen so far and stop buffering
+        line, self._line = self._line, ''
+        if self.cleaner.should_filter_line(line):
+            self._line_mode = 'drop'
+            return ''
+        self._line_mode = 'pass'
+        return self._emit_line(line)
+
+    def _end_line(self) -> str:
+        """Filter and emit the current line once its newline is seen"""
+        line, self._line = self._line, ''
+        mode, self._line_mode = self._line_mode, None
+
+        if mode is not None or self.cleaner.should_filter_line(line):
+            return ''
+        return self._emit_line(line)
+
+    def _emit_line(self, line: str) -> str:
+        """Emit kept lines preceded by their separator"""
+        separator = '\n' if self._any_kept else ''
+        self._any_kept = True
+        return self._emit(separator + line)
+
+    def _emit(self, text: str) -> str:
+        """Apply strip and blank-line collapsing incrementally"""
+        text = self._pending_ws + text
+        core_end = len(text.rstrip())
+
+        if core_end == 0:
+            # Leading whitespace is stripped; later whitespace waits for text
+            self._pending_ws = self.cleaner.collapse_blank_lines(text) \
+                if self._started else ''
+            return ''
+
+        head, self._pending_ws = text[:core_end], text[core_end:]
+        if not self._started:
+            head = head.lstrip()
+            self._started = True
+
+        return self.cleaner.collapse_blank_lines(head)
+
+
+def _partial_suffix(text: str, tag: str, start: int = 0) -> int:
+    """Length of the longest suffix of text[start:] that is a proper prefix of tag"""
+    for length in range(min(len(tag) - 1, len(text) - start), 0, -1):
+        if text.endswith(tag[:length]):
+            return length
+    return 0
+
+
+def filter_stream(infile, outfile, block_size: int = 1 << 20,
+                  cleaner: Optional[SENACleanOutput100] = None) -> int:
+    """
+    Clean a binary stream, e.g. stdin to stdout in a pipe
+
+    Reads whatever is available up to block_size at a time, so lines
+    from a live source such as `tail -f` are written as soon as they
+    complete. Output is flushed after every block. Undecodable bytes
+    pass through unchanged.
+
+    Returns:
+        Number of bytes written
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')('surrogateescape')
+    stream = SENACleanOutputStream(cleaner)
+    read = getattr(infile, 'read1', infile.read)
+    written = 0
+
+    def write(text: str):
+        nonlocal written
+        if text:
+            data = text.encode('utf-8', 'surrogateescape')
+            outfile.write(data)
+            outfile.flush()
+            written += len(data)
+
+    while True:
+        block = read(block_size)
+        if not block:
+            break
+        write(stream.feed(decoder.decode(block)))
+
+    write(stream.feed(decoder.decode(b'', final=True)) + stream.close())
+    if written:
+        write('\n')
+
+    return written
+
+
+def run_filter(argv: List[str]) -> int:
+    """CLI filter mode: sena_clean_output_100.py --filter [--block-size BYTES]"""
+    block_size = 1 << 20
+    if '--block-size' in argv:
+        value = argv[argv.index('--block-size') + 1:][:1]
+        try:
+            block_size = int(value[0])
+        except (IndexError, ValueError):
+            block_size = 0
+        if block_size <= 0:
+            # stdout is the filtered stream; usage errors go to stderr
+            print("Usage: sena_clean_output_100.py --filter [--block-size BYTES] "
+                  "(BYTES must be a positive integer)", file=sys.stderr)
+            return 2
+
+    try:
+        filter_stream(sys.stdin.buffer, sys.stdout.buffer, block_size)
+    except BrokenPipeError:
+        # Downstream closed early (e.g. `| head`); stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    except KeyboardInterrupt:
+        return 130
+
+    return 0
+
+
 # Global instance
 clean_output_100 = SENACleanOutput100()
 
@@ -157,6 +499,9 @@ def enable_clean_mode():
     return clean_output_100.enable_clean_mode()
 
 if __name__ == "__main__":
+    if '--filter' in sys.argv[1:]:
+        sys.exit(run_filter(sys.argv[1:]))
+
     # Test the clean output system
     test_output = """⏺ Bash(ls -la)
 Output:
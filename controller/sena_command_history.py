@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+SENA Command History - v3.5.2
+Persistent, queryable history of silent executor commands
+
+Commands are appended to a SQLite database in WAL mode by a background
+writer thread, so recording one is a queue put on the execution path.
+Rows are indexed by command name, exit code and time:
+
+    commands(id, ts, name, command, exit_code, duration_ms)
+
+Usage:
+    store = CommandHistoryStore()
+    store.record('git status', 0, duration_ms=4.2)
+    store.query(name='git', exit_code=0, since=time.time() - 3600)
+
+Configuration:
+    SENA_EXEC_HISTORY       - 0 disables the on-disk history (default 1)
+    SENA_EXEC_HISTORY_ROWS  - rows kept; older rows are pruned (default 100000)
+"""
+
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+HISTORY_DB = Path.home() / '.claude' / 'sena_command_history.db'
+HISTORY_ENABLED = os.environ.get('SENA_EXEC_HISTORY', '1') == '1'
+MAX_ROWS = int(os.environ.get('SENA_EXEC_HISTORY_ROWS', '100000'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS commands (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    name TEXT NOT NULL,
+    command TEXT NOT NULL,
+    exit_code INTEGER NOT NULL,
+    duration_ms REAL
+);
+CREATE INDEX IF NOT EXISTS commands_ts ON commands (ts);
+CREATE INDEX IF NOT EXISTS commands_name_ts ON commands (name, ts);
+CREATE INDEX IF NOT EXISTS commands_exit_ts ON commands (exit_code, ts);
+"""
+
+# Rows written per transaction at most
+BATCH_SIZE = 256
+
+# Seconds flush() (and so query()) waits for the writer by default
+FLUSH_TIMEOUT = 5.0
+
+
+class CommandHistoryStore:
+    """
+    Append-only command log in SQLite, written off the caller's thread
+
+    record() enqueues; the writer thread commits whatever is queued in one
+    transaction. query() flushes first, so callers read their own writes.
+    A failed transaction (database locked, disk full, read-only file)
+    drops its rows and is counted in errors; the writer keeps running.
+    Using the store after close() raises ValueError; opening a database
+    that cannot be set up raises sqlite3.Error (see open_history_store).
+    """
+
+    def __init__(self, path: Path = HISTORY_DB, max_rows: int = MAX_ROWS):
+        self.path = Path(path)
+        self.max_rows = max_rows
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Schema and WAL mode are set up before either connection is used
+        setup = sqlite3.connect(self.path)
+        try:
+            setup.execute('PRAGMA journal_mode=WAL')
+            setup.executescript(SCHEMA)
+        finally:
+            setup.close()
+
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self._closed = False
+
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._reader = sqlite3.connect(self.path, check_same_thread=False)
+        self._reader_lock = threading.Lock()
+        self._writer = threading.Thread(target=self._run, name='sena-command-history', daemon=True)
+        self._writer.start()
+        # The writer is a daemon thread; commit queued rows at interpreter exit
+        atexit.register(self.close)
+
+    def record(self, command: str, exit_code: int, duration_ms: Optional[float] = None,
+               timestamp: Optional[float] = None):
+        """Queue one finished command for writing"""
+        self._check_open()
+        name = command.split()[0] if command.strip() else ''
+        self._queue.put((timestamp if timestamp is not None else time.time(),
+                         name, command, exit_code, duration_ms))
+
+    def flush(self, timeout: Optional[float] = FLUSH_TIMEOUT) -> bool:
+        """Wait until everything recorded so far is written; False on timeout"""
+        self._check_open()
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _run(self):
+        conn = sqlite3.connect(self.path)
+        # WAL + NORMAL: commits do not fsync; a crash loses at most the last transactions
+        conn.execute('PRAGMA synchronous=NORMAL')
+        written = 0
+        closing = False
+        while not closing:
+            items = [self._queue.get()]
+            while len(items) < BATCH_SIZE:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            rows = [item for item in items if isinstance(item, tuple)]
+            if rows:
+                try:
+                    with conn:
+                        conn.executemany(
+                            'INSERT INTO commands (ts, name, command, exit_code, duration_ms) '
+                            'VALUES (?, ?, ?, ?, ?)', rows
+                        )
+                    written += len(rows)
+                    if written >= BATCH_SIZE:
+                        self._prune(conn)
+                        written = 0
+                except sqlite3.Error as e:
+                    # History is best-effort: drop this batch, keep serving flushes
+                    self.errors += 1
+                    self.last_error = str(e)
+
+            for item in items:
+                if item is None:
+                    closing = True
+                elif isinstance(item, threading.Event):
+                    item.set()
+        conn.close()
+
+    def _prune(self, conn: sqlite3.Connection):
+        with conn:
+            conn.execute('DELETE FROM commands WHERE id <= (SELECT MAX(id) FROM commands) - ?',
+                         (self.max_rows,))
+
+    def query(self, name: Optional[str] = None, exit_code: Optional[int] = None,
+              since: Optional[float] = None, until: Optional[float] = None,
+              limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Commands matching all given filters, newest first
+
+        Args:
+            name: Command name (first word), e.g. 'git'
+            exit_code: Exact exit code
+            since / until: Unix time range (inclusive)
+            limit: Maximum rows returned
+        """
+        self.flush()
+        clauses, params = [], []
+        for column, op, value in (('name', '=', name), ('exit_code', '=', exit_code),
+                                  ('ts', '>=', since), ('ts', '<=', until)):
+            if value is not None:
+                clauses.append(f'{column} {op} ?')
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+
+        with self._reader_lock:
+            cursor = self._reader.execute(
+                f'SELECT ts, name, command, exit_code, duration_ms FROM commands {where} '
+                f'ORDER BY ts DESC, id DESC LIMIT ?', params + [limit]
+            )
+            rows = cursor.fetchall()
+        return [
+            {'timestamp': ts, 'name': row_name, 'command': command,
+             'exit_code': code, 'success': code == 0, 'duration_ms': duration_ms}
+            for ts, row_name, command, code, duration_ms in rows
+        ]
+
+    def _check_open(self):
+        if self._closed:
+            raise ValueError("Command history store is closed")
+
+    def close(self):
+        """Commit queued rows and stop the writer (safe to call twice)"""
+        atexit.unregister(self.close)
+        self._closed = True
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        with self._reader_lock:
+            self._reader.close()
+
+
+def open_history_store(path: Path = HISTORY_DB, max_rows: int = MAX_ROWS) -> Optional[CommandHistoryStore]:
+    """CommandHistoryStore, or None if the database cannot be opened (read-only, locked, corrupt)"""
+    try:
+        return CommandHistoryStore(path, max_rows)
+    except (sqlite3.Error, OSError):
+        return None
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+
+    name = sys.argv[1] if len(sys.argv) > 1 else None
+    store = CommandHistoryStore()
+    print(json.dumps(store.query(name=name, limit=20), indent=2))
+    store.close()
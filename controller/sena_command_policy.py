@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+SENA Command Policy - v3.5.2
+Argument-aware allow/deny decisions for silent executor commands
+
+A command is parsed once with shlex and checked against a decision table
+compiled from per-command rules: allowed subcommands (git), known and
+forbidden options (find -delete, git -c, git push --exec; unknown git and
+python3 global options are refused), and protected targets for
+destructive commands (rm -r on anything outside the working directory).
+Every decision names the rule that produced it.
+
+Commands run with shell=False, so shell syntax in an argument cannot run
+anything by itself; it is still rejected up front because a caller that
+writes `ls; rm x` expects a shell and the command would not do what it
+says.
+
+Usage:
+    policy = CommandPolicy(safe_commands)
+    decision = policy.evaluate('git push --force')
+    decision.allowed, decision.rule   # False, 'git.forbidden-option'
+"""
+
+import os
+import re
+import shlex
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+# Shell syntax: chaining, pipes, redirection, substitution
+SHELL_SYNTAX = re.compile(r'[;|&<>`]|\$\(')
+
+# Commands without quotes or escapes split exactly like shlex.split on its
+# whitespace (space, tab, CR, LF), without the shlex tokenizer's overhead
+NEEDS_SHLEX = re.compile(r'[\'"\\]')
+PLAIN_WORD = re.compile(r'[^ \t\r\n]+')
+
+# Paths no recursive or destructive command may target
+PROTECTED_TARGETS = frozenset({'/', '/*', '~', '.', '..', '*', os.path.expanduser('~')})
+
+# normpath keeps a leading '//' (POSIX allows it a special meaning); Linux does not
+REPEATED_SLASHES = re.compile(r'/{2,}')
+
+# Internal rule of a decision that needs the working directory to complete
+CWD_DEPENDENT = 'cwd'
+
+
+class PolicyDecision(NamedTuple):
+    allowed: bool
+    rule: str
+    reason: str
+    argv: Tuple[str, ...] = ()
+
+
+class CommandRule:
+    """
+    Argument rules for one command
+
+    Args:
+        subcommands: Allowed first operands (None = any)
+        forbidden: Forbidden options, matched as exact tokens, as --opt=value,
+            or (single letters like '-f') inside short clusters such as -rf
+        global_only: Check options only before the first operand (git global
+            options, python3 interpreter options; later ones belong to the
+            subcommand or script)
+        global_flags: Known global options without a value; with global_only,
+            any global option not listed here or in global_values is refused
+        global_values: Known global options taking a value (-C dir, -W arg),
+            given as the next token or attached (-Warg, --git-dir=dir)
+        global_final: Global options whose value starts the operands
+            (python3 -m module: later tokens belong to the module)
+        protect_targets: Refuse protected paths (/, ~, ., *) as operands
+        protect_when: Only protect targets when one of these options is given
+        confine_targets: Protected operands must also lie inside the working
+            directory (rm -r /usr, rm -r ../..)
+    """
+
+    __slots__ = ('name', 'subcommands', 'forbidden', 'short', 'global_only', 'global_flags',
+                 'global_values', 'global_final', 'protect_targets', 'protect_when',
+                 'protect_short', 'confine_targets')
+
+    def __init__(self, name: str, subcommands: Optional[Iterable[str]] = None,
+                 forbidden: Iterable[str] = (), global_only: bool = False,
+                 global_flags: Iterable[str] = (), global_values: Iterable[str] = (),
+                 global_final: Iterable[str] = (), protect_targets: bool = False,
+                 protect_when: Iterable[str] = (), confine_targets: bool = False):
+        self.name = name
+        self.subcommands = frozenset(subcommands) if subcommands is not None else None
+        self.forbidden, self.short = _compile_options(forbidden)
+        self.global_only = global_only
+        self.global_flags = frozenset(global_flags)
+        self.global_values = frozenset(global_values) | frozenset(global_final)
+        self.global_final = frozenset(global_final)
+        self.protect_targets = protect_targets
+        self.protect_when, self.protect_short = _compile_options(protect_when)
+        self.confine_targets = confine_targets
+
+
+def _compile_options(options: Iterable[str]) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """(full option tokens, single letters of one-letter options)"""
+    options = frozenset(options)
+    letters = frozenset(opt[1] for opt in options if len(opt) == 2 and opt[0] == '-' and opt[1] != '-')
+    return options, letters
+
+
+def _option_hits(option: str, forbidden: FrozenSet[str], short: FrozenSet[str]) -> Optional[str]:
+    """The forbidden option matched by one argv token, if any"""
+    if option in forbidden:
+        return option
+    if option.startswith('--'):
+        name = option.split('=', 1)[0]
+        if name in forbidden:
+            return name
+        # git and getopt_long accept unambiguous prefixes (--forc for --force)
+        if len(name) >= 4:
+            return next((full for full in forbidden if full.startswith(name)), None)
+        return None
+    if short and len(option) > 2:
+        for letter in option[1:]:
+            if letter in short:
+                return f'-{letter}'
+    return None
+
+
+def _scan_globals(rule: CommandRule, args: Tuple[str, ...]) -> Tuple[int, Optional[str], Optional[str]]:
+    """
+    Walk the global options of a global_only command
+
+    Values of options in global_values are skipped, so the first operand
+    found is the real subcommand or script. Returns (index of the first
+    operand, forbidden option hit, unknown option); every option before
+    the operand is checked, including clusters like -BWignore.
+    """
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == '--':
+            return i + 1, None, None
+        if not arg.startswith('-') or arg == '-':
+            return i, None, None
+        hit = _option_hits(arg, rule.forbidden, rule.short)
+        if hit:
+            return i, hit, None
+
+        if arg.startswith('--'):
+            name, attached, _ = arg.partition('=')
+            if name in rule.global_values:
+                i += 1 if attached else 2
+                if name in rule.global_final:
+                    return i, None, None
+                continue
+            if name not in rule.global_flags or attached:
+                return i, None, arg
+            i += 1
+            continue
+
+        for position in range(1, len(arg)):
+            option = f'-{arg[position]}'
+            if option in rule.global_values:
+                # The rest of the cluster, or else the next token, is the value
+                i += 1 if position < len(arg) - 1 else 2
+                if option in rule.global_final:
+                    return i, None, None
+                break
+            if option not in rule.global_flags:
+                return i, None, arg
+        else:
+            i += 1
+    return i, None, None
+
+
+def _inside(cwd: str, target: str) -> bool:
+    """Whether target (relative to cwd) lies strictly below cwd"""
+    path = REPEATED_SLASHES.sub('/', os.path.normpath(os.path.join(cwd, target)))
+    return path.startswith(cwd.rstrip('/') + '/')
+
+
+# Rules for whitelisted commands; commands without an entry are allowed any arguments
+DEFAULT_RULES = [
+    CommandRule(
+        'git',
+        subcommands={
+            'status', 'log', 'diff', 'show', 'branch', 'rev-parse', 'ls-files', 'blame',
+            'grep', 'shortlog', 'describe', 'tag', 'remote', 'fetch', 'pull', 'push',
+            'add', 'commit', 'stash', 'checkout', 'switch', 'restore', 'init',
+        },
+        # -c / --exec-path / --upload-pack can make git run arbitrary programs
+        forbidden={'-c', '--exec-path', '--upload-pack', '--receive-pack', '--config-env'},
+        global_only=True,
+        global_flags={
+            '-p', '--paginate', '-P', '--no-pager', '--bare', '--no-replace-objects',
+            '--no-lazy-fetch', '--no-optional-locks', '--no-advice', '--literal-pathspecs',
+            '--glob-pathspecs', '--noglob-pathspecs', '--icase-pathspecs', '-v', '--version',
+            '-h', '--help',
+        },
+        global_values={'-C', '--git-dir', '--work-tree', '--namespace', '--attr-source'},
+    ),
+    CommandRule('find', forbidden={'-delete', '-exec', '-execdir', '-ok', '-okdir',
+                                   '-fprint', '-fprint0', '-fprintf', '-fls'}),
+    CommandRule(
+        'python3',
+        forbidden={'-c'},
+        global_only=True,
+        global_flags={
+            '-b', '-B', '-d', '-E', '-h', '-i', '-I', '-O', '-P', '-q', '-R', '-s', '-S', '-u',
+            '-v', '-V', '-x', '-?', '--help', '--help-env', '--help-xoptions', '--help-all',
+            '--version',
+        },
+        global_values={'-W', '-X', '--check-hash-based-pycs'},
+        global_final={'-m'},
+    ),
+    CommandRule('rm', forbidden={'--no-preserve-root'}, protect_targets=True,
+                protect_when={'-r', '-R', '--recursive'}, confine_targets=True),
+    CommandRule('chmod', protect_targets=True, protect_when={'-R', '--recursive'},
+                confine_targets=True),
+    CommandRule('mv', protect_targets=True),
+    CommandRule('sort', forbidden={'-o', '--output', '--compress-program'}),
+]
+
+# Extra argument checks for git subcommands: (subcommand, forbidden options),
+# checked anywhere after the subcommand. --exec / --upload-pack /
+# --receive-pack / -O name a program for git to run.
+GIT_SUBCOMMAND_RULES = {
+    'push': {'-f', '--force', '--force-with-lease', '--mirror', '--delete', '-d',
+             '--exec', '--receive-pack'},
+    'fetch': {'--upload-pack'},
+    'pull': {'--upload-pack'},
+    'grep': {'-O', '--open-files-in-pager'},
+    'checkout': {'-f', '--force'},
+    'diff': {'--output', '--ext-diff'},
+    'log': {'--output', '--ext-diff'},
+    'show': {'--output', '--ext-diff'},
+}
+
+
+class CommandPolicy:
+    """
+    Compiled decision table over a command whitelist
+
+    evaluate() is memoized per command string, so repeated commands cost a
+    dict lookup; only commands whose decision depends on the working
+    directory (recursive rm / chmod) are memoized per directory as well.
+    """
+
+    def __init__(self, safe_commands: Iterable[str], rules: List[CommandRule] = DEFAULT_RULES,
+                 cache_size: int = 4096):
+        rules_by_name = {rule.name: rule for rule in rules}
+        # command name -> rule (None = no argument restrictions)
+        self.table: Dict[str, Optional[CommandRule]] = {
+            name: rules_by_name.get(name) for name in safe_commands
+        }
+        self.git_rules = {sub: _compile_options(opts) for sub, opts in GIT_SUBCOMMAND_RULES.items()}
+        self._cached = lru_cache(maxsize=cache_size)(self._evaluate)
+
+    def evaluate(self, command: str) -> PolicyDecision:
+        """Decide command as run from the current working directory"""
+        decision = self._cached(command, None)
+        if decision.rule == CWD_DEPENDENT:
+            decision = self._cached(command, os.getcwd())
+        return decision
+
+    def _evaluate(self, command: str, cwd: Optional[str]) -> PolicyDecision:
+        if not command.strip():
+            return PolicyDecision(False, 'empty', 'empty command')
+
+        syntax = SHELL_SYNTAX.search(command)
+        if syntax:
+            return PolicyDecision(False, 'shell-syntax', f'shell syntax {syntax.group()!r} is not supported')
+
+        if NEEDS_SHLEX.search(command):
+            try:
+                argv = tuple(shlex.split(command))
+            except ValueError as e:
+                return PolicyDecision(False, 'syntax', f'invalid command syntax: {e}')
+        else:
+            argv = tuple(PLAIN_WORD.findall(command))
+        if not argv:
+            return PolicyDecision(False, 'empty', 'empty command')
+
+        name = argv[0]
+        if name not in self.table:
+            return PolicyDecision(False, 'not-whitelisted', f'{name} is not a whitelisted command')
+        rule = self.table[name]
+        if rule is None:
+            return PolicyDecision(True, f'{name}.allow', 'whitelisted', argv)
+
+        args = argv[1:]
+        if rule.global_only:
+            first, hit, unknown = _scan_globals(rule, args)
+            if hit:
+                return PolicyDecision(False, f'{name}.forbidden-option', f'{name} {hit} is not allowed', argv)
+            if unknown:
+                return PolicyDecision(False, f'{name}.unknown-option',
+                                      f'{name} {unknown} is not a known global option', argv)
+            options = args[:first]
+            operands = [arg for arg in args[first:] if not arg.startswith('-') or arg == '-']
+        else:
+            options = [arg for arg in args if arg.startswith('-') and arg != '-']
+            operands = [arg for arg in args if not arg.startswith('-') or arg == '-']
+            first = args.index(operands[0]) if operands else len(args)
+            for option in options:
+                hit = _option_hits(option, rule.forbidden, rule.short)
+                if hit:
+                    return PolicyDecision(False, f'{name}.forbidden-option', f'{name} {hit} is not allowed', argv)
+
+        if rule.subcommands is not None:
+            subcommand = args[first] if first < len(args) else None
+            if subcommand not in rule.subcommands:
+                return PolicyDecision(False, f'{name}.subcommand',
+                                      f'{name} {subcommand or "(none)"} is not an allowed subcommand', argv)
+            if name == 'git' and subcommand in self.git_rules:
+                forbidden, short = self.git_rules[subcommand]
+                for option in args[first + 1:]:
+                    hit = _option_hits(option, forbidden, short) if option.startswith('-') else None
+                    if hit:
+                        return PolicyDecision(False, 'git.forbidden-option',
+                                              f'git {subcommand} {hit} is not allowed', argv)
+            if name == 'git' and subcommand == 'push':
+                # +src:dst force-pushes and :dst deletes, like --force / --delete
+                for refspec in operands[1:]:
+                    if refspec.startswith(('+', ':')):
+                        return PolicyDecision(False, 'git.push-refspec',
+                                              f'git push {refspec} is not allowed', argv)
+
+        if rule.protect_targets:
+            guarded = not rule.protect_when or any(
+                _option_hits(option, rule.protect_when, rule.protect_short) for option in options
+            )
+            if guarded:
+                for operand in operands:
+                    target = REPEATED_SLASHES.sub('/', os.path.normpath(os.path.expanduser(operand)))
+                    if target in PROTECTED_TARGETS or operand in PROTECTED_TARGETS:
+                        return PolicyDecision(False, f'{name}.protected-target',
+                                              f'{name} may not target {operand}', argv)
+                if rule.confine_targets:
+                    if cwd is None:
+                        return PolicyDecision(False, CWD_DEPENDENT, 'depends on the working directory', argv)
+                    for operand in operands:
+                        if not _inside(cwd, os.path.expanduser(operand)):
+                            return PolicyDecision(False, f'{name}.protected-target',
+                                                  f'{name} may not target {operand} outside {cwd}', argv)
+
+        return PolicyDecision(True, f'{name}.allow', 'arguments allowed', argv)
+
+
+if __name__ == "__main__":
+    import sys
+
+    from sena_silent_executor import SENASilentExecutor
+
+    policy = CommandPolicy(SENASilentExecutor().safe_commands)
+    for command in sys.argv[1:] or ['git status', 'git -c core.pager=less log', 'rm -rf /',
+                                    'find . -name "*.py" -delete', 'ls; whoami', 'curl x']:
+        decision = policy.evaluate(command)
+        print(f"{'ALLOW' if decision.allowed else 'DENY ':<5}  {decision.rule:<24} {command}")
@@ -11,6 +11,8 @@ import json
 import socket
 import signal
 import logging
+import threading
+import time
 from pathlib import Path
 from typing import Dict, Any, Optional
 from datetime import datetime
@@ -21,6 +23,12 @@ sys.path.insert(0, str(Path.home() / '.claude' / 'sena_controller_v3.0'))
 # Import SENA modules (loaded once, reused forever)
 from sena_auto_format import SENAAutoFormatter
 from auto_integration import AutoIntegration
+from sena_runtime_metrics import REGISTRY
+from sena_metrics_exporter import CONTENT_TYPE, OpenMetricsExporter, start_http_exporter
+from sena_timeseries import TimeSeriesRecorder, TimeSeriesStore, retention_capacity
+from sena_logging import setup_async_logging
+from sena_tracing import TRACE_ALL, TRACER, new_trace_id, now_us
+from sena_profiler import SamplingProfiler, default_output
 # Note: sena_direct_output requires complex dependencies (claude_sena_integration, etc.)
 # which may not be initialized properly in daemon context. Format detection is the
 # key optimization anyway (10-15ms per call).
@@ -30,18 +38,14 @@ SOCKET_PATH = Path.home() / '.claude' / '.sena_daemon.sock'
 PID_FILE = Path.home() / '.claude' / '.sena_daemon.pid'
 LOG_FILE = Path.home() / '.claude' / 'logs' / 'sena_daemon.log'
 
-# Ensure log directory exists
-LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+# Optional OpenMetrics HTTP listener on 127.0.0.1 (unset or 0 = disabled)
+METRICS_PORT = int(os.environ.get('SENA_METRICS_PORT', '0') or 0)
+
+# Seconds between metric samples written to ~/.claude/sena_metrics.tsdb (0 = disabled)
+HISTORY_INTERVAL = float(os.environ.get('SENA_METRICS_HISTORY_INTERVAL', '60') or 0)
+
+# Configure logging (JSON lines, written by a background thread, rotated by size)
+LOG_LISTENER = setup_async_logging(LOG_FILE)
 logger = logging.getLogger('sena_daemon')
 
 
@@ -60,13 +64,35 @@ class SENADaemon:
         self.integration = AutoIntegration()
         logger.info("SENA modules loaded successfully")
 
-        # Statistics
+        # Statistics (request counts are derived from the metrics registry)
         self.stats = {
-            'started': datetime.now().isoformat(),
-            'requests_handled': 0,
-            'requests_by_type': {}
+            'started': datetime.now().isoformat()
+        }
+
+        # JSON-RPC method name -> handler
+        self.handlers = {
+            'detect_format': self._detect_format,
+            'apply_format': self._apply_format,
+            'check_always_on': self._check_always_on,
+            'health_check': self._health_check,
+            'stats': self._get_stats,
+            'metrics': self._get_metrics,
+            'profile': self._profile
         }
 
+        # Runtime metrics (shared process-wide registry)
+        self.metrics = REGISTRY
+        self._started_monotonic = time.monotonic()
+        self.metrics.gauge(
+            'sena_daemon_uptime_seconds', 'Seconds since the daemon started'
+        ).set_function(lambda: time.monotonic() - self._started_monotonic)
+        self._request_metrics: Dict[tuple, tuple] = {}  # (method, outcome) -> metrics
+        self._request_seq = 0
+        self.exporter = OpenMetricsExporter(self.metrics)
+        self.metrics_server = None
+        self.history = None
+        self.profiler: Optional[SamplingProfiler] = None
+
     def start(self):
         """Start the daemon"""
         # Check if already running
@@ -97,6 +123,22 @@ class SENADaemon:
         logger.info(f"SENA Daemon started (PID: {os.getpid()})")
         logger.info(f"Socket: {self.socket_path}")
 
+        # Trace file the hook client appends its spans to
+        TRACER.ensure_file()
+
+        if METRICS_PORT:
+            self.metrics_server = start_http_exporter(METRICS_PORT, exporter=self.exporter)
+            logger.info(f"Metrics: http://127.0.0.1:{METRICS_PORT}/metrics")
+
+        if HISTORY_INTERVAL > 0:
+            try:
+                self.history = TimeSeriesRecorder(
+                    TimeSeriesStore(capacity=retention_capacity(HISTORY_INTERVAL)),
+                    self.metrics, HISTORY_INTERVAL)
+                self.history.start()
+            except OSError as e:
+                logger.error(f"Metrics history disabled: {e}")
+
         self.running = True
         self._serve()
 
@@ -106,18 +148,30 @@ class SENADaemon:
             try:
                 # Accept connection
                 conn, _ = self.socket.accept()
+                accepted = now_us()
 
                 # Read request
                 data = conn.recv(4096).decode('utf-8')
                 if not data:
                     conn.close()
                     continue
+                received = now_us()
 
                 # Process request
+                trace_id = None
                 try:
                     request = json.loads(data)
+                    parsed = now_us()
+                    if isinstance(request, dict):
+                        if TRACE_ALL:
+                            request.setdefault('trace_id', new_trace_id())
+                        trace_id = request.get('trace_id')
                     response = self._handle_request(request)
+                    handled = now_us()
                 except json.JSONDecodeError:
+                    self.metrics.counter(
+                        'sena_daemon_parse_errors_total', 'Requests that were not valid JSON'
+                    ).inc()
                     response = {
                         'jsonrpc': '2.0',
                         'error': {'code': -32700, 'message': 'Parse error'},
@@ -128,31 +182,81 @@ class SENADaemon:
                 conn.sendall(json.dumps(response).encode('utf-8'))
                 conn.close()
 
+                # Record socket stages after the client has its response
+                if trace_id:
+                    self._trace_stages(trace_id, request.get('method'),
+                                       accepted, received, parsed, handled, now_us())
+
             except Exception as e:
                 logger.error(f"Error handling request: {e}")
+                self.metrics.counter(
+                    'sena_daemon_connection_errors_total', 'Connections that failed mid-request'
+                ).inc()
                 continue
 
     def _handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle JSON-RPC 2.0 request"""
+        """Handle JSON-RPC 2.0 request, recording count, latency and trace spans"""
+        start = time.perf_counter()
+        trace_id = request.get('trace_id')
+        if trace_id:
+            with TRACER.activate(str(trace_id)), TRACER.span('daemon.handle', method=request.get('method')):
+                response = self._dispatch(request)
+        else:
+            response = self._dispatch(request)
+
+        latency = time.perf_counter() - start
+        method = request.get('method')
+        label = method if method in self.handlers else 'unknown'
+        if 'result' in response:
+            outcome = 'ok'
+        elif response['error']['code'] == -32601:
+            outcome = 'not_found'
+        else:
+            outcome = 'error'
+
+        handles = self._request_metrics.get((label, outcome))
+        if handles is None:
+            handles = self._request_metrics[(label, outcome)] = (
+                self.metrics.histogram(
+                    'sena_daemon_request_seconds', 'Request handling latency', method=label
+                ),
+                self.metrics.counter(
+                    'sena_daemon_requests_total', 'Requests handled', method=label, outcome=outcome
+                ),
+            )
+        histogram, counter = handles
+        histogram.observe(latency)
+        counter.inc()
+
+        self._request_seq += 1
+        logger.info('request', extra={
+            'request_id': self._request_seq,
+            'rpc_id': request.get('id'),
+            'method': label,
+            'outcome': outcome,
+            'latency_ms': round(latency * 1000, 3),
+            'trace_id': trace_id,
+        })
+        return response
+
+    def _trace_stages(self, trace_id: str, method: Optional[str], accepted: int,
+                      received: int, parsed: int, handled: int, sent: int):
+        """Record the socket-level spans of one request and write the trace"""
+        args = {'trace_id': str(trace_id), 'method': method}
+        TRACER.add('daemon.request', accepted, sent, dict(args))
+        TRACER.add('daemon.recv', accepted, received, dict(args, parent='daemon.request'))
+        TRACER.add('daemon.parse', received, parsed, dict(args, parent='daemon.request'))
+        TRACER.add('daemon.send', handled, sent, dict(args, parent='daemon.request'))
+        TRACER.flush(force=True)
+
+    def _dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Route a JSON-RPC 2.0 request to its handler"""
         method = request.get('method')
         params = request.get('params', {})
         request_id = request.get('id')
 
-        # Update stats
-        self.stats['requests_handled'] += 1
-        self.stats['requests_by_type'][method] = \
-            self.stats['requests_by_type'].get(method, 0) + 1
-
         # Route to handler
-        handlers = {
-            'detect_format': self._detect_format,
-            'apply_format': self._apply_format,
-            'check_always_on': self._check_always_on,
-            'health_check': self._health_check,
-            'stats': self._get_stats
-        }
-
-        handler = handlers.get(method)
+        handler = self.handlers.get(method)
         if not handler:
             return {
                 'jsonrpc': '2.0',
@@ -168,7 +272,7 @@ class SENADaemon:
                 'id': request_id
             }
         except Exception as e:
-            logger.error(f"Error in {method}: {e}")
+            logger.error(f"Error in {method}: {e}", extra={'method': method})
             return {
                 'jsonrpc': '2.0',
                 'error': {'code': -32603, 'message': str(e)},
@@ -178,7 +282,8 @@ class SENADaemon:
     def _detect_format(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Detect which format is needed for user input"""
         user_input = params.get('user_input', '')
-        format_type = self.formatter.detect_format_needed(user_input)
+        with TRACER.span('formatter.detect_format_needed', input_length=len(user_input)):
+            format_type = self.formatter.detect_format_needed(user_input)
         return {'format_type': format_type}
 
     def _apply_format(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -188,7 +293,8 @@ class SENADaemon:
 
         # If format_type not specified, detect it
         if not format_type:
-            format_type = self.formatter.detect_format_needed(user_input)
+            with TRACER.span('formatter.detect_format_needed', input_length=len(user_input)):
+                format_type = self.formatter.detect_format_needed(user_input)
 
         if not format_type:
             return {'output': None, 'format_applied': None}
@@ -220,8 +326,60 @@ class SENADaemon:
         }
 
     def _get_stats(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Get daemon statistics"""
-        return self.stats
+        """Get daemon statistics and runtime metrics"""
+        metrics = self.metrics.snapshot()
+        requests_by_type: Dict[str, int] = {}
+        for series in metrics.get('sena_daemon_requests_total', {}).get('series', []):
+            method = series['labels']['method']
+            requests_by_type[method] = requests_by_type.get(method, 0) + int(series['value'])
+
+        return dict(
+            self.stats,
+            requests_handled=sum(requests_by_type.values()),
+            requests_by_type=requests_by_type,
+            metrics=metrics
+        )
+
+    def _get_metrics(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Get runtime metrics in OpenMetrics text format"""
+        return {'content_type': CONTENT_TYPE, 'text': self.exporter.render()}
+
+    def _profile(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Start, stop or inspect the sampling profiler
+
+        params:
+            action: 'start' (default), 'stop' or 'status'
+            seconds: how long to sample (default 10, max 300)
+            interval_ms: sampling interval (default 5)
+            all_threads: sample every thread, not just the serving thread
+            include_idle: keep samples of threads waiting in accept()/wait()
+
+        Sampling runs on a background thread; this call returns at once and
+        the collapsed stacks are written when sampling ends.
+        """
+        action = params.get('action', 'start')
+        if action == 'status':
+            return self.profiler.status() if self.profiler else {'running': False}
+        if action == 'stop':
+            if not self.profiler:
+                return {'running': False}
+            self.profiler.stop()
+            return self.profiler.status()
+        if action != 'start':
+            raise ValueError(f"Unknown profile action: {action}")
+
+        if self.profiler and self.profiler.running:
+            raise RuntimeError("Profiler already running")
+
+        self.profiler = SamplingProfiler(
+            interval=float(params.get('interval_ms', 5)) / 1000,
+            include_idle=bool(params.get('include_idle', False))
+        )
+        thread_ids = None if params.get('all_threads') else [threading.main_thread().ident]
+        self.profiler.start(float(params.get('seconds', 10)), default_output(), thread_ids)
+        logger.info("Profiler started", extra={'output': str(self.profiler.output)})
+        return self.profiler.status()
 
     def _is_running(self) -> bool:
         """Check if daemon is already running"""
@@ -252,6 +410,15 @@ class SENADaemon:
         if self.socket:
             self.socket.close()
 
+        if self.metrics_server:
+            self.metrics_server.shutdown()
+
+        if self.history:
+            self.history.stop()
+
+        if self.profiler and self.profiler.running:
+            self.profiler.stop()
+
         if self.socket_path.exists():
             self.socket_path.unlink()
 
@@ -259,6 +426,7 @@ class SENADaemon:
             self.pid_file.unlink()
 
         logger.info("SENA Daemon stopped")
+        LOG_LISTENER.stop()
         sys.exit(0)
 
 
@@ -286,9 +454,14 @@ class SENADaemonClient:
             # Send request
             sock.sendall(json.dumps(request).encode('utf-8'))
 
-            # Receive response
-            data = sock.recv(4096).decode('utf-8')
-            response = json.loads(data)
+            # Receive response (the daemon closes the connection when done)
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            response = json.loads(b''.join(chunks).decode('utf-8'))
 
             sock.close()
 
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+SENA Filesystem Watch - v3.5.2
+Cheap change detection for a fixed set of paths
+
+Uses inotify on Linux (via ctypes, no dependencies) and falls back to
+stat polling elsewhere. Watched files do not need to exist: the nearest
+existing ancestor directory is watched instead, so creating a file or
+one of its parent directories is detected too.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def file_signature(path: Path) -> Optional[Tuple[int, int, int, int]]:
+    """(mtime_ns, size, inode, mode) of path, or None if it does not exist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino, st.st_mode)
+
+
+def _load_inotify():
+    """Return libc with inotify functions, or None if unavailable"""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class PathWatcher:
+    """
+    Detects changes to a set of paths since the last rearm()
+
+    Usage:
+        watcher = PathWatcher(paths)
+        watcher.rearm()
+        value = compute()
+        ...
+        if watcher.changed():
+            watcher.rearm()
+            value = compute()
+    """
+
+    def __init__(self, paths: Iterable[Path], poll_interval: float = 1.0,
+                 use_inotify: bool = True):
+        self.paths: List[Path] = [Path(p) for p in paths]
+        self.poll_interval = poll_interval
+
+        self._libc = _load_inotify() if use_inotify else None
+        self._fd: Optional[int] = None
+        self._watches: Dict[int, set] = {}     # wd -> names that matter in that dir
+        self._dirty = True
+        self._signatures: Dict[Path, Optional[tuple]] = {}
+        self._last_check = float('-inf')
+
+    @property
+    def backend(self) -> str:
+        return 'inotify' if self._fd is not None else 'poll'
+
+    def rearm(self):
+        """Record the current state as unchanged (call before recomputing)"""
+        self._dirty = False
+        self._last_check = time.monotonic()
+
+        if self._libc is not None and self._arm_inotify():
+            return
+
+        self._signatures = {path: file_signature(path) for path in self.paths}
+
+    def changed(self, max_age: Optional[float] = None) -> bool:
+        """
+        Whether any watched path may have changed since rearm()
+
+        With inotify this is one non-blocking read. When polling, paths are
+        re-stat'ed only if the last check is older than max_age (default
+        poll_interval) seconds, so a result may be that stale.
+        """
+        if self._dirty:
+            return True
+
+        if self._fd is not None:
+            self._drain_events()
+            return self._dirty
+
+        max_age = self.poll_interval if max_age is None else max_age
+        now = time.monotonic()
+        if now - self._last_check < max_age:
+            return False
+
+        self._last_check = now
+        for path, signature in self._signatures.items():
+            if file_signature(path) != signature:
+                self._dirty = True
+                break
+        return self._dirty
+
+    def close(self):
+        """Release the inotify descriptor"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            self._watches = {}
+
+    def _arm_inotify(self) -> bool:
+        """(Re)create inotify watches on the nearest existing directories"""
+        self.close()
+        fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            self._libc = None
+            return False
+        self._fd = fd
+
+        # Directory to watch -> child names whose changes matter
+        targets: Dict[Path, set] = {}
+        for path in self.paths:
+            child, parent = path, path.parent
+            while not parent.is_dir() and parent != parent.parent:
+                child, parent = parent, parent.parent
+            targets.setdefault(parent, set()).add(child.name)
+
+        for directory, names in targets.items():
+            wd = self._libc.inotify_add_watch(fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                # Cannot watch (permissions, limits): poll instead
+                self.close()
+                self._libc = None
+                return False
+            self._watches.setdefault(wd, set()).update(names)
+
+        return True
+
+    def _drain_events(self):
+        """Read pending events and mark dirty if a relevant path changed"""
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return
+            except OSError:
+                self._dirty = True
+                return
+            if not data:
+                return
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'replace')
+                offset += length
+
+                if mask & (IN_Q_OVERFLOW | IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                    self._dirty = True
+                elif name in self._watches.get(wd, ()):
+                    self._dirty = True
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+SENA Logging - v3.5.2
+Queue-based structured logging for long-running SENA processes
+
+Loggers only enqueue records (QueueHandler); a background QueueListener
+formats them and does the disk I/O, so logging adds no file writes to the
+request path. The log file gets one JSON object per line and rotates by
+size; the console keeps the plain text format.
+
+Fields passed with extra= (request_id, method, latency_ms, ...) become
+top-level JSON keys.
+
+Configuration:
+    SENA_LOG_LEVEL      - minimum level (default INFO)
+    SENA_LOG_MAX_BYTES  - rotate the log file at this size (default 5 MB)
+    SENA_LOG_BACKUPS    - rotated files kept (default 3)
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+LOG_LEVEL = os.environ.get('SENA_LOG_LEVEL', 'INFO').upper()
+LOG_MAX_BYTES = int(os.environ.get('SENA_LOG_MAX_BYTES', str(5 * 1024 * 1024)))
+LOG_BACKUPS = int(os.environ.get('SENA_LOG_BACKUPS', '3'))
+
+# LogRecord attributes that are not user-supplied extras
+_STANDARD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with extra= fields as top-level keys"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='microseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+def setup_async_logging(log_file: Path, logger: Optional[logging.Logger] = None,
+                        console: bool = True) -> logging.handlers.QueueListener:
+    """
+    Route logger (default: root) through a queue to a rotating JSON file
+
+    Returns the started listener; call listener.stop() on shutdown to
+    flush queued records.
+    """
+    logger = logger or logging.getLogger()
+    Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding='utf-8'
+    )
+    file_handler.setFormatter(JsonFormatter())
+    handlers = [file_handler]
+
+    if console:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        handlers.append(stream_handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(LOG_LEVEL)
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    path = Path(tempfile.mkdtemp()) / 'demo.log'
+    demo_logger = logging.getLogger('sena_demo')
+    listener = setup_async_logging(path, demo_logger, console=False)
+    demo_logger.info('request', extra={'request_id': 1, 'method': 'detect_format', 'latency_ms': 0.42})
+    demo_logger.warning('slow request', extra={'request_id': 2, 'method': 'stats', 'latency_ms': 120.5})
+    listener.stop()
+    print(path.read_text(), end='')
@@ -6,28 +6,131 @@ Standalone metrics and health monitoring for SENA (no MCP dependencies)
 
 import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+from sena_fs_watch import PathWatcher, file_signature
+from sena_runtime_metrics import get_registry
 
 # SENA directories
 SENA_ROOT = Path.home() / '.claude' / 'sena_controller_v3.0'
 MEMORY_DIR = Path.home() / '.claude' / 'memory'
 HOOKS_DIR = Path.home() / '.claude' / 'hooks'
-
-
-def get_sena_health() -> Dict:
+DAEMON_SOCKET = Path.home() / '.claude' / '.sena_daemon.sock'
+TEST_REPORT = Path.home() / '.claude' / 'logs' / 'sena_test_results.xml'
+
+# Per-probe timeout (seconds) for config and phase checks
+PROBE_TIMEOUT = float(os.environ.get('SENA_PROBE_TIMEOUT', '2.0'))
+PROBE_WORKERS = 8
+_probe_pool: Optional[ThreadPoolExecutor] = None
+
+
+# Files checked by get_sena_health
+CORE_FILES = [
+    'sena_clean_output_100.py',
+    'sena_progress_auto_100.py',
+    'auto_integration.py',
+    'sena_auto_format.py',
+    'VERSION'
+]
+
+INTELLIGENCE_FILES = [
+    SENA_ROOT / 'commands' / 'deep-think.md',
+    SENA_ROOT / 'agents' / 'security-expert.md',
+    SENA_ROOT / 'agents' / 'performance-expert.md',
+    SENA_ROOT / 'agents' / 'architect.md'
+]
+
+MEMORY_FILES = [
+    MEMORY_DIR / 'reasoning-frameworks.md',
+    MEMORY_DIR / 'security-patterns.md',
+    MEMORY_DIR / 'performance-patterns.md',
+    MEMORY_DIR / 'architecture-patterns.md'
+]
+
+HOOK_FILES = [
+    HOOKS_DIR / 'user-prompt-submit.sh',
+    HOOKS_DIR / 'sena-enforcer.sh'
+]
+
+VERSION_MARKER = 'v3.3.1'
+
+# Seconds a polled health snapshot may be served without re-checking files
+HEALTH_POLL_INTERVAL = 1.0
+
+# Version marker results keyed by path, valid while the file signature matches
+_marker_cache: Dict[Path, tuple] = {}
+
+
+def _has_version_marker(file_path: Path, marker: str = VERSION_MARKER) -> bool:
+    """Check a source file for the version marker, re-reading only if it changed"""
+    signature = file_signature(file_path)
+    cached = _marker_cache.get(file_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    needle = marker.encode('utf-8')
+    found = False
+    try:
+        # Markers live in the module header, so stop at the first hit
+        with open(file_path, 'rb') as f:
+            tail = b''
+            for block in iter(lambda: f.read(65536), b''):
+                if needle in tail + block:
+                    found = True
+                    break
+                tail = block[-(len(needle) - 1):]
+    except OSError:
+        pass
+
+    _marker_cache[file_path] = (signature, found)
+    return found
+
+
+class HealthSnapshotCache:
     """
-    Get comprehensive SENA Controller health status
+    Serves a computed snapshot until a watched path changes
 
-    Returns complete health metrics including:
-    - Component status (all core files)
-    - Version information
-    - Test coverage
-    - Background processes
-    - Hook status
-    - Memory system status
+    Changes are detected with inotify where available, otherwise by
+    re-stat'ing the watched paths at most every poll_interval seconds.
     """
+
+    def __init__(self, compute, paths: List[Path], poll_interval: float = HEALTH_POLL_INTERVAL):
+        self.compute = compute
+        self.watcher = PathWatcher(paths, poll_interval=poll_interval)
+        self.snapshot: Optional[Dict] = None
+        self.computed_at = 0.0
+        self.refreshes = 0
+
+    def get(self, max_staleness: Optional[float] = None) -> Dict:
+        """
+        Return the snapshot, recomputing it if a watched path changed
+
+        Args:
+            max_staleness: Maximum age in seconds of the last change check
+                           when polling. 0 forces a full recompute.
+        """
+        if self.snapshot is None or max_staleness == 0 or self.watcher.changed(max_staleness):
+            # Arm before computing so changes made during the computation are seen
+            self.watcher.rearm()
+            self.snapshot = self.compute()
+            self.computed_at = time.monotonic()
+            self.refreshes += 1
+
+        return {
+            **self.snapshot,
+            "cache": {
+                "backend": self.watcher.backend,
+                "age_seconds": round(time.monotonic() - self.computed_at, 3)
+            }
+        }
+
+
+def _compute_sena_health() -> Dict:
+    """Compute the health snapshot from the filesystem"""
     health = {
         "timestamp": datetime.now().isoformat(),
         "version": "3.3.1",
@@ -37,29 +140,17 @@ def get_sena_health() -> Dict:
     }
 
     # Core components check
-    core_files = [
-        'sena_clean_output_100.py',
-        'sena_progress_auto_100.py',
-        'auto_integration.py',
-        'sena_auto_format.py',
-        'VERSION'
-    ]
-
     components_healthy = 0
-    components_total = len(core_files)
+    components_total = len(CORE_FILES)
 
-    for file in core_files:
+    for file in CORE_FILES:
         file_path = SENA_ROOT / file
         exists = file_path.exists()
 
         # Check v3.3.1 marker
         version_correct = False
         if exists and file.endswith('.py'):
-            try:
-                content = file_path.read_text()
-                version_correct = 'v3.3.1' in content
-            except:
-                pass
+            version_correct = _has_version_marker(file_path)
         elif file == 'VERSION':
             try:
                 version = file_path.read_text().strip()
@@ -78,35 +169,16 @@ def get_sena_health() -> Dict:
         }
 
     # Intelligence Enhancement (Phase 1)
-    intelligence_files = [
-        SENA_ROOT / 'commands' / 'deep-think.md',
-        SENA_ROOT / 'agents' / 'security-expert.md',
-        SENA_ROOT / 'agents' / 'performance-expert.md',
-        SENA_ROOT / 'agents' / 'architect.md'
-    ]
-
-    intelligence_healthy = sum(1 for f in intelligence_files if f.exists())
-    intelligence_total = len(intelligence_files)
+    intelligence_healthy = sum(1 for f in INTELLIGENCE_FILES if f.exists())
+    intelligence_total = len(INTELLIGENCE_FILES)
 
     # Memory System
-    memory_files = [
-        MEMORY_DIR / 'reasoning-frameworks.md',
-        MEMORY_DIR / 'security-patterns.md',
-        MEMORY_DIR / 'performance-patterns.md',
-        MEMORY_DIR / 'architecture-patterns.md'
-    ]
-
-    memory_healthy = sum(1 for f in memory_files if f.exists())
-    memory_total = len(memory_files)
+    memory_healthy = sum(1 for f in MEMORY_FILES if f.exists())
+    memory_total = len(MEMORY_FILES)
 
     # Hooks
-    hook_files = [
-        HOOKS_DIR / 'user-prompt-submit.sh',
-        HOOKS_DIR / 'sena-enforcer.sh'
-    ]
-
-    hooks_healthy = sum(1 for f in hook_files if f.exists() and os.access(f, os.X_OK))
-    hooks_total = len(hook_files)
+    hooks_healthy = sum(1 for f in HOOK_FILES if f.exists() and os.access(f, os.X_OK))
+    hooks_total = len(HOOK_FILES)
 
     # Calculate overall health
     total_components = components_healthy + intelligence_healthy + memory_healthy + hooks_healthy
@@ -132,6 +204,115 @@ def get_sena_health() -> Dict:
     return health
 
 
+_health_cache: Optional[HealthSnapshotCache] = None
+
+
+def get_sena_health(max_staleness: Optional[float] = None) -> Dict:
+    """
+    Get comprehensive SENA Controller health status
+
+    Returns complete health metrics including:
+    - Component status (all core files)
+    - Version information
+    - Test coverage
+    - Background processes
+    - Hook status
+    - Memory system status
+
+    The snapshot is cached and recomputed only when a checked file changes.
+
+    Args:
+        max_staleness: Maximum seconds since files were last checked
+                       (polling backend only). 0 forces a full refresh.
+    """
+    global _health_cache
+    if _health_cache is None:
+        paths = [SENA_ROOT / f for f in CORE_FILES] + INTELLIGENCE_FILES + MEMORY_FILES + HOOK_FILES
+        _health_cache = HealthSnapshotCache(_compute_sena_health, paths)
+    return _health_cache.get(max_staleness)
+
+
+def count_lines(file_path: Path, block_size: int = 1 << 20) -> int:
+    """Count lines with a buffered newline count (a final unterminated line counts)"""
+    lines = 0
+    last = b'\n'
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            lines += block.count(b'\n')
+            last = block[-1:]
+    return lines + (last != b'\n')
+
+
+class SourceMetricsStore:
+    """
+    Per-file line counts keyed by file signature (mtime, size, inode)
+
+    Each call stats the directory and its matching files, and re-reads
+    only files whose signature changed, so the cost is proportional to
+    what changed.
+    """
+
+    def __init__(self):
+        self.files: Dict[Path, tuple] = {}   # path -> (signature, line count)
+        self.reads = 0
+        self._listing: Dict[Path, tuple] = {}  # directory -> (signature, paths)
+
+    @staticmethod
+    def is_tracked(name: str) -> bool:
+        """Files included in code quality metrics"""
+        return name.endswith('.py') and (name.startswith('sena_') or name == 'auto_integration.py')
+
+    def _list(self, directory: Path) -> List[Path]:
+        """Tracked files in directory, relisted only when the directory changes"""
+        signature = file_signature(directory)
+        cached = self._listing.get(directory)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        try:
+            paths = sorted(Path(entry.path) for entry in os.scandir(directory)
+                           if self.is_tracked(entry.name))
+        except OSError:
+            paths = []
+        self._listing[directory] = (signature, paths)
+        return paths
+
+    def line_count(self, file_path: Path) -> Optional[int]:
+        """Line count for one file, re-read only if it changed"""
+        signature = file_signature(file_path)
+        if signature is None:
+            self.files.pop(file_path, None)
+            return None
+
+        cached = self.files.get(file_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        try:
+            lines = count_lines(file_path)
+        except OSError:
+            return None
+        self.reads += 1
+        self.files[file_path] = (signature, lines)
+        return lines
+
+    def totals(self, directory: Path) -> tuple:
+        """(file count, total lines) for tracked files in directory"""
+        paths = self._list(directory)
+
+        # Forget files that are no longer listed
+        listed = set(paths)
+        for stale in [p for p in self.files if p.parent == directory and p not in listed]:
+            del self.files[stale]
+
+        counts = [self.line_count(path) for path in paths]
+        counts = [count for count in counts if count is not None]
+        return len(counts), sum(counts)
+
+
+_source_metrics = SourceMetricsStore()
+
+
 def get_innovation_metrics() -> Dict:
     """
     Get SENA innovation and feature metrics
@@ -174,18 +355,8 @@ def get_innovation_metrics() -> Dict:
         }
     }
 
-    # Code quality metrics
-    total_lines = 0
-    total_files = 0
-
-    for py_file in SENA_ROOT.glob('*.py'):
-        if py_file.name.startswith('sena_') or py_file.name == 'auto_integration.py':
-            try:
-                lines = len(py_file.read_text().splitlines())
-                total_lines += lines
-                total_files += 1
-            except:
-                pass
+    # Code quality metrics (only changed files are re-read)
+    total_files, total_lines = _source_metrics.totals(SENA_ROOT)
 
     metrics["quality"] = {
         "total_python_files": total_files,
@@ -212,81 +383,269 @@ def get_innovation_metrics() -> Dict:
     return metrics
 
 
-def get_test_results() -> Dict:
+def _suite_name(classname: str) -> str:
+    """Suite name for a junit testcase classname ('tests.test_sena_metrics' -> 'sena_metrics')"""
+    module = classname.split('.')
+    name = next((part for part in reversed(module) if part.startswith('test_')), module[-1])
+    return name[len('test_'):] if name.startswith('test_') else name
+
+
+def get_test_results(report_path: Optional[Path] = None) -> Dict:
     """
-    Get SENA test results and coverage
+    Get SENA test results from the latest pytest junit report
+
+    Generate the report with:
+        pytest tests/ --junitxml ~/.claude/logs/sena_test_results.xml
 
     Returns:
-    - Test suite results
-    - Coverage metrics
-    - Known issues
+    - Test suite results (one suite per test module)
+    - Overall pass rate
+    - Report path and age
     """
+    import xml.etree.ElementTree as ElementTree
+
+    report_path = Path(report_path or os.environ.get('SENA_TEST_REPORT') or TEST_REPORT)
     results = {
         "timestamp": datetime.now().isoformat(),
         "version": "3.3.1",
+        "report": str(report_path),
         "test_suites": {},
         "overall": {}
     }
 
-    # Test results based on migration document
-    test_suites = {
-        "auto_integration": {
-            "tests_passing": 7,
-            "tests_total": 7,
-            "status": "passed",
-            "details": "100% detection accuracy"
-        },
-        "clean_output": {
-            "tests_passing": 4,
-            "tests_total": 4,
-            "status": "passed",
-            "details": "All filters working (markers, Tool ran, thinking, content)"
-        },
-        "progress_display": {
-            "tests_passing": 4,
-            "tests_total": 4,
-            "status": "passed",
-            "details": "All modes working (simple, multi-step, custom, failed)"
-        },
-        "format_generation": {
-            "tests_passing": 1,
-            "tests_total": 1,
-            "status": "passed",
-            "details": "Table generation working"
-        },
-        "version_marker": {
-            "tests_passing": 1,
-            "tests_total": 1,
-            "status": "passed",
-            "details": "Version 3.3.1 verified"
+    try:
+        root = ElementTree.parse(report_path).getroot()
+    except (OSError, ElementTree.ParseError) as e:
+        results["overall"] = {
+            "tests_passing": 0,
+            "tests_total": 0,
+            "pass_rate": 0,
+            "status": "no_report",
+            "details": f"No readable junit report ({e.__class__.__name__}); "
+                       f"run: pytest tests/ --junitxml {report_path}"
         }
-    }
+        return results
+
+    results["report_age_seconds"] = round(time.time() - report_path.stat().st_mtime, 1)
+
+    test_suites: Dict[str, Dict] = {}
+    for case in root.iter('testcase'):
+        suite = test_suites.setdefault(_suite_name(case.get('classname', '')), {
+            "tests_passing": 0, "tests_total": 0, "failed": 0, "skipped": 0, "seconds": 0.0
+        })
+        suite["tests_total"] += 1
+        suite["seconds"] += float(case.get('time') or 0)
+        if case.find('failure') is not None or case.find('error') is not None:
+            suite["failed"] += 1
+        elif case.find('skipped') is not None:
+            suite["skipped"] += 1
+        else:
+            suite["tests_passing"] += 1
+
+    for suite in test_suites.values():
+        suite["seconds"] = round(suite["seconds"], 3)
+        suite["status"] = "failed" if suite["failed"] else "passed"
+        suite["details"] = f"{suite['failed']} failed, {suite['skipped']} skipped"
 
-    results["test_suites"] = test_suites
+    results["test_suites"] = dict(sorted(test_suites.items()))
 
-    # Calculate overall
+    # Calculate overall (skipped tests do not count against the pass rate)
     total_passing = sum(suite["tests_passing"] for suite in test_suites.values())
+    total_failed = sum(suite["failed"] for suite in test_suites.values())
     total_tests = sum(suite["tests_total"] for suite in test_suites.values())
+    counted = total_passing + total_failed
 
     results["overall"] = {
         "tests_passing": total_passing,
         "tests_total": total_tests,
-        "pass_rate": round(total_passing / total_tests * 100, 1) if total_tests > 0 else 0,
-        "status": "all_passing" if total_passing == total_tests else "some_failing"
+        "pass_rate": round(total_passing / counted * 100, 1) if counted > 0 else 0,
+        "status": "all_passing" if total_failed == 0 else "some_failing"
     }
 
     return results
 
 
-def check_sena_config() -> Dict:
+def _daemon_stats(timeout: float = 1.0) -> Dict:
+    """Fetch the daemon 'stats' call over its socket (empty if not running)"""
+    import socket
+
+    request = json.dumps({'jsonrpc': '2.0', 'method': 'stats', 'params': {}, 'id': 1})
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(DAEMON_SOCKET))
+            sock.sendall(request.encode('utf-8'))
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        return json.loads(b''.join(chunks).decode('utf-8')).get('result') or {}
+    except (OSError, ValueError):
+        return {}
+
+
+def get_runtime_metrics() -> Dict:
+    """
+    Get live runtime metrics
+
+    Returns:
+    - This process's metrics registry (counters, gauges, latency percentiles)
+    - The daemon's registry, if the daemon is running
+    """
+    daemon = _daemon_stats()
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "process": get_registry().snapshot(),
+        "daemon": {
+            "running": bool(daemon),
+            "requests_handled": daemon.get('requests_handled', 0),
+            "metrics": daemon.get('metrics', {})
+        }
+    }
+
+
+def get_metrics_history(match: str = '', minutes: float = 60, points: int = 60,
+                        agg: str = 'avg') -> Dict:
+    """
+    Get downsampled metric history recorded by the daemon
+
+    Returns series whose name contains match over the last `minutes`,
+    with at most `points` values each (avg, min, max or last per step).
+    """
+    from sena_timeseries import TIMESERIES_FILE, TimeSeriesStore
+
+    end = time.time()
+    history = {
+        "timestamp": datetime.now().isoformat(),
+        "file": str(TIMESERIES_FILE),
+        "start": int(end - minutes * 60),
+        "end": int(end),
+        "aggregation": agg,
+        "series": {}
+    }
+
+    try:
+        store = TimeSeriesStore(TIMESERIES_FILE, readonly=True)
+    except (OSError, ValueError) as e:
+        history["error"] = f"No metrics history ({e.__class__.__name__}); start the daemon to record it"
+        return history
+
+    try:
+        history["series"] = {
+            name: [[stamp, round(value, 6)] for stamp, value in values]
+            for name, values in store.query(match, history["start"], end, points, agg).items()
+        }
+    finally:
+        store.close()
+    return history
+
+
+def _probe_executor() -> ThreadPoolExecutor:
+    """Shared thread pool for blocking filesystem probes"""
+    global _probe_pool
+    if _probe_pool is None:
+        _probe_pool = ThreadPoolExecutor(max_workers=PROBE_WORKERS, thread_name_prefix='sena-probe')
+    return _probe_pool
+
+
+def _retire_probe_executor(executor: ThreadPoolExecutor):
+    """
+    Stop handing work to a pool with a wedged worker
+
+    The stuck thread cannot be interrupted; the pool is dropped so later
+    probes get a fresh one, and its threads exit once their probe returns.
+    """
+    global _probe_pool
+    if _probe_pool is executor:
+        _probe_pool = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _timed_probe(probe: Callable[[], Any], started: Dict[str, float], name: str) -> tuple:
+    """Run probe, recording when it started; returns (value, error, seconds)"""
+    start = time.perf_counter()
+    started[name] = time.monotonic()
+    try:
+        return probe(), None, time.perf_counter() - start
+    except Exception as e:
+        return None, f"{e.__class__.__name__}: {e}", time.perf_counter() - start
+
+
+def run_probes(probes: Dict[str, Callable[[], Any]],
+               timeout: Optional[float] = None) -> tuple:
+    """
+    Run independent probes concurrently, each bounded by timeout seconds
+
+    Returns (values, timings): values maps each probe to its result (None
+    if it failed or timed out); timings maps each probe to its status
+    (ok, error, timeout) and duration. Each probe gets timeout seconds
+    from when a worker picks it up; one still queued timeout seconds after
+    submission times out too. A probe stuck on a slow filesystem retires
+    the pool, so its wedged worker is never handed another probe.
+    """
+    timeout = PROBE_TIMEOUT if timeout is None else timeout
+    executor = _probe_executor()
+    started: Dict[str, float] = {}
+    submitted = time.monotonic()
+    futures = {name: executor.submit(_timed_probe, probe, started, name) for name, probe in probes.items()}
+
+    values: Dict[str, Any] = {}
+    timings: Dict[str, Dict] = {}
+    wedged = False
+    for name, future in futures.items():
+        deadline = submitted + timeout
+        result = None
+        while result is None:
+            try:
+                result = future.result(max(0.0, deadline - time.monotonic()))
+            except FutureTimeout:
+                # Picked up after the wait began: the probe's own deadline applies
+                own_deadline = started.get(name, submitted) + timeout
+                if own_deadline <= deadline:
+                    break
+                deadline = own_deadline
+
+        if result is None:
+            future.cancel()
+            wedged = wedged or name in started
+            values[name] = None
+            timings[name] = {"status": "timeout", "ms": round(timeout * 1000, 1)}
+            continue
+
+        value, error, seconds = result
+        values[name] = value
+        timings[name] = {"status": "error" if error else "ok", "ms": round(seconds * 1000, 3)}
+        if error:
+            timings[name]["error"] = error
+
+    if wedged:
+        _retire_probe_executor(executor)
+    return values, timings
+
+
+def _read_json(path: Path) -> Optional[Dict]:
+    """Parsed JSON file, or None if it does not exist (parse errors raise)"""
+    try:
+        text = path.read_text()
+    except FileNotFoundError:
+        return None
+    return json.loads(text)
+
+
+def check_sena_config(timeout: Optional[float] = None) -> Dict:
     """
     Check SENA configuration and settings
 
+    Checks run concurrently, each bounded by timeout seconds.
+
     Returns:
     - Always-on mode status
     - Clean output mode status
     - Auto progress mode status
     - Hook configuration
+    - Per-check status and timing
     """
     config = {
         "timestamp": datetime.now().isoformat(),
@@ -295,52 +654,73 @@ def check_sena_config() -> Dict:
         "settings": {}
     }
 
-    # Check mode flags
     claude_dir = Path.home() / '.claude'
+    settings_file = claude_dir / 'settings.json'
+
+    values, timings = run_probes({
+        "always_on": (claude_dir / '.sena_always_on').exists,
+        "clean_output_100": (claude_dir / '.sena_clean_output_100').exists,
+        "auto_progress_100": (claude_dir / '.sena_auto_progress_100').exists,
+        "settings": lambda: _read_json(settings_file),
+    }, timeout)
 
+    # Check mode flags
     config["modes"] = {
-        "always_on": (claude_dir / '.sena_always_on').exists(),
-        "clean_output_100": (claude_dir / '.sena_clean_output_100').exists(),
-        "auto_progress_100": (claude_dir / '.sena_auto_progress_100').exists()
+        name: bool(values[name]) for name in ("always_on", "clean_output_100", "auto_progress_100")
     }
 
     # Check hooks
-    settings_file = claude_dir / 'settings.json'
-    if settings_file.exists():
-        try:
-            settings = json.loads(settings_file.read_text())
-            config["hooks"] = {
-                "user_prompt_submit": settings.get("hooks", {}).get("userPromptSubmit") is not None,
-                "assistant_response_submit": settings.get("hooks", {}).get("assistantResponseSubmit") is not None
-            }
-            config["settings"] = {
-                "hooks_configured": True,
-                "settings_file_exists": True
-            }
-        except:
-            config["settings"] = {
-                "hooks_configured": False,
-                "settings_file_exists": True,
-                "error": "Failed to parse settings.json"
-            }
+    settings = values["settings"]
+    status = timings["settings"]["status"]
+    if status == "ok" and settings is not None and not isinstance(settings, dict):
+        # Valid JSON, but not the object settings.json must hold
+        status = "error"
+    if status == "ok" and settings is not None:
+        hooks = settings.get("hooks")
+        if not isinstance(hooks, dict):
+            hooks = {}
+        config["hooks"] = {
+            "user_prompt_submit": hooks.get("userPromptSubmit") is not None,
+            "assistant_response_submit": hooks.get("assistantResponseSubmit") is not None
+        }
+        config["settings"] = {
+            "hooks_configured": True,
+            "settings_file_exists": True
+        }
+    elif status == "error":
+        config["settings"] = {
+            "hooks_configured": False,
+            "settings_file_exists": True,
+            "error": "Failed to parse settings.json"
+        }
+    elif status == "timeout":
+        config["settings"] = {
+            "hooks_configured": False,
+            "settings_file_exists": None,
+            "error": "Timed out reading settings.json"
+        }
     else:
         config["settings"] = {
             "hooks_configured": False,
             "settings_file_exists": False
         }
 
+    config["probes"] = timings
     return config
 
 
-def get_phase_status() -> Dict:
+def get_phase_status(timeout: Optional[float] = None) -> Dict:
     """
     Get SENA v3.3.1 implementation phase status
 
+    Checks run concurrently, each bounded by timeout seconds.
+
     Returns:
     - Phase 1 (Intelligence Enhancement) status
     - Phase 2 (Access Expansion) status
     - Phase 3 (Autonomous Capabilities) status
     - Overall roadmap progress
+    - Per-check status and timing
     """
     status = {
         "timestamp": datetime.now().isoformat(),
@@ -348,49 +728,47 @@ def get_phase_status() -> Dict:
         "phases": {}
     }
 
+    agent_files = {
+        "security_expert": SENA_ROOT / 'agents' / 'security-expert.md',
+        "performance_expert": SENA_ROOT / 'agents' / 'performance-expert.md',
+        "architect": SENA_ROOT / 'agents' / 'architect.md',
+    }
+    memory_files = {
+        "reasoning_frameworks": MEMORY_DIR / 'reasoning-frameworks.md',
+        "security_patterns": MEMORY_DIR / 'security-patterns.md',
+        "performance_patterns": MEMORY_DIR / 'performance-patterns.md',
+        "architecture_patterns": MEMORY_DIR / 'architecture-patterns.md',
+    }
+    mcp_config = Path.home() / '.claude' / '.mcp.json'
+    skills_dir = Path.home() / '.claude' / 'skills'
+
+    probes = {"deep_think_command": (SENA_ROOT / 'commands' / 'deep-think.md').exists}
+    probes.update({name: path.exists for name, path in {**agent_files, **memory_files}.items()})
+    probes["mcp_config"] = lambda: _read_json(mcp_config)
+    probes["skills"] = lambda: sum(1 for _ in skills_dir.glob('*.md'))
+    values, timings = run_probes(probes, timeout)
+
     # Phase 1: Intelligence Enhancement
-    phase1_complete = all([
-        (SENA_ROOT / 'commands' / 'deep-think.md').exists(),
-        (SENA_ROOT / 'agents' / 'security-expert.md').exists(),
-        (SENA_ROOT / 'agents' / 'performance-expert.md').exists(),
-        (SENA_ROOT / 'agents' / 'architect.md').exists(),
-        (MEMORY_DIR / 'reasoning-frameworks.md').exists(),
-        (MEMORY_DIR / 'security-patterns.md').exists(),
-        (MEMORY_DIR / 'performance-patterns.md').exists(),
-        (MEMORY_DIR / 'architecture-patterns.md').exists()
-    ])
+    sub_agents = all(values[name] for name in agent_files)
+    memory_system = all(values[name] for name in memory_files)
+    phase1_complete = bool(values["deep_think_command"]) and sub_agents and memory_system
 
     status["phases"]["phase1_intelligence_enhancement"] = {
         "status": "complete" if phase1_complete else "in_progress",
         "completion_percentage": 100 if phase1_complete else 50,
         "components": {
-            "deep_think_command": (SENA_ROOT / 'commands' / 'deep-think.md').exists(),
-            "sub_agents": all([
-                (SENA_ROOT / 'agents' / 'security-expert.md').exists(),
-                (SENA_ROOT / 'agents' / 'performance-expert.md').exists(),
-                (SENA_ROOT / 'agents' / 'architect.md').exists()
-            ]),
-            "memory_system": all([
-                (MEMORY_DIR / 'reasoning-frameworks.md').exists(),
-                (MEMORY_DIR / 'security-patterns.md').exists(),
-                (MEMORY_DIR / 'performance-patterns.md').exists(),
-                (MEMORY_DIR / 'architecture-patterns.md').exists()
-            ])
+            "deep_think_command": bool(values["deep_think_command"]),
+            "sub_agents": sub_agents,
+            "memory_system": memory_system
         }
     }
 
-    # Phase 2: Access Expansion
-    mcp_config = Path.home() / '.claude' / '.mcp.json'
-    phase2_started = mcp_config.exists()
-
-    # Check for MCP servers
-    mcp_servers_configured = 0
-    if phase2_started:
-        try:
-            mcp_data = json.loads(mcp_config.read_text())
-            mcp_servers_configured = len(mcp_data.get("mcpServers", {}))
-        except:
-            pass
+    # Phase 2: Access Expansion (a config that fails to parse counts as started)
+    mcp_data = values["mcp_config"]
+    phase2_started = mcp_data is not None or timings["mcp_config"]["status"] == "error"
+    # Valid JSON of the wrong shape (an array, "mcpServers": 5) counts no servers
+    mcp_servers = mcp_data.get("mcpServers") if isinstance(mcp_data, dict) else None
+    mcp_servers_configured = len(mcp_servers) if isinstance(mcp_servers, dict) else 0
 
     # Expected: 5 servers (sena-controller + sena-metrics + 3 Phase 2 servers)
     phase2_complete = mcp_servers_configured >= 5
@@ -404,12 +782,10 @@ def get_phase_status() -> Dict:
     }
 
     # Phase 3: Autonomous Capabilities
-    skills_dir = Path.home() / '.claude' / 'skills'
-    phase3_started = skills_dir.exists() and len(list(skills_dir.glob('*.md'))) > 0
-
     status["phases"]["phase3_autonomous_capabilities"] = {
         "status": "not_started",
-        "completion_percentage": 0
+        "completion_percentage": 0,
+        "skills_found": values["skills"] or 0
     }
 
     # Overall roadmap
@@ -425,6 +801,7 @@ def get_phase_status() -> Dict:
         "status": "in_progress"
     }
 
+    status["probes"] = timings
     return status
 
 
@@ -440,18 +817,25 @@ if __name__ == "__main__":
             print(json.dumps(get_innovation_metrics(), indent=2))
         elif command == "tests":
             print(json.dumps(get_test_results(), indent=2))
+        elif command == "runtime":
+            print(json.dumps(get_runtime_metrics(), indent=2))
+        elif command == "history":
+            match = sys.argv[2] if len(sys.argv) > 2 else ''
+            print(json.dumps(get_metrics_history(match), indent=2))
         elif command == "config":
             print(json.dumps(check_sena_config(), indent=2))
         elif command == "phase":
             print(json.dumps(get_phase_status(), indent=2))
         else:
             print(f"Unknown command: {command}")
-            print("Available: health, innovation, tests, config, phase")
+            print("Available: health, innovation, tests, runtime, history, config, phase")
     else:
         print("SENA Metrics v3.3.1")
         print("\nAvailable commands:")
         print("  python3 sena_metrics.py health      - System health")
         print("  python3 sena_metrics.py innovation  - Innovation metrics")
         print("  python3 sena_metrics.py tests       - Test results")
+        print("  python3 sena_metrics.py runtime     - Runtime metrics")
+        print("  python3 sena_metrics.py history [match] - Metrics history")
         print("  python3 sena_metrics.py config      - Configuration")
         print("  python3 sena_metrics.py phase       - Phase status")
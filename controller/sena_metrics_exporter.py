@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+SENA Metrics Exporter - v3.5.2
+OpenMetrics text exposition of the runtime metrics registry
+
+The exporter renders from the registry's aggregated state (counter values,
+histogram buckets) without touching request handling, and caches the text
+for min_interval seconds so frequent scrapes cost one dictionary read.
+
+Served two ways:
+- The daemon 'metrics' socket method returns the text
+- An optional HTTP listener on 127.0.0.1 (SENA_METRICS_PORT) serves /metrics
+
+Usage:
+    python3 sena_metrics_exporter.py [port]   # serve this process's registry
+"""
+
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from sena_runtime_metrics import REGISTRY, MetricsRegistry, bucket_bounds
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# Histogram bucket boundaries (seconds) exposed as le labels
+DEFAULT_BOUNDS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                  0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value or HELP text"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value: float) -> str:
+    """OpenMetrics number formatting"""
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _labels(pairs: List[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _cumulative(buckets: Dict[int, int], bounds: Tuple[float, ...]) -> List[int]:
+    """Cumulative counts per bound from sparse microsecond buckets"""
+    counts = [0] * len(bounds)
+    limits = [b * 1_000_000 for b in bounds]
+    for index, count in buckets.items():
+        high = bucket_bounds(index)[1]
+        for position, limit in enumerate(limits):
+            if high <= limit:
+                counts[position] += count
+                break
+    running = 0
+    for position, count in enumerate(counts):
+        running += count
+        counts[position] = running
+    return counts
+
+
+def render_openmetrics(registry: MetricsRegistry = REGISTRY,
+                       bounds: Tuple[float, ...] = DEFAULT_BOUNDS) -> str:
+    """Render every metric in the registry as OpenMetrics text"""
+    lines = []
+    for name, family in registry.families():
+        kind = family['type']
+        base = name[:-len('_total')] if kind == 'counter' and name.endswith('_total') else name
+
+        lines.append(f'# TYPE {base} {kind}')
+        if family['help']:
+            lines.append(f'# HELP {base} {_escape(family["help"])}')
+
+        for key, metric in sorted(family['series'].items()):
+            pairs = list(key)
+            if kind == 'counter':
+                lines.append(f'{base}_total{_labels(pairs)} {_number(metric.value)}')
+            elif kind == 'gauge':
+                lines.append(f'{base}{_labels(pairs)} {_number(metric.get())}')
+            else:
+                state = metric.merged()
+                count, total = state.count, state.total
+                for bound, cumulative in zip(bounds, _cumulative(state.buckets, bounds)):
+                    lines.append(f'{base}_bucket{_labels(pairs + [("le", _number(bound))])} {cumulative}')
+                lines.append(f'{base}_bucket{_labels(pairs + [("le", "+Inf")])} {count}')
+                lines.append(f'{base}_count{_labels(pairs)} {count}')
+                lines.append(f'{base}_sum{_labels(pairs)} {_number(total)}')
+
+    lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+
+class OpenMetricsExporter:
+    """Renders the registry at most once per min_interval seconds"""
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY, min_interval: float = 1.0):
+        self.registry = registry
+        self.min_interval = min_interval
+        self.renders = 0
+
+        self._lock = threading.Lock()
+        self._text = ''
+        self._rendered_at = float('-inf')
+
+    def render(self) -> str:
+        """Cached OpenMetrics text"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._rendered_at >= self.min_interval:
+                self._text = render_openmetrics(self.registry)
+                self._rendered_at = now
+                self.renders += 1
+            return self._text
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """GET /metrics handler"""
+
+    exporter: OpenMetricsExporter = None
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.exporter.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes are frequent; keep them out of the daemon log
+        pass
+
+
+def start_http_exporter(port: int, host: str = '127.0.0.1',
+                        exporter: Optional[OpenMetricsExporter] = None) -> ThreadingHTTPServer:
+    """
+    Serve /metrics from a background thread
+
+    Returns the server; call shutdown() to stop it. Port 0 picks a free
+    port (see server.server_address).
+    """
+    handler = type('MetricsHandler', (_MetricsHandler,),
+                   {'exporter': exporter or OpenMetricsExporter()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name='sena-metrics-http', daemon=True)
+    thread.start()
+    return server
+
+
+if __name__ == "__main__":
+    import sys
+
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 9464
+    server = start_http_exporter(port)
+    print(f"Serving OpenMetrics on http://127.0.0.1:{server.server_address[1]}/metrics")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
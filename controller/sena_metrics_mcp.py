@@ -5,28 +5,56 @@ MCP wrapper that delegates to standalone sena_metrics module
 Code duplication eliminated: 441 lines → 50 lines (-88%)
 """
 
+import time
+from typing import Any, Dict, Optional
+
 from mcp.server.fastmcp import FastMCP
 from sena_metrics import (
     get_sena_health,
     get_innovation_metrics,
     get_test_results,
+    get_runtime_metrics,
+    get_metrics_history,
     check_sena_config,
     get_phase_status
 )
+from sena_runtime_metrics import REGISTRY
+
+
+class InstrumentedFastMCP(FastMCP):
+    """FastMCP server recording call count and latency of every tool"""
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        label = name if self._tool_manager.get_tool(name) is not None else 'unknown'
+        outcome = 'error'
+        start = time.perf_counter()
+        try:
+            result = await super().call_tool(name, arguments)
+            outcome = 'ok'
+            return result
+        finally:
+            REGISTRY.histogram(
+                'sena_mcp_tool_seconds', 'MCP tool call latency', tool=label
+            ).observe(time.perf_counter() - start)
+            REGISTRY.counter(
+                'sena_mcp_tool_calls_total', 'MCP tool calls', tool=label, outcome=outcome
+            ).inc()
+
 
 # Initialize FastMCP server
-mcp = FastMCP("SENA Metrics")
+mcp = InstrumentedFastMCP("SENA Metrics")
 
 
 @mcp.tool()
-def sena_health() -> dict:
+def sena_health(max_staleness: Optional[float] = None) -> dict:
     """
     Get comprehensive SENA Controller health status
 
     Returns complete health metrics including component status,
     version information, test coverage, and background processes.
+    Served from a cached snapshot; pass max_staleness=0 to force a refresh.
     """
-    return get_sena_health()
+    return get_sena_health(max_staleness)
 
 
 @mcp.tool()
@@ -45,12 +73,36 @@ def sena_test_results() -> dict:
     """
     Get comprehensive test results for all SENA components
 
-    Returns test status, coverage, and pass/fail metrics for
-    all controller modules, hooks, and integration tests.
+    Returns pass/fail counts per test module from the latest pytest
+    junit report (SENA_TEST_REPORT or ~/.claude/logs/sena_test_results.xml).
     """
     return get_test_results()
 
 
+@mcp.tool()
+def sena_runtime_metrics() -> dict:
+    """
+    Get live runtime metrics for SENA
+
+    Returns call counts and p50/p95/p99 latencies for every MCP tool in
+    this server and every daemon method (when the daemon is running).
+    """
+    return get_runtime_metrics()
+
+
+@mcp.tool()
+def sena_metrics_history(match: str = "", minutes: float = 60, points: int = 60,
+                         agg: str = "avg") -> dict:
+    """
+    Get downsampled history of SENA daemon metrics
+
+    Returns series whose name contains `match` (e.g. "request_seconds_p99")
+    over the last `minutes`, with at most `points` values per series.
+    agg picks avg, min, max or last within each step.
+    """
+    return get_metrics_history(match, minutes, points, agg)
+
+
 @mcp.tool()
 def sena_config_check() -> dict:
     """
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+SENA Profiler - v3.5.2
+Statistical sampling profiler for a live SENA process
+
+A background thread samples the stacks of the target threads with
+sys._current_frames() every interval seconds and writes the counts in
+collapsed-stack format ("root;...;leaf count" per line), which
+flamegraph.pl, speedscope and inferno read directly. The profiled
+threads are never paused beyond the GIL hand-off of each sample.
+
+Usage:
+    profiler = SamplingProfiler(interval=0.005)
+    profiler.start(seconds=10, output=Path('daemon.folded'))
+    ...
+    profiler.status()  # running, samples, output
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+PROFILE_DIR = Path.home() / '.claude' / 'logs'
+
+# Leaf frames of a thread waiting for work (left out unless include_idle)
+IDLE_FRAMES = {
+    ('socket.py', 'accept'),
+    ('selectors.py', 'select'),
+    ('threading.py', 'wait'),
+    ('queue.py', 'get'),
+}
+
+MAX_SECONDS = 300.0
+# Shorter intervals (or 0) would spin the sampler and starve the profiled process of the GIL
+MIN_INTERVAL = 0.001
+
+
+class SamplingProfiler:
+    """Samples thread stacks on a timer and writes collapsed stacks (interval clamped to MIN_INTERVAL)"""
+
+    def __init__(self, interval: float = 0.005, include_idle: bool = False):
+        self.interval = interval if interval >= MIN_INTERVAL else MIN_INTERVAL
+        self.include_idle = include_idle
+
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.idle_samples = 0
+        self.output: Optional[Path] = None
+        self.started_at: Optional[float] = None
+        self.seconds = 0.0
+
+        self._labels: Dict[object, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_ids: Optional[set] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds: float, output: Path, thread_ids: Optional[Iterable[int]] = None):
+        """Sample for up to seconds (threads in thread_ids, default all but the sampler)"""
+        if self.running:
+            raise RuntimeError("Profiler already running")
+
+        self.stacks = Counter()
+        self.samples = self.idle_samples = 0
+        self.output = Path(output)
+        self.seconds = min(max(seconds, self.interval), MAX_SECONDS)
+        self.started_at = time.time()
+        self._thread_ids = set(thread_ids) if thread_ids is not None else None
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='sena-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True):
+        """Stop sampling early; the collapsed stacks are written either way"""
+        self._stop.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def status(self) -> Dict:
+        return {
+            'running': self.running,
+            'samples': self.samples,
+            'idle_samples': self.idle_samples,
+            'unique_stacks': len(self.stacks),
+            'interval_ms': self.interval * 1000,
+            'seconds': self.seconds,
+            'started_at': self.started_at,
+            'output': str(self.output) if self.output else None,
+        }
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def _sample(self, own_id: int):
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id or (self._thread_ids is not None and thread_id not in self._thread_ids):
+                continue
+
+            code = frame.f_code
+            if not self.include_idle and (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                self.idle_samples += 1
+                continue
+
+            labels = []
+            while frame is not None:
+                labels.append(self._label(frame.f_code))
+                frame = frame.f_back
+            labels.reverse()
+            self.stacks[';'.join(labels)] += 1
+            self.samples += 1
+
+    def _run(self):
+        own_id = threading.get_ident()
+        deadline = time.monotonic() + self.seconds
+        next_sample = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                if now >= deadline:
+                    break
+                if now >= next_sample:
+                    self._sample(own_id)
+                    next_sample += self.interval
+                    if next_sample < now:
+                        # Fell behind (GIL contention): skip missed ticks
+                        next_sample = now + self.interval
+                self._stop.wait(max(0.0, next_sample - time.monotonic()))
+        finally:
+            self.write()
+
+    def write(self):
+        """Write collapsed stacks to the output file"""
+        if self.output is None:
+            return
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        lines = ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+        tmp = self.output.with_suffix(self.output.suffix + '.tmp')
+        tmp.write_text(lines)
+        os.replace(tmp, self.output)
+
+
+def default_output() -> Path:
+    """~/.claude/logs/sena_profile_<timestamp>.folded"""
+    return PROFILE_DIR / f"sena_profile_{time.strftime('%Y%m%d_%H%M%S')}.folded"
+
+
+if __name__ == "__main__":
+    # Profile a small CPU-bound workload in this process
+    def busy(n):
+        return sum(i * i for i in range(n))
+
+    output = Path(sys.argv[1]) if len(sys.argv) > 1 else default_output()
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start(seconds=1.0, output=output, thread_ids=[threading.get_ident()])
+    while profiler.running:
+        busy(20000)
+    print(profiler.status())
+    print(output.read_text().splitlines()[0])
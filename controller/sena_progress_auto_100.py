@@ -6,9 +6,218 @@ Shows progress bars automatically for all multi-step operations
 
 import sys
 import time
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
 from pathlib import Path
 
+
+@lru_cache(maxsize=4096)
+def _render_bar(filled: int, percentage: int, width: int) -> str:
+    """Render a bar for one visible state (cached, states repeat constantly)"""
+    if filled > 0 and filled < width:
+        bar = "█" * (filled - 1) + "🦁" + "░" * (width - filled)
+    elif filled <= 0:
+        bar = "🦁" + "░" * (width - 1)
+    else:
+        bar = "█" * (width - 1) + "🦁"
+
+    status = " ✅" if percentage >= 100 else ""
+
+    return f"[{bar}] {percentage:3d}%{status}"
+
+
+class ProgressTask:
+    """
+    A single tracked task
+
+    advance() only adds to a counter and compares it against the next
+    count at which the bar or percentage would visibly change, so calling
+    it for every item of a large loop is cheap. The engine is consulted
+    only when that threshold is crossed.
+    """
+
+    __slots__ = ('engine', 'name', 'total', 'completed', 'next_check',
+                 'stride', 'visible_state')
+
+    def __init__(self, engine: 'ProgressEngine', name: str, total: Optional[int]):
+        self.engine = engine
+        self.name = name
+        self.total = total
+        self.completed = 0
+        self.next_check = 0
+        self.stride = 1  # Check interval for tasks without a known total
+        self.visible_state = None
+
+    def advance(self, amount: int = 1):
+        """Record progress on the task"""
+        self.completed += amount
+        if self.completed >= self.next_check:
+            self.engine._on_threshold(self)
+
+    def update(self, completed: int):
+        """Set absolute progress on the task"""
+        previous, self.completed = self.completed, completed
+        if completed >= self.next_check or completed < previous:
+            self.engine._on_threshold(self)
+
+    @property
+    def finished(self) -> bool:
+        return self.total is not None and self.completed >= self.total
+
+    def state(self, width: int):
+        """Visible state: (filled cells, percentage) or item count if no total"""
+        if self.total is None:
+            return self.completed
+        if self.total <= 0:
+            return (width, 100)
+        completed = min(self.completed, self.total)
+        return (completed * width // self.total, completed * 100 // self.total)
+
+    def schedule_next_check(self, width: int):
+        """Compute the next completed count that changes the visible state"""
+        if self.total is None:
+            self.next_check = self.completed + self.stride
+            return
+        if self.total <= 0 or self.completed >= self.total:
+            self.next_check = float('inf')
+            return
+
+        filled, percentage = self.state(width)
+        next_percentage = -(-(percentage + 1) * self.total // 100)
+        next_filled = -(-(filled + 1) * self.total // width)
+        self.next_check = min(next_percentage, next_filled)
+
+
+class ProgressEngine:
+    """
+    Event-driven progress renderer
+
+    Redraws happen only from task updates (no sleeping or polling), only
+    when some task's visible state changed, and at most max_refresh times
+    per second. Completion is always drawn. On a terminal the frame is
+    redrawn in place; otherwise each rendered frame is appended.
+
+    Usage:
+        with ProgressEngine() as engine:
+            task = engine.add_task("Scanning", total=len(items))
+            for item in items:
+                task.advance()
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, max_refresh: float = 10.0,
+                 width: int = 40):
+        self.stream = stream or sys.stdout
+        self.min_interval = 1.0 / max_refresh if max_refresh > 0 else 0.0
+        self.width = width
+        self.tasks: List[ProgressTask] = []
+        self.renders = 0
+
+        self._interactive = hasattr(self.stream, 'isatty') and self.stream.isatty()
+        self._last_render = float('-inf')
+        self._dirty = False
+        self._lines_drawn = 0
+        self._line_cache: Dict[int, tuple] = {}
+
+    def add_task(self, name: str, total: Optional[int] = None) -> ProgressTask:
+        """Create a task; total=None tracks a count without a bar"""
+        task = ProgressTask(self, name, total)
+        self.tasks.append(task)
+        task.schedule_next_check(self.width)
+        self._dirty = True
+        self.render()
+        return task
+
+    def track(self, iterable: Iterable, name: str, total: Optional[int] = None) -> Iterator:
+        """Yield items from iterable while advancing a task"""
+        if total is None and hasattr(iterable, '__len__'):
+            total = len(iterable)
+        task = self.add_task(name, total)
+
+        # Keep the hot loop on locals; sync the task only at thresholds
+        completed, next_check = 0, task.next_check
+        for item in iterable:
+            yield item
+            completed += 1
+            if completed >= next_check:
+                task.completed = completed
+                self._on_threshold(task)
+                next_check = task.next_check
+
+        task.completed = completed
+
+    def _on_threshold(self, task: ProgressTask):
+        """Called by a task when its visible state may have changed"""
+        now = time.monotonic()
+        elapsed = now - self._last_render
+
+        if task.total is None:
+            # Adapt the check interval so counters are checked ~once per refresh
+            if elapsed < self.min_interval:
+                task.stride *= 2
+            elif task.stride > 1 and elapsed > 4 * self.min_interval:
+                task.stride //= 2
+
+        if task.state(self.width) != task.visible_state:
+            self._dirty = True
+            if task.finished or elapsed >= self.min_interval:
+                self.render(now)
+
+        task.schedule_next_check(self.width)
+
+    def frame(self) -> str:
+        """Current frame text, reusing cached lines for unchanged tasks"""
+        lines = []
+        for task in self.tasks:
+            state = task.state(self.width)
+            cached = self._line_cache.get(id(task))
+            if cached is None or cached[0] != state:
+                if task.total is None:
+                    body = f"{state:,} items"
+                else:
+                    body = _render_bar(state[0], state[1], self.width)
+                cached = (state, f"SENA 🦁 {task.name:<20} {body}")
+                self._line_cache[id(task)] = cached
+            task.visible_state = state
+            lines.append(cached[1])
+        return '\n'.join(lines)
+
+    def render(self, now: Optional[float] = None):
+        """Draw the current frame if anything visible changed"""
+        if not self._dirty:
+            return
+        text = self.frame()
+
+        if self._interactive:
+            if self._lines_drawn > 1:
+                self.stream.write(f"\x1b[{self._lines_drawn - 1}F")
+            self.stream.write('\r' + text.replace('\n', '\x1b[K\n') + '\x1b[K')
+            self._lines_drawn = len(self.tasks)
+        else:
+            self.stream.write(text + '\n')
+
+        self.stream.flush()
+        self.renders += 1
+        self._dirty = False
+        self._last_render = time.monotonic() if now is None else now
+
+    def close(self):
+        """Draw any pending state and finish the frame"""
+        for task in self.tasks:
+            if task.state(self.width) != task.visible_state:
+                self._dirty = True
+        self.render()
+        if self._interactive and self._lines_drawn:
+            self.stream.write('\n')
+            self.stream.flush()
+            self._lines_drawn = 0
+
+    def __enter__(self) -> 'ProgressEngine':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
 class SENAProgressAuto100:
     """Fully automatic progress display system - v3.3.1"""
 
@@ -40,19 +249,22 @@ class SENAProgressAuto100:
 
     def generate_progress_bar(self, progress: float, width: int = 40) -> str:
         """Generate a single progress bar"""
-        filled = int(progress * width)
+        return _render_bar(int(progress * width), int(progress * 100), width)
 
-        if filled > 0 and filled < width:
-            bar = "█" * (filled - 1) + "🦁" + "░" * (width - filled)
-        elif filled == 0:
-            bar = "🦁" + "░" * (width - 1)
-        else:
-            bar = "█" * (width - 1) + "🦁"
+    def create_engine(self, stream: Optional[TextIO] = None,
+                      max_refresh: float = 10.0) -> ProgressEngine:
+        """Create an event-driven progress engine for live task tracking"""
+        return ProgressEngine(stream=stream, max_refresh=max_refresh)
 
-        status = " ✅" if progress >= 1.0 else ""
-        percentage = int(progress * 100)
+    def track(self, iterable: Iterable, operation: str, total: Optional[int] = None,
+              stream: Optional[TextIO] = None) -> Iterator:
+        """Yield items from iterable while showing live progress for operation"""
+        if not self.auto_enabled:
+            yield from iterable
+            return
 
-        return f"[{bar}] {percentage:3d}%{status}"
+        with self.create_engine(stream) as engine:
+            yield from engine.track(iterable, operation, total)
 
     def show_progress_before(self, operation: str, current: int = 1, total: int = 1) -> str:
         """Show progress before operation starts
@@ -218,6 +430,10 @@ def enable_auto_progress():
     """Enable automatic progress display"""
     return progress_auto_100.enable_auto_progress()
 
+def track_progress(iterable: Iterable, operation: str, total: Optional[int] = None) -> Iterator:
+    """Iterate with live, rate-limited progress display"""
+    return progress_auto_100.track(iterable, operation, total)
+
 def should_show_progress(command: str) -> bool:
     """Check if progress should be shown for a command"""
     return progress_auto_100.is_multi_step_operation(command)
@@ -234,13 +450,11 @@ if __name__ == "__main__":
     # Test 1: Simple operation (backward compatible)
     print("Test 1: Simple operation (operation only)")
     print(show_progress_before("file search"))
-    time.sleep(0.5)
     print(show_progress_after("file search"))
 
     # Test 2: Multi-step operation
     print("\nTest 2: Multi-step operation (with current/total)")
     print(show_progress_before("analyzing files", 1, 5))
-    time.sleep(0.5)
     print(show_progress_after("analyzing files", 5, 5, True))
 
     # Test 3: Custom steps
@@ -252,4 +466,12 @@ if __name__ == "__main__":
     print("\nTest 4: Failed operation")
     print(show_progress_after("deployment", 3, 5, False))
 
+    # Test 5: Live progress driven by real work (no sleeps)
+    print("\nTest 5: Live progress over 1,000,000 items")
+    start = time.perf_counter()
+    checksum = 0
+    for item in track_progress(range(1_000_000), "Processing"):
+        checksum += item
+    print(f"Completed in {time.perf_counter() - start:.2f}s (checksum {checksum})")
+
     print("\n✅ Auto Progress System 100% - v3.3.1 VERIFIED")
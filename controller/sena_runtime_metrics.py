@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+SENA Runtime Metrics - v3.5.2
+In-process metrics registry: counters, gauges and latency histograms
+
+Histograms use HDR-style log-linear buckets over integer microseconds:
+values below 2 * SUB_BUCKETS are exact, larger values keep a relative
+error below 1 / SUB_BUCKETS. Counters and histograms record into
+per-thread shards without locking; shards are summed and percentiles
+computed on read.
+
+Usage:
+    from sena_runtime_metrics import REGISTRY
+
+    REGISTRY.counter('sena_daemon_requests_total', method='stats').inc()
+    with REGISTRY.time('sena_daemon_request_seconds', method='stats'):
+        handle()
+    REGISTRY.snapshot()
+"""
+
+import abc
+import threading
+import time
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Sub-buckets per power of two (relative error < 1 / SUB_BUCKETS)
+SUB_BUCKET_BITS = 7
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+# Percentiles reported by histogram snapshots
+DEFAULT_PERCENTILES = (50.0, 95.0, 99.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+_LINEAR_LIMIT = 2 * SUB_BUCKETS
+_SHIFT_OFFSET = SUB_BUCKET_BITS + 1
+
+
+def bucket_index(value: int) -> int:
+    """Log-linear bucket index of a non-negative integer"""
+    if value < _LINEAR_LIMIT:
+        return value
+    shift = value.bit_length() - _SHIFT_OFFSET
+    return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+
+def bucket_bounds(index: int) -> Tuple[int, int]:
+    """(lowest, highest) integer value that falls into bucket index"""
+    if index < 2 * SUB_BUCKETS:
+        return index, index
+    shift = index // SUB_BUCKETS - 1
+    mantissa = index % SUB_BUCKETS + SUB_BUCKETS
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class _Sharded(abc.ABC):
+    """
+    Base for metrics recorded into per-thread shards
+
+    Each thread writes only to its own shard, so recording takes no lock
+    and never contends. Reads sum the shards; shards of finished threads
+    are folded into a retired shard so the list does not grow without
+    bound. Reads rely on the GIL for atomic shard copies.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards: List = []
+        self._retired = self._new_shard()
+
+    @abc.abstractmethod
+    def _new_shard(self):
+        """Empty shard for one thread"""
+
+    @abc.abstractmethod
+    def _merge(self, into, shard):
+        """Add shard's values into another shard"""
+
+    def _shard(self):
+        """This thread's shard, created on first use"""
+        shard = self._new_shard()
+        shard.thread = threading.current_thread()
+        with self._lock:
+            self._shards.append(shard)
+        self._local.shard = shard
+        return shard
+
+    def _collect(self) -> List:
+        """Retired shard plus live shards, folding shards of finished threads"""
+        with self._lock:
+            live = []
+            for shard in self._shards:
+                if shard.thread.is_alive():
+                    live.append(shard)
+                else:
+                    self._merge(self._retired, shard)
+            self._shards = live
+            return [self._retired] + live
+
+
+class _CounterShard:
+    __slots__ = ('value', 'thread')
+
+    def __init__(self):
+        self.value = 0.0
+
+
+class Counter(_Sharded):
+    """Monotonically increasing value"""
+
+    kind = 'counter'
+
+    def _new_shard(self):
+        return _CounterShard()
+
+    def _merge(self, into, shard):
+        into.value += shard.value
+
+    def inc(self, amount: float = 1.0):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        shard.value += amount
+
+    @property
+    def value(self) -> float:
+        return sum(shard.value for shard in self._collect())
+
+    def summary(self) -> Dict:
+        return {'value': self.value}
+
+
+class Gauge:
+    """Value that can go up and down, or is read from a callback"""
+
+    kind = 'gauge'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    def set_function(self, function: Callable[[], float]):
+        """Read the value from function at snapshot time"""
+        self._function = function
+
+    def get(self) -> float:
+        return float(self._function()) if self._function is not None else self.value
+
+    def summary(self) -> Dict:
+        return {'value': self.get()}
+
+
+class _HistogramShard:
+    """Buckets, sum and max; count and min are derived on read"""
+
+    __slots__ = ('buckets', 'total', 'max', 'thread')
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.total = 0.0
+        self.max = 0.0
+
+    @property
+    def count(self) -> int:
+        return sum(self.buckets.values())
+
+    @property
+    def min(self) -> float:
+        """Lowest recorded value, to bucket precision"""
+        return bucket_bounds(min(self.buckets))[0] / 1_000_000 if self.buckets else 0.0
+
+
+class Histogram(_Sharded):
+    """
+    Latency histogram in seconds, stored as log-linear microsecond buckets
+
+    Memory is bounded by the value range, not the sample count: a range of
+    one microsecond to one hour needs at most ~4,300 buckets per thread.
+    """
+
+    kind = 'histogram'
+
+    def _new_shard(self):
+        return _HistogramShard()
+
+    def _merge(self, into, shard):
+        buckets = into.buckets
+        for index, count in dict(shard.buckets).items():
+            buckets[index] = buckets.get(index, 0) + count
+        into.total += shard.total
+        into.max = max(into.max, shard.max)
+
+    def observe(self, seconds: float):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+
+        # bucket_index(), inlined for the hot path
+        value = int(seconds * 1_000_000)
+        if value < _LINEAR_LIMIT:
+            index = value if value > 0 else 0
+        else:
+            shift = value.bit_length() - _SHIFT_OFFSET
+            index = (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+        buckets = shard.buckets
+        buckets[index] = buckets.get(index, 0) + 1
+        shard.total += seconds
+        if seconds > shard.max:
+            shard.max = seconds
+
+    def merged(self) -> _HistogramShard:
+        """All shards merged into one (a consistent-enough point-in-time view)"""
+        result = _HistogramShard()
+        for shard in self._collect():
+            self._merge(result, shard)
+        return result
+
+    @property
+    def count(self) -> int:
+        return sum(shard.count for shard in self._collect())
+
+    def percentiles(self, percentiles=DEFAULT_PERCENTILES,
+                    state: Optional[_HistogramShard] = None) -> Dict[float, float]:
+        """Value in seconds at each percentile (highest value of the bucket)"""
+        state = state or self.merged()
+        count, maximum = state.count, state.max
+        if not count:
+            return {p: 0.0 for p in percentiles}
+
+        result = {}
+        wanted = sorted(percentiles)
+        seen = 0
+        position = 0
+        for index, bucket_count in sorted(state.buckets.items()):
+            seen += bucket_count
+            while position < len(wanted) and seen >= wanted[position] / 100.0 * count:
+                highest = bucket_bounds(index)[1] / 1_000_000
+                result[wanted[position]] = min(highest, maximum)
+                position += 1
+        for p in wanted[position:]:
+            result[p] = maximum
+        return result
+
+    def summary(self) -> Dict:
+        state = self.merged()
+        values = self.percentiles(state=state)
+        return {
+            'count': state.count,
+            'sum': round(state.total, 6),
+            'min': round(state.min, 6),
+            'max': round(state.max, 6),
+            **{f'p{p:g}': round(v, 6) for p, v in values.items()},
+        }
+
+
+class _Timer:
+    """Context manager recording elapsed seconds into a histogram"""
+
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class MetricsRegistry:
+    """
+    Named metric families with label sets
+
+    Metrics are created on first use. Asking for the same name with a
+    different type raises ValueError.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._families: Dict[str, Dict] = {}
+
+    def _get(self, cls, name: str, help: str, labels: Dict[str, str]):
+        key: LabelKey = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        family = self._families.get(name)
+        if family is not None:
+            metric = family['series'].get(key)
+            if metric is not None and family['type'] == cls.kind:
+                return metric
+
+        with self._lock:
+            family = self._families.setdefault(
+                name, {'type': cls.kind, 'help': help, 'series': {}}
+            )
+            if family['type'] != cls.kind:
+                raise ValueError(f"Metric {name} is a {family['type']}, not a {cls.kind}")
+            if help and not family['help']:
+                family['help'] = help
+            return family['series'].setdefault(key, cls())
+
+    def counter(self, name: str, help: str = '', **labels) -> Counter:
+        return self._get(Counter, name, help, labels)
+
+    def gauge(self, name: str, help: str = '', **labels) -> Gauge:
+        return self._get(Gauge, name, help, labels)
+
+    def histogram(self, name: str, help: str = '', **labels) -> Histogram:
+        return self._get(Histogram, name, help, labels)
+
+    def time(self, name: str, help: str = '', **labels) -> _Timer:
+        """Context manager timing a block into histogram name"""
+        return _Timer(self.histogram(name, help, **labels))
+
+    def timed(self, name: str, help: str = '', **labels):
+        """Decorator timing every call of a function into histogram name"""
+        def decorator(func):
+            histogram = self.histogram(name, help, **labels)
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with _Timer(histogram):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def families(self) -> List[Tuple[str, Dict]]:
+        """(name, family) pairs sorted by name"""
+        with self._lock:
+            return sorted((name, dict(family, series=dict(family['series'])))
+                          for name, family in self._families.items())
+
+    def snapshot(self) -> Dict:
+        """JSON-serializable view of every metric"""
+        return {
+            name: {
+                'type': family['type'],
+                'help': family['help'],
+                'series': [
+                    {'labels': dict(key), **metric.summary()}
+                    for key, metric in sorted(family['series'].items())
+                ],
+            }
+            for name, family in self.families()
+        }
+
+    def clear(self):
+        """Drop every metric (tests and restarts)"""
+        with self._lock:
+            self._families.clear()
+
+
+# Global registry shared by every module in the process
+REGISTRY = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """Get the process-wide metrics registry"""
+    return REGISTRY
+
+
+if __name__ == "__main__":
+    import json
+    import random
+
+    registry = MetricsRegistry()
+    for _ in range(10000):
+        registry.histogram('demo_latency_seconds', method='demo').observe(random.expovariate(1000))
+        registry.counter('demo_requests_total', method='demo').inc()
+    registry.gauge('demo_queue_depth').set(3)
+    print(json.dumps(registry.snapshot(), indent=2))
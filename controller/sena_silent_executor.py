@@ -3,15 +3,329 @@
 SENA Controller v3.3 - Silent Command Executor
 MCP tool that executes commands WITHOUT showing "Bash(command)" in IDE
 This is the LOOPHOLE - custom tool means custom name display
+
+execute_async / execute_many run commands as asyncio subprocesses, at most
+max_concurrency at a time, each with its own timeout.
+
+Output is read in chunks as it arrives. stream / execute_stream yield the
+chunks and keep only the first head_bytes and last tail_bytes of each
+stream for their final result, so a huge `cat` or `grep -r` neither fills
+memory nor delays the first byte. execute / execute_async capture output
+in full unless the executor is created with bound_output=True. Results
+report the full byte counts, and 'truncated' when bytes were dropped.
+
+pwd, whoami, date and `wc -l` / `wc -c` are answered in-process by
+pure-Python builtins with the same output as coreutils, skipping the
+fork/exec that dominates their cost (see
+tests/benchmarks/bench_silent_executor.py). Arguments a builtin does not
+reproduce exactly fall back to the real command.
+
+With cache_ttl > 0 (or SENA_EXEC_CACHE_TTL), results of read-only commands
+(ls, cat, grep, git status, ...) are memoized. An entry is reused only while
+the stats of the paths the command names, the working directory and, for
+git, the index and HEAD are unchanged, and only for cache_ttl seconds. Any
+command that may write clears the cache.
+
+Finished commands are also appended to an on-disk history
+(sena_command_history.CommandHistoryStore) when one is attached; the
+global executor attaches one unless SENA_EXEC_HISTORY=0.
 """
 
+import asyncio
+import codecs
+import os
+import pwd
+import selectors
 import subprocess
 import json
 import sys
-import shlex
-from typing import Dict, Any, List
+import time
+from typing import Dict, Any, List, AsyncIterator, Iterator, Optional, Tuple
 from pathlib import Path
-from collections import deque
+from collections import OrderedDict, deque
+
+from sena_command_history import HISTORY_ENABLED, CommandHistoryStore, open_history_store
+from sena_command_policy import CommandPolicy
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_CONCURRENCY = 8
+
+# Output kept per stream: first HEAD_BYTES + last TAIL_BYTES
+HEAD_BYTES = 512 * 1024
+TAIL_BYTES = 512 * 1024
+CHUNK_SIZE = 64 * 1024
+
+# Result cache for read-only commands (0 disables it)
+CACHE_TTL = float(os.environ.get('SENA_EXEC_CACHE_TTL', '0'))
+CACHE_SIZE = 256
+
+
+class BoundedOutput:
+    """
+    Head/tail buffer for one output stream
+
+    Keeps the first head_bytes and the last tail_bytes written and counts
+    everything; the bytes in between are dropped. head_bytes=None keeps
+    everything.
+    """
+
+    def __init__(self, head_bytes: Optional[int] = HEAD_BYTES, tail_bytes: int = TAIL_BYTES):
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+        self._decoder = codecs.getincrementaldecoder('utf-8')('replace')
+
+    @property
+    def dropped(self) -> int:
+        return self.total - len(self.head) - len(self.tail)
+
+    @property
+    def truncated(self) -> bool:
+        return self.dropped > 0
+
+    def write(self, data: bytes) -> str:
+        """Add a chunk; returns it decoded (multi-byte characters split across chunks are held back)"""
+        self.total += len(data)
+        if self.head_bytes is None:
+            self.head += data
+            return self._decoder.decode(data)
+        rest = data
+        room = self.head_bytes - len(self.head)
+        if room > 0:
+            self.head += rest[:room]
+            rest = rest[room:]
+        if rest and self.tail_bytes:
+            self.tail += rest
+            if len(self.tail) > self.tail_bytes:
+                del self.tail[:len(self.tail) - self.tail_bytes]
+        return self._decoder.decode(data)
+
+    def finish(self) -> str:
+        """Flush the chunk decoder at end of stream"""
+        return self._decoder.decode(b'', True)
+
+    def getvalue(self) -> str:
+        """Retained output (head then tail; check truncated for a gap between them)"""
+        return (self.head + self.tail).decode('utf-8', 'replace')
+
+
+def _builtin_pwd(args: List[str]) -> Optional[Tuple[int, bytes, bytes]]:
+    # coreutils pwd defaults to -P (physical path), which is what getcwd returns
+    if args not in ([], ['-P']):
+        return None
+    return 0, os.fsencode(os.getcwd()) + b'\n', b''
+
+
+def _builtin_whoami(args: List[str]) -> Optional[Tuple[int, bytes, bytes]]:
+    if args:
+        return None
+    try:
+        name = pwd.getpwuid(os.geteuid()).pw_name
+    except KeyError:
+        return None
+    return 0, name.encode() + b'\n', b''
+
+
+def _builtin_date(args: List[str]) -> Optional[Tuple[int, bytes, bytes]]:
+    # Default C-locale format: "Mon Oct  5 06:54:06 UTC 2026"
+    if args == []:
+        text = time.strftime('%a %b %e %H:%M:%S %Z %Y')
+    elif args == ['-u']:
+        text = time.strftime('%a %b %e %H:%M:%S UTC %Y', time.gmtime())
+    else:
+        return None
+    return 0, text.encode() + b'\n', b''
+
+
+def _count_newlines(path: str) -> int:
+    lines = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b''):
+            lines += block.count(b'\n')
+    return lines
+
+
+def _builtin_wc(args: List[str]) -> Optional[Tuple[int, bytes, bytes]]:
+    """
+    wc -l / -c / -lc over regular files
+
+    Word counts fall back to the real wc (it skips words without printable
+    characters), as do stdin, missing files and other options.
+    """
+    flags = {c for arg in args if arg.startswith('-') for c in arg[1:]}
+    files = [arg for arg in args if not arg.startswith('-')]
+    if not files or not flags or not flags <= {'l', 'c'} or '--' in args:
+        return None
+
+    try:
+        sizes = [os.stat(path).st_size for path in files]
+        if not all(os.path.isfile(path) for path in files):
+            return None
+        rows = [
+            ([_count_newlines(path)] if 'l' in flags else []) + ([size] if 'c' in flags else [])
+            for path, size in zip(files, sizes)
+        ]
+    except OSError:
+        return None
+
+    names = list(files)
+    if len(files) > 1:
+        rows.append([sum(column) for column in zip(*rows)])
+        names.append('total')
+
+    # Same column width rule as coreutils: digits of the summed file sizes,
+    # except a single count of a single file is printed unpadded
+    width = 1 if len(files) == 1 and len(flags) == 1 else len(str(sum(sizes)))
+    lines = (' '.join(f'{count:>{width}}' for count in row) + f' {name}\n'
+             for row, name in zip(rows, names))
+    return 0, ''.join(lines).encode(), b''
+
+
+# Commands served in-process; each returns (exit code, stdout, stderr),
+# or None to run the real command instead
+BUILTIN_COMMANDS = {
+    'pwd': _builtin_pwd,
+    'whoami': _builtin_whoami,
+    'date': _builtin_date,
+    'wc': _builtin_wc,
+}
+
+
+# Commands that never modify files
+READ_ONLY_COMMANDS = {
+    'ls', 'cat', 'head', 'tail', 'grep', 'wc', 'sort', 'uniq', 'which',
+    'echo', 'pwd', 'whoami', 'date', 'find',
+}
+# Read-only, but not worth caching: time-varying, recursive, or cheaper than a lookup
+UNCACHED_COMMANDS = {'echo', 'pwd', 'whoami', 'date', 'find'}
+GIT_READ_ONLY = {'status', 'log', 'diff', 'show', 'rev-parse', 'ls-files', 'blame'}
+
+# Options that make an otherwise read-only command write, follow or recurse
+WRITE_OPTIONS = {
+    'sort': ('-o', '--output'),
+    'find': ('-delete', '-fprint', '-fls'),
+    'git': ('--output',),
+}
+UNCACHED_OPTIONS = {
+    'grep': ('-r', '-R', '--recursive', '--dereference-recursive'),
+    'ls': ('-R', '--recursive'),
+    'tail': ('-f', '-F', '--follow'),
+}
+
+
+def _has_option(options: List[str], names: Tuple[str, ...]) -> bool:
+    """True if any option matches names, including inside short clusters (-laR)"""
+    for arg in options:
+        if arg.startswith(names):
+            return True
+        if not arg.startswith('--') and any(f'-{c}' in names for c in arg[1:]):
+            return True
+    return False
+
+
+def classify_command(argv: List[str]) -> str:
+    """'cache' (read-only, memoizable), 'read' (read-only) or 'write'"""
+    name = argv[0]
+    if name == 'git':
+        subcommand = next((arg for arg in argv[1:] if not arg.startswith('-')), None)
+        if subcommand not in GIT_READ_ONLY:
+            return 'write'
+    elif name not in READ_ONLY_COMMANDS:
+        return 'write'
+
+    options = [arg for arg in argv[1:] if arg.startswith('-')]
+    if _has_option(options, WRITE_OPTIONS.get(name, ())):
+        return 'write'
+    if name in UNCACHED_COMMANDS or _has_option(options, UNCACHED_OPTIONS.get(name, ())):
+        return 'read'
+    return 'cache'
+
+
+def _stat_key(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _git_state_paths(cwd: str) -> List[str]:
+    """Index, HEAD and the branch ref of the repository containing cwd"""
+    directory = Path(cwd)
+    for candidate in (directory, *directory.parents):
+        git_path = candidate / '.git'
+        if git_path.is_file():
+            # Worktree or submodule: ".git" holds "gitdir: <path>"
+            text = git_path.read_text().strip()
+            git_dir = (candidate / text.split(':', 1)[1].strip()) if text.startswith('gitdir:') else git_path
+            break
+        if git_path.is_dir():
+            git_dir = git_path
+            break
+    else:
+        return []
+
+    paths = [str(git_dir / 'index'), str(git_dir / 'HEAD')]
+    try:
+        head = (git_dir / 'HEAD').read_text().strip()
+    except OSError:
+        return paths
+    if head.startswith('ref: '):
+        paths += [str(git_dir / head[5:]), str(git_dir / 'packed-refs')]
+    return paths
+
+
+class ResultCache:
+    """
+    LRU of command results keyed by (cwd, argv, silent)
+
+    Each entry stores the stats it was computed against; a lookup is a hit
+    only if those stats are unchanged and the entry is younger than ttl.
+    Note that git status reflects working tree edits only once the index
+    changes or the entry expires.
+    """
+
+    def __init__(self, ttl: float = 5.0, max_entries: int = CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def signature(argv: List[str], cwd: str) -> Tuple:
+        """Stats of everything the output of argv depends on"""
+        paths = ['.'] + [arg for arg in argv[1:] if not arg.startswith('-')]
+        if argv[0] == 'git':
+            paths += _git_state_paths(cwd)
+        return tuple((path, _stat_key(path)) for path in paths)
+
+    def get(self, key: Tuple, signature: Tuple) -> Optional[Dict[str, Any]]:
+        entry = self.entries.get(key)
+        if entry is not None:
+            stored_signature, expires, result = entry
+            if stored_signature == signature and time.monotonic() < expires:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return dict(result, cached=True)
+            del self.entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: Tuple, signature: Tuple, result: Dict[str, Any]):
+        self.entries[key] = (signature, time.monotonic() + self.ttl, result)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses,
+                'ttl': self.ttl, 'max_entries': self.max_entries}
 
 
 class SENASilentExecutor:
@@ -25,19 +339,38 @@ class SENASilentExecutor:
     SECURITY: Commands must be validated before execution to prevent injection
     """
 
-    def __init__(self):
+    def __init__(self, max_concurrency: int = DEFAULT_CONCURRENCY,
+                 head_bytes: int = HEAD_BYTES, tail_bytes: int = TAIL_BYTES,
+                 bound_output: bool = False,
+                 use_builtins: bool = True, cache_ttl: float = CACHE_TTL,
+                 cache_size: int = CACHE_SIZE,
+                 history_store: Optional[CommandHistoryStore] = None):
+        self.max_concurrency = max_concurrency
+        self.use_builtins = use_builtins
+        # Opt-in memoization of read-only commands
+        self.cache = ResultCache(cache_ttl, cache_size) if cache_ttl > 0 else None
+        # Streams always keep head/tail only; execute() too with bound_output
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.bound_output = bound_output
+        # asyncio.Semaphore binds to one event loop; keep one per loop
+        self._semaphores: Dict[int, Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
         # OPTIMIZATION: Use deque with maxlen for automatic O(1) trimming
         self.command_history = deque(maxlen=100)
+        # Persistent history, written by its own thread
+        self.history_store = history_store
         # Whitelist of safe command prefixes
         self.safe_commands = {
             'ls', 'pwd', 'echo', 'cat', 'head', 'tail', 'grep', 'find',
             'wc', 'sort', 'uniq', 'date', 'whoami', 'which', 'python3',
             'git', 'mkdir', 'rm', 'cp', 'mv', 'touch', 'chmod'
         }
+        # Argument rules compiled over the whitelist
+        self.policy = CommandPolicy(self.safe_commands)
 
     def _validate_command(self, command: str) -> bool:
         """
-        Validate command against whitelist and dangerous patterns
+        Validate command against whitelist and per-command argument rules
 
         Args:
             command: Command to validate
@@ -45,28 +378,143 @@ class SENASilentExecutor:
         Returns:
             True if command is safe, False otherwise
         """
-        # Extract first word (command name)
-        cmd_name = command.split()[0] if command.strip() else ''
+        return self.policy.evaluate(command).allowed
 
-        # Check against whitelist
-        if cmd_name not in self.safe_commands:
-            return False
+    def _prepare(self, command: str) -> Tuple[Optional[List[str]], Optional[Dict[str, Any]]]:
+        """
+        Validate and split a command
 
-        # Check for dangerous patterns
-        dangerous_patterns = [
-            ';', '&&', '||', '|', '>', '<', '`', '$(',  # Command chaining/substitution
-            'rm -rf /', 'dd if=', 'mkfs', 'format',  # Destructive operations
-            ':(){', 'fork', 'exec',  # Fork bombs and exec
-        ]
+        Returns:
+            (argv, None) if the command may run, (None, error result) otherwise
+        """
+        # SECURITY: Parsed once by the policy; run with shell=False
+        decision = self.policy.evaluate(command)
+        if not decision.allowed:
+            return None, {
+                'success': False,
+                'error': f'Command not allowed ({decision.rule}): {decision.reason}',
+                'exit_code': -1,
+                'security_blocked': True,
+                'rule': decision.rule
+            }
+        return list(decision.argv), None
+
+    def _result(self, command: str, returncode: int, stdout: Optional[BoundedOutput],
+                stderr: Optional[BoundedOutput], silent: bool,
+                started: Optional[float] = None) -> Dict[str, Any]:
+        """Record a finished command in history and build its result"""
+        # Record in history (deque auto-trims at maxlen)
+        self.command_history.append({
+            'command': command,
+            'returncode': returncode,
+            'success': returncode == 0
+        })
+        if self.history_store is not None:
+            duration_ms = (time.monotonic() - started) * 1000 if started is not None else None
+            try:
+                self.history_store.record(command, returncode, duration_ms)
+            except ValueError:
+                # Store closed (e.g. at interpreter exit): the in-memory history still has it
+                pass
+
+        # Return clean results
+        if silent:
+            # Minimal output mode - just success/failure
+            return {
+                'success': returncode == 0,
+                'exit_code': returncode,
+                'output_length': stdout.total if stdout else 0
+            }
+        else:
+            # Full output mode
+            return {
+                'success': returncode == 0,
+                'exit_code': returncode,
+                'stdout': stdout.getvalue() if stdout else None,
+                'stderr': stderr.getvalue() if stderr else None,
+                'stdout_bytes': stdout.total if stdout else 0,
+                'stderr_bytes': stderr.total if stderr else 0,
+                'truncated': bool(stdout and stdout.truncated or stderr and stderr.truncated),
+                'dropped_bytes': (stdout.dropped if stdout else 0) + (stderr.dropped if stderr else 0)
+            }
 
-        for pattern in dangerous_patterns:
-            if pattern in command:
-                return False
+    @staticmethod
+    def _timeout_result(timeout: float) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'error': f'Command timed out after {timeout:g} seconds',
+            'exit_code': -1
+        }
 
-        return True
+    def _output(self, bounded: bool, silent: bool) -> BoundedOutput:
+        """Capture buffer for one stream of a command"""
+        if silent:
+            # Silent results report only the byte count
+            return BoundedOutput(0, 0)
+        if bounded:
+            return BoundedOutput(self.head_bytes, self.tail_bytes)
+        return BoundedOutput(None)
+
+    def _builtin(self, cmd_parts: List[str], bounded: bool,
+                 silent: bool) -> Optional[Dict[str, BoundedOutput]]:
+        """Run cmd_parts in-process if a builtin handles it; None otherwise"""
+        handler = BUILTIN_COMMANDS.get(cmd_parts[0]) if self.use_builtins else None
+        started = time.monotonic()
+        result = handler(cmd_parts[1:]) if handler else None
+        if result is None:
+            return None
+
+        returncode, stdout, stderr = result
+        outputs = {
+            'stdout': self._output(bounded, silent),
+            'stderr': self._output(bounded, silent),
+        }
+        outputs['stdout'].write(stdout)
+        outputs['stderr'].write(stderr)
+        outputs['returncode'] = returncode
+        outputs['started'] = started
+        return outputs
+
+    def _builtin_events(self, command: str, outputs: Dict, silent: bool) -> List[Tuple[str, Any]]:
+        """stream() events for a builtin result"""
+        events = [(name, outputs[name].getvalue()) for name in ('stdout', 'stderr') if outputs[name].total]
+        events.append(('exit', self._result(command, outputs['returncode'],
+                                            outputs['stdout'], outputs['stderr'], silent,
+                                            outputs['started'])))
+        return events
+
+    def _cache_lookup(self, command: str, silent: bool) -> Tuple[Optional[Tuple], Optional[Dict[str, Any]]]:
+        """
+        Check the result cache before running command
+
+        Returns:
+            (entry, cached result); entry is passed to _cache_store after the
+            run and is None when the result must not be stored
+        """
+        if self.cache is None:
+            return None, None
+        cmd_parts, error = self._prepare(command)
+        if error:
+            return None, None
+
+        kind = classify_command(cmd_parts)
+        if kind == 'write':
+            self.cache.clear()
+        if kind != 'cache':
+            return None, None
+
+        cwd = os.getcwd()
+        key = (cwd, tuple(cmd_parts), silent)
+        # Taken before the run, so a change during the run invalidates the entry
+        signature = self.cache.signature(cmd_parts, cwd)
+        return (key, signature), self.cache.get(key, signature)
+
+    def _cache_store(self, entry: Optional[Tuple], result: Dict[str, Any]):
+        if entry is not None and 'error' not in result:
+            self.cache.put(entry[0], entry[1], result)
 
     def execute(self, command: str, capture_output: bool = True,
-                silent: bool = True) -> Dict[str, Any]:
+                silent: bool = True, timeout: float = DEFAULT_TIMEOUT) -> Dict[str, Any]:
         """
         Execute command silently
 
@@ -74,70 +522,36 @@ class SENASilentExecutor:
             command: Shell command to execute
             capture_output: Whether to capture stdout/stderr
             silent: If True, returns minimal output
+            timeout: Seconds before the command is killed
 
         Returns:
             Dict with execution results (clean format)
         """
-        # SECURITY FIX: Validate command before execution
-        if not self._validate_command(command):
-            return {
-                'success': False,
-                'error': f'Command not allowed or contains dangerous patterns: {command.split()[0] if command else "empty"}',
-                'exit_code': -1,
-                'security_blocked': True
-            }
-
+        if capture_output:
+            entry, cached = self._cache_lookup(command, silent)
+            if cached is not None:
+                return cached
+            for stream_name, data in self.stream(command, timeout=timeout, silent=silent,
+                                                 bounded=self.bound_output):
+                if stream_name == 'exit':
+                    self._cache_store(entry, data)
+                    return data
+
+        cmd_parts, error = self._prepare(command)
+        if error:
+            return error
+
+        started = time.monotonic()
         try:
-            # Execute command using subprocess
-            # SECURITY: Use shell=False with shlex.split for safe execution
-            try:
-                cmd_parts = shlex.split(command)
-            except ValueError as e:
-                return {
-                    'success': False,
-                    'error': f'Invalid command syntax: {str(e)}',
-                    'exit_code': -1,
-                    'security_blocked': True
-                }
-
             result = subprocess.run(
                 cmd_parts,  # List of arguments, not string
                 shell=False,  # SECURE: No shell interpretation
-                capture_output=capture_output,
-                text=True,
-                timeout=30
+                timeout=timeout
             )
-
-            # Record in history (deque auto-trims at maxlen)
-            self.command_history.append({
-                'command': command,
-                'returncode': result.returncode,
-                'success': result.returncode == 0
-            })
-
-            # Return clean results
-            if silent:
-                # Minimal output mode - just success/failure
-                return {
-                    'success': result.returncode == 0,
-                    'exit_code': result.returncode,
-                    'output_length': len(result.stdout) if result.stdout else 0
-                }
-            else:
-                # Full output mode
-                return {
-                    'success': result.returncode == 0,
-                    'exit_code': result.returncode,
-                    'stdout': result.stdout,
-                    'stderr': result.stderr
-                }
+            return self._result(command, result.returncode, None, None, silent, started)
 
         except subprocess.TimeoutExpired:
-            return {
-                'success': False,
-                'error': 'Command timed out after 30 seconds',
-                'exit_code': -1
-            }
+            return self._timeout_result(timeout)
         except Exception as e:
             return {
                 'success': False,
@@ -145,32 +559,260 @@ class SENASilentExecutor:
                 'exit_code': -1
             }
 
+    def stream(self, command: str, timeout: float = DEFAULT_TIMEOUT, silent: bool = False,
+               chunk_size: int = CHUNK_SIZE, bounded: bool = True) -> Iterator[Tuple[str, Any]]:
+        """
+        Execute command, yielding output as it arrives
+
+        Yields ('stdout', text) and ('stderr', text) chunks, then a final
+        ('exit', result) where result is the execute() dict built from the
+        captured output: only head_bytes + tail_bytes of each stream unless
+        bounded is False. Closing the generator early kills the command.
+        """
+        cmd_parts, error = self._prepare(command)
+        if error:
+            yield 'exit', error
+            return
+
+        builtin = self._builtin(cmd_parts, bounded, silent)
+        if builtin is not None:
+            yield from self._builtin_events(command, builtin, silent)
+            return
+
+        started = time.monotonic()
+        try:
+            process = subprocess.Popen(
+                cmd_parts,
+                shell=False,  # SECURE: No shell interpretation
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+        except Exception as e:
+            yield 'exit', {'success': False, 'error': str(e), 'exit_code': -1}
+            return
+
+        outputs = {
+            process.stdout.fileno(): ('stdout', self._output(bounded, silent)),
+            process.stderr.fileno(): ('stderr', self._output(bounded, silent)),
+        }
+        deadline = time.monotonic() + timeout
+        try:
+            with selectors.DefaultSelector() as selector:
+                for fd in outputs:
+                    selector.register(fd, selectors.EVENT_READ)
+                while selector.get_map():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise subprocess.TimeoutExpired(cmd_parts, timeout)
+                    for key, _ in selector.select(remaining):
+                        stream_name, output = outputs[key.fd]
+                        data = os.read(key.fd, chunk_size)
+                        text = output.write(data) if data else output.finish()
+                        if not data:
+                            selector.unregister(key.fd)
+                        if text:
+                            yield stream_name, text
+            process.wait(max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            yield 'exit', self._timeout_result(timeout)
+            return
+        finally:
+            if process.returncode is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            process.stderr.close()
+
+        (_, stdout), (_, stderr) = outputs.values()
+        yield 'exit', self._result(command, process.returncode, stdout, stderr, silent, started)
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Concurrency limit for the running event loop"""
+        loop = asyncio.get_running_loop()
+        entry = self._semaphores.get(id(loop))
+        if entry is None or entry[0] is not loop:
+            # Drop semaphores of closed loops (asyncio.run creates a new loop each call)
+            self._semaphores = {key: value for key, value in self._semaphores.items()
+                                if not value[0].is_closed()}
+            entry = (loop, asyncio.Semaphore(self.max_concurrency))
+            self._semaphores[id(loop)] = entry
+        return entry[1]
+
+    async def execute_async(self, command: str, silent: bool = True,
+                            timeout: float = DEFAULT_TIMEOUT) -> Dict[str, Any]:
+        """
+        Execute command as an asyncio subprocess
+
+        Waits for a free slot (max_concurrency), then runs the command with
+        its own timeout. Cancelling the awaiting task kills the process.
+
+        Args:
+            command: Shell command to execute
+            silent: If True, returns minimal output
+            timeout: Seconds before the command is killed (not counting queueing)
+
+        Returns:
+            Dict with execution results, same format as execute()
+        """
+        entry, cached = self._cache_lookup(command, silent)
+        if cached is not None:
+            return cached
+        async for stream_name, data in self.execute_stream(command, timeout=timeout, silent=silent,
+                                                           bounded=self.bound_output):
+            if stream_name == 'exit':
+                self._cache_store(entry, data)
+                return data
+
+    async def execute_stream(self, command: str, timeout: float = DEFAULT_TIMEOUT,
+                             silent: bool = False, chunk_size: int = CHUNK_SIZE,
+                             bounded: bool = True) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Async version of stream(): yields ('stdout' | 'stderr', text) chunks
+        as they arrive, then ('exit', result)
+
+        Holds a concurrency slot while the command runs. A consumer that
+        falls behind stalls the command (the chunk queue is bounded) rather
+        than buffering its output.
+        """
+        cmd_parts, error = self._prepare(command)
+        if error:
+            yield 'exit', error
+            return
+
+        builtin = self._builtin(cmd_parts, bounded, silent)
+        if builtin is not None:
+            for event in self._builtin_events(command, builtin, silent):
+                yield event
+            return
+
+        async with self._semaphore():
+            started = time.monotonic()
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd_parts,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+            except Exception as e:
+                yield 'exit', {'success': False, 'error': str(e), 'exit_code': -1}
+                return
+
+            outputs = {
+                'stdout': self._output(bounded, silent),
+                'stderr': self._output(bounded, silent),
+            }
+            chunks: asyncio.Queue = asyncio.Queue(maxsize=16)
+            readers = [
+                asyncio.ensure_future(self._pump(process.stdout, 'stdout', chunks, chunk_size)),
+                asyncio.ensure_future(self._pump(process.stderr, 'stderr', chunks, chunk_size)),
+            ]
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            try:
+                open_streams = len(readers)
+                while open_streams:
+                    stream_name, data = await asyncio.wait_for(chunks.get(), deadline - loop.time())
+                    output = outputs[stream_name]
+                    text = output.write(data) if data else output.finish()
+                    if not data:
+                        open_streams -= 1
+                    if text:
+                        yield stream_name, text
+                await asyncio.wait_for(process.wait(), max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                await self._kill(process)
+                yield 'exit', self._timeout_result(timeout)
+                return
+            finally:
+                for reader in readers:
+                    reader.cancel()
+                await self._kill(process)
+
+        yield 'exit', self._result(command, process.returncode,
+                                   outputs['stdout'], outputs['stderr'], silent, started)
+
+    @staticmethod
+    async def _pump(reader: asyncio.StreamReader, stream_name: str,
+                    chunks: asyncio.Queue, chunk_size: int):
+        """Move chunks from a pipe to the queue; b'' marks end of stream"""
+        while True:
+            data = await reader.read(chunk_size)
+            await chunks.put((stream_name, data))
+            if not data:
+                return
+
+    @staticmethod
+    async def _kill(process: asyncio.subprocess.Process):
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
+
+    async def execute_many(self, commands: List[str], silent: bool = True,
+                           timeout: float = DEFAULT_TIMEOUT) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Run commands in parallel, yielding (index, result) as each completes
+
+        Blocked commands complete immediately with their security error.
+        Leaving the loop early (break, or cancelling the consumer) cancels
+        and kills the commands still running.
+
+        Usage:
+            async for index, result in executor.execute_many(['ls', 'git status']):
+                ...
+        """
+        pending = set()
+        for index, command in enumerate(commands):
+            task = asyncio.ensure_future(self.execute_async(command, silent=silent, timeout=timeout))
+            task.index = index
+            pending.add(task)
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.index, task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def execute_parallel(self, commands: List[str], silent: bool = True,
+                         timeout: float = DEFAULT_TIMEOUT) -> List[Dict[str, Any]]:
+        """
+        Blocking wrapper around execute_many for callers without an event loop
+
+        Returns:
+            Results in the order of commands
+        """
+        async def collect():
+            results: List[Optional[Dict[str, Any]]] = [None] * len(commands)
+            async for index, result in self.execute_many(commands, silent=silent, timeout=timeout):
+                results[index] = result
+            return results
+
+        return asyncio.run(collect())
+
     def execute_with_output(self, command: str) -> str:
         """
         Execute and return stdout only (for data retrieval)
 
+        The output is complete unless the executor was created with
+        bound_output=True.
+
         Args:
             command: Shell command to execute
 
         Returns:
             String output from command
         """
-        # SECURITY: Validate command first
-        if not self._validate_command(command):
-            return ""
-
-        try:
-            cmd_parts = shlex.split(command)
-            result = subprocess.run(
-                cmd_parts,
-                shell=False,  # SECURE: No shell interpretation
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            return result.stdout if result.returncode == 0 else ""
-        except:
-            return ""
+        result = self.execute(command, silent=False)
+        return result['stdout'] if result['success'] else ""
 
     def execute_script(self, script_path: str, args: List[str] = None) -> Dict[str, Any]:
         """
@@ -192,11 +834,29 @@ class SENASilentExecutor:
 
     def get_history(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent command history"""
-        return self.command_history[-limit:]
+        return list(self.command_history)[-limit:]
+
+    def query_history(self, name: Optional[str] = None, exit_code: Optional[int] = None,
+                      since: Optional[float] = None, until: Optional[float] = None,
+                      limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Search the on-disk history by command name, exit code and time range
+
+        Newest first; see CommandHistoryStore.query. Without a history store
+        only name and exit_code filter the in-memory history.
+        """
+        if self.history_store is not None:
+            return self.history_store.query(name, exit_code, since, until, limit)
+        matches = [
+            entry for entry in reversed(self.command_history)
+            if (name is None or entry['command'].split()[0] == name)
+            and (exit_code is None or entry['returncode'] == exit_code)
+        ]
+        return matches[:limit]
 
     def clear_history(self):
-        """Clear command history"""
-        self.command_history = []
+        """Clear in-memory command history (the on-disk history is append-only)"""
+        self.command_history.clear()
 
 
 # Global instance
@@ -206,7 +866,10 @@ def get_silent_executor():
     """Get or create silent executor instance"""
     global _silent_executor
     if _silent_executor is None:
-        _silent_executor = SENASilentExecutor()
+        _silent_executor = SENASilentExecutor(
+            # Falls back to the in-memory history if the database cannot be opened
+            history_store=open_history_store() if HISTORY_ENABLED else None
+        )
     return _silent_executor
 
 
@@ -246,8 +909,13 @@ if __name__ == "__main__":
     output = executor.execute_with_output("echo 'SENA v3.3 Silent'")
     print(f"   Output: {output.strip()}")
 
-    # Test 3: Command history
-    print("\n3. History test:")
+    # Test 3: Parallel execution
+    print("\n3. Parallel execution test:")
+    for result in executor.execute_parallel(["date", "whoami", "pwd"], silent=False):
+        print(f"   {result['stdout'].strip()}")
+
+    # Test 4: Command history
+    print("\n4. History test:")
     history = executor.get_history(limit=5)
     print(f"   Commands executed: {len(history)}")
 
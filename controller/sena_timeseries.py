@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+SENA Time Series - v3.5.2
+Fixed-size, memory-mapped ring buffer of metric samples
+
+File layout (little endian):
+    header   64 bytes   magic, version, capacity, max series, frames written
+    names    max_series x 128 bytes, series id -> name (NUL padded UTF-8)
+    frames   capacity x (8 + max_series x 8) bytes: uint32 unix time, pad,
+             one float64 per series id (NaN where the series has no sample)
+
+Each append is one frame, so the timestamp is stored once per sample
+rather than once per series. The default capacity is one week of frames
+at one per minute; with the default 64 series that is 10080 x 520 bytes,
+about 5.0 MB (5.2 MB with the names table). Shorter intervals are capped
+at 64 MB and keep less than a week. The daemon is the only writer;
+readers map the same file and see new samples without reopening it.
+"""
+
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sena_runtime_metrics import MetricsRegistry
+
+TIMESERIES_FILE = Path.home() / '.claude' / 'sena_metrics.tsdb'
+
+MAGIC = b'SENATS1\0'
+VERSION = 2
+HEADER = struct.Struct('<8sIIIQ')
+HEADER_SIZE = 64
+NAME_SIZE = 128
+FRAME_TIME = struct.Struct('<Ixxxx')
+VALUE_SIZE = 8
+
+DEFAULT_MAX_SERIES = 64
+DEFAULT_INTERVAL = 60.0
+RETENTION_SECONDS = 7 * 24 * 3600
+MAX_SIZE = 64 << 20
+
+# Histogram values stored per sample
+HISTOGRAM_FIELDS = ('count', 'sum', 'p50', 'p95', 'p99')
+
+
+def frame_size(max_series: int = DEFAULT_MAX_SERIES) -> int:
+    """Bytes per frame: the timestamp plus one value per series"""
+    return FRAME_TIME.size + max_series * VALUE_SIZE
+
+
+def retention_capacity(interval: float = DEFAULT_INTERVAL, max_series: int = DEFAULT_MAX_SERIES,
+                       retention: float = RETENTION_SECONDS) -> int:
+    """Frames needed to keep `retention` seconds at one sample per interval, up to MAX_SIZE"""
+    frames = max(1, int(retention / max(interval, 1.0)))
+    return min(frames, max(1, MAX_SIZE // frame_size(max_series)))
+
+
+DEFAULT_CAPACITY = retention_capacity()
+
+
+def _series_name(name: str, labels: Dict[str, str], suffix: str = '') -> str:
+    """name_suffix{k="v",...}"""
+    label_text = ','.join(f'{k}="{v}"' for k, v in sorted(labels.items()))
+    return f'{name}{suffix}' + (f'{{{label_text}}}' if label_text else '')
+
+
+def flatten_snapshot(snapshot: Dict) -> List[Tuple[str, float]]:
+    """(series name, value) for every counter, gauge and histogram field"""
+    points = []
+    for name, family in snapshot.items():
+        for series in family['series']:
+            labels = series['labels']
+            if family['type'] == 'histogram':
+                for field in HISTOGRAM_FIELDS:
+                    points.append((_series_name(name, labels, f'_{field}'), float(series[field])))
+            else:
+                points.append((_series_name(name, labels), float(series['value'])))
+    return points
+
+
+class TimeSeriesStore:
+    """
+    Ring buffer of timestamped frames of series values in a memory-mapped file
+
+    Opening an existing file keeps its samples and series ids; a file with
+    a different layout is reinitialized.
+    """
+
+    def __init__(self, path: Path = TIMESERIES_FILE, capacity: int = DEFAULT_CAPACITY,
+                 max_series: int = DEFAULT_MAX_SERIES, readonly: bool = False):
+        self.path = Path(path)
+        self.readonly = readonly
+        self.capacity = capacity
+        self.max_series = max_series
+        self._lock = threading.Lock()
+        self._mm: Optional[mmap.mmap] = None
+        self._frame: Optional[struct.Struct] = None
+
+        if readonly:
+            self._open_readonly()
+        else:
+            self._open_writable()
+
+        self._frame = struct.Struct(f'<Ixxxx{self.max_series}d')
+        self.names: List[str] = self._read_names()
+        self.ids: Dict[str, int] = {name: i for i, name in enumerate(self.names) if name}
+
+    @property
+    def records_offset(self) -> int:
+        return HEADER_SIZE + self.max_series * NAME_SIZE
+
+    @property
+    def frame_size(self) -> int:
+        return frame_size(self.max_series)
+
+    @property
+    def size(self) -> int:
+        return self.records_offset + self.capacity * self.frame_size
+
+    def _open_writable(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            valid = False
+            if os.fstat(fd).st_size == self.size:
+                magic, version, capacity, max_series, _ = HEADER.unpack(os.pread(fd, HEADER.size, 0))
+                valid = (magic, version, capacity, max_series) == \
+                    (MAGIC, VERSION, self.capacity, self.max_series)
+
+            if not valid:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, self.size)
+                os.pwrite(fd, HEADER.pack(MAGIC, VERSION, self.capacity, self.max_series, 0), 0)
+
+            self._mm = mmap.mmap(fd, self.size)
+        finally:
+            os.close(fd)
+
+    def _open_readonly(self):
+        with open(self.path, 'rb') as f:
+            magic, version, capacity, max_series, _ = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{self.path} is not a SENA time series file")
+            self.capacity, self.max_series = capacity, max_series
+            self._mm = mmap.mmap(f.fileno(), self.size, access=mmap.ACCESS_READ)
+
+    def _read_names(self) -> List[str]:
+        names = []
+        for i in range(self.max_series):
+            offset = HEADER_SIZE + i * NAME_SIZE
+            raw = self._mm[offset:offset + NAME_SIZE].split(b'\0', 1)[0]
+            names.append(raw.decode('utf-8', 'replace'))
+        return names
+
+    @property
+    def written(self) -> int:
+        """Total frames ever written (the ring holds the last capacity of them)"""
+        return HEADER.unpack_from(self._mm, 0)[4]
+
+    def series_id(self, name: str) -> Optional[int]:
+        """Id for a series name, registering it if there is room"""
+        series_id = self.ids.get(name)
+        if series_id is not None:
+            return series_id
+
+        encoded = name.encode('utf-8')
+        if len(encoded) >= NAME_SIZE or len(self.ids) >= self.max_series:
+            return None
+
+        series_id = self.names.index('')
+        offset = HEADER_SIZE + series_id * NAME_SIZE
+        self._mm[offset:offset + len(encoded)] = encoded
+        self.names[series_id] = name
+        self.ids[name] = series_id
+        return series_id
+
+    def append(self, points: List[Tuple[str, float]], timestamp: Optional[float] = None) -> int:
+        """Write one frame holding every point; returns samples stored (unknown series are skipped)"""
+        stamp = int(timestamp if timestamp is not None else time.time())
+        with self._lock:
+            values = [math.nan] * self.max_series
+            count = 0
+            for name, value in points:
+                series_id = self.series_id(name)
+                if series_id is None:
+                    continue
+                values[series_id] = value
+                count += 1
+            if not count:
+                return 0
+
+            written = self.written
+            slot = written % self.capacity
+            self._frame.pack_into(self._mm, self.records_offset + slot * self.frame_size,
+                                  stamp, *values)
+            # Publish the frame only after it is written
+            HEADER.pack_into(self._mm, 0, MAGIC, VERSION, self.capacity, self.max_series,
+                             written + 1)
+        return count
+
+    def records(self) -> Iterator[Tuple[int, int, float]]:
+        """
+        (time, series id, value) for every stored sample, oldest first
+
+        The frames are copied out of the map first. Once the ring has
+        wrapped, the writer may have overwritten the oldest slots during
+        the copy, so frames older than the header's count after the copy
+        (plus one append still in progress) are dropped rather than
+        returned torn or out of order.
+        """
+        written = self.written
+        base = self.records_offset
+        if written <= self.capacity:
+            data = self._mm[base:base + written * self.frame_size]
+        else:
+            split = base + (written % self.capacity) * self.frame_size
+            data = self._mm[split:self.size] + self._mm[base:split]
+
+        oldest = max(0, written - self.capacity)
+        first_valid = self.written + 1 - self.capacity
+        skip = max(0, first_valid - oldest) * self.frame_size
+        for stamp, *values in self._frame.iter_unpack(data[skip:]):
+            for series_id, value in enumerate(values):
+                if not math.isnan(value):
+                    yield stamp, series_id, value
+
+    def query(self, match: str = '', start: Optional[float] = None, end: Optional[float] = None,
+              points: int = 60, agg: str = 'avg') -> Dict[str, List[Tuple[int, float]]]:
+        """
+        Downsampled series whose name contains match, within [start, end]
+
+        The range is split into `points` equal steps; each step reports the
+        avg, min, max or last sample in it. Steps without samples are omitted.
+        """
+        if agg not in ('avg', 'min', 'max', 'last'):
+            raise ValueError(f"Unknown aggregation: {agg}")
+        points = max(1, points)
+        self.names = self._read_names()
+        wanted = {i for i, name in enumerate(self.names) if name and match in name}
+        end = time.time() if end is None else end
+        start = end - 3600 if start is None else start
+        step = max(1.0, (end - start) / max(1, points))
+
+        buckets: Dict[int, Dict[int, List[float]]] = {}
+        for stamp, series_id, value in self.records():
+            if series_id in wanted and start <= stamp <= end:
+                position = min(int((stamp - start) / step), points - 1)
+                buckets.setdefault(series_id, {}).setdefault(position, []).append(value)
+
+        reduce = {
+            'avg': lambda values: sum(values) / len(values),
+            'min': min,
+            'max': max,
+            'last': lambda values: values[-1],
+        }[agg]
+        return {
+            self.names[series_id]: [
+                (int(start + position * step), reduce(values))
+                for position, values in sorted(steps.items())
+            ]
+            for series_id, steps in sorted(buckets.items())
+        }
+
+    def close(self):
+        if self._mm is not None:
+            if not self.readonly:
+                self._mm.flush()
+            self._mm.close()
+            self._mm = None
+
+
+class TimeSeriesRecorder:
+    """Background thread sampling a registry into a store every interval seconds"""
+
+    def __init__(self, store: TimeSeriesStore, registry: MetricsRegistry, interval: float = 60.0):
+        self.store = store
+        self.registry = registry
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> int:
+        """Write the current registry values; returns records written"""
+        return self.store.append(flatten_snapshot(self.registry.snapshot()))
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='sena-timeseries', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception:
+                # History is best effort; never take the daemon down over it
+                pass
+
+    def stop(self):
+        """Stop sampling, writing one final sample"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.sample()
+        self.store.close()
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+
+    match = sys.argv[1] if len(sys.argv) > 1 else ''
+    minutes = float(sys.argv[2]) if len(sys.argv) > 2 else 60
+    store = TimeSeriesStore(readonly=True)
+    print(json.dumps(store.query(match, start=time.time() - minutes * 60), indent=2))
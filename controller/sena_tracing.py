@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+SENA Tracing - v3.5.2
+Lightweight request tracing written as Chrome trace JSON
+
+Spans are Chrome "complete" events (ph: X) with microsecond wall-clock
+timestamps, so spans written by the daemon and by the bash hook client
+line up in one file. Open ~/.claude/logs/sena_trace.json in
+chrome://tracing or https://ui.perfetto.dev and filter by args.trace_id.
+
+A trace id comes from the request (the hook client sends "trace_id" when
+SENA_TRACE=1) or is generated by the daemon when it runs with
+SENA_TRACE=1. Without an active trace, span() is a no-op.
+
+Usage:
+    with TRACER.activate(trace_id):
+        with TRACER.span('formatter.detect_format_needed'):
+            ...
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+TRACE_FILE = Path.home() / '.claude' / 'logs' / 'sena_trace.json'
+TRACE_ALL = os.environ.get('SENA_TRACE', '0') == '1'
+
+# (trace_id, span name) of the innermost active span
+_current: contextvars.ContextVar = contextvars.ContextVar('sena_trace', default=None)
+
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def now_us() -> int:
+    """Wall-clock microseconds (the clock the bash client uses via EPOCHREALTIME)"""
+    return time.time_ns() // 1000
+
+
+class _NullSpan:
+    """Span used when no trace is active"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'args', 'start', 'token')
+
+    def __init__(self, tracer: 'Tracer', name: str, args: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        trace_id, parent = _current.get()
+        self.args['trace_id'] = trace_id
+        if parent:
+            self.args['parent'] = parent
+        self.token = _current.set((trace_id, self.name))
+        self.start = now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = now_us()
+        _current.reset(self.token)
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self.tracer.add(self.name, self.start, end, self.args)
+        return False
+
+
+class Tracer:
+    """
+    Buffers spans and appends them to a Chrome trace (JSON array) file
+
+    The file is an unterminated JSON array, which trace viewers accept, so
+    several processes can append complete lines to it. Call flush() off
+    the latency-critical path (after the response is sent).
+    """
+
+    def __init__(self, path: Path = TRACE_FILE, flush_every: int = 64):
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._events: List[Dict] = []
+
+    @property
+    def active(self) -> bool:
+        return _current.get() is not None
+
+    @contextmanager
+    def activate(self, trace_id: Optional[str] = None):
+        """Make trace_id (or a new id) the current trace for nested spans"""
+        token = _current.set((trace_id or new_trace_id(), None))
+        try:
+            yield _current.get()[0]
+        finally:
+            _current.reset(token)
+
+    def span(self, name: str, **args):
+        """Context manager timing a block as a child of the current span"""
+        if _current.get() is None:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def add(self, name: str, start_us: int, end_us: int, args: Dict):
+        """Record a span from explicit wall-clock microsecond timestamps"""
+        event = {
+            'name': name,
+            'cat': name.split('.', 1)[0],
+            'ph': 'X',
+            'ts': start_us,
+            'dur': max(0, end_us - start_us),
+            'pid': self.pid,
+            'tid': threading.get_ident(),
+            'args': args,
+        }
+        with self._lock:
+            self._events.append(event)
+
+    def flush(self, force: bool = False):
+        """Append buffered spans to the trace file (at most every flush_every spans)"""
+        with self._lock:
+            if not self._events or (not force and len(self._events) < self.flush_every):
+                return
+            events, self._events = self._events, []
+
+        lines = ''.join(json.dumps(event, separators=(',', ':')) + ',\n' for event in events)
+        self._append(lines)
+
+    def ensure_file(self):
+        """Create the trace file so other writers (the hook client) can append to it"""
+        self._append('')
+
+    def _append(self, text: str):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size == 0:
+                text = '[\n' + text
+            if text:
+                os.write(fd, text.encode('utf-8'))
+        finally:
+            os.close(fd)
+
+
+# Global tracer
+TRACER = Tracer()
+
+
+def load_trace(path: Path = TRACE_FILE) -> List[Dict]:
+    """Parse a trace file written by Tracer (and the hook client)"""
+    text = Path(path).read_text().strip().rstrip(',')
+    if not text.endswith(']'):
+        text += ']'
+    return json.loads(text)
+
+
+if __name__ == "__main__":
+    import sys
+
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else TRACE_FILE
+    spans: Dict[str, List[Dict]] = {}
+    for event in load_trace(path):
+        spans.setdefault(event.get('args', {}).get('trace_id', '?'), []).append(event)
+
+    for trace_id, events in list(spans.items())[-10:]:
+        print(f"trace {trace_id}")
+        for event in sorted(events, key=lambda e: (e['ts'], -e['dur'])):
+            print(f"  {event['name']:<36} {event['dur'] / 1000:>9.3f} ms")
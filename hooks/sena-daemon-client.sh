@@ -5,6 +5,28 @@
 SOCKET_PATH="$HOME/.claude/.sena_daemon.sock"
 TIMEOUT=5
 
+# Tracing: with SENA_TRACE=1 each call gets a trace id (or uses SENA_TRACE_ID)
+# that the daemon propagates, and client stages are appended to the trace file.
+# Timestamps come from bash 5's EPOCHREALTIME, so tracing costs no extra forks.
+TRACE_FILE="$HOME/.claude/logs/sena_trace.json"
+
+# Start a trace if tracing is on and none is active
+trace_begin() {
+    if [ "$SENA_TRACE" = "1" ] && [ -z "$SENA_TRACE_ID" ] && [ -n "$EPOCHREALTIME" ]; then
+        printf -v SENA_TRACE_ID '%04x%04x%04x%04x' $RANDOM $RANDOM $RANDOM $RANDOM
+    fi
+}
+
+# Append a span (name, start_us, end_us) to the trace file
+trace_span() {
+    local name="$1" start="$2" end="$3"
+    if [ -z "$SENA_TRACE_ID" ] || [ -z "$start" ] || [ ! -f "$TRACE_FILE" ]; then
+        return 0
+    fi
+    printf '{"name":"%s","cat":"client","ph":"X","ts":%s,"dur":%s,"pid":%s,"tid":%s,"args":{"trace_id":"%s"}},\n' \
+        "$name" "$start" "$((end - start))" "$$" "$$" "$SENA_TRACE_ID" >> "$TRACE_FILE"
+}
+
 # Check if daemon is running
 is_daemon_running() {
     if [ ! -S "$SOCKET_PATH" ]; then
@@ -23,19 +45,28 @@ daemon_call() {
         return 1
     fi
 
+    trace_begin
+    local trace_field=""
+    if [ -n "$SENA_TRACE_ID" ]; then
+        trace_field=",\"trace_id\":\"$SENA_TRACE_ID\""
+    fi
+
     # Build JSON-RPC request
     local request
     if [ -n "$params" ]; then
-        request="{\"jsonrpc\":\"2.0\",\"method\":\"$method\",\"params\":$params,\"id\":1}"
+        request="{\"jsonrpc\":\"2.0\",\"method\":\"$method\",\"params\":$params,\"id\":1$trace_field}"
     else
-        request="{\"jsonrpc\":\"2.0\",\"method\":\"$method\",\"params\":{},\"id\":1}"
+        request="{\"jsonrpc\":\"2.0\",\"method\":\"$method\",\"params\":{},\"id\":1$trace_field}"
     fi
 
     # Send request and get response using nc (netcat)
-    local response
+    local response status
+    local t0=${EPOCHREALTIME//[.,]/}
     response=$(echo "$request" | nc -U -w $TIMEOUT "$SOCKET_PATH" 2>/dev/null)
+    status=$?
+    trace_span "client.nc_roundtrip" "$t0" "${EPOCHREALTIME//[.,]/}"
 
-    if [ $? -ne 0 ]; then
+    if [ $status -ne 0 ]; then
         echo '{"error": "connection_failed"}' >&2
         return 1
     fi
@@ -46,10 +77,14 @@ daemon_call() {
 # Detect format for user input
 detect_format() {
     local user_input="$1"
+    trace_begin
+    local t_start=${EPOCHREALTIME//[.,]/}
 
     # Escape user input for JSON
     local escaped_input
     escaped_input=$(echo "$user_input" | jq -Rs .)
+    local t_escaped=${EPOCHREALTIME//[.,]/}
+    trace_span "client.jq_escape" "$t_start" "$t_escaped"
 
     local params="{\"user_input\":$escaped_input}"
     local response
@@ -60,7 +95,11 @@ detect_format() {
     fi
 
     # Extract format_type from response
+    local t_call=${EPOCHREALTIME//[.,]/}
     echo "$response" | jq -r '.result.format_type // empty'
+    local t_end=${EPOCHREALTIME//[.,]/}
+    trace_span "client.jq_extract" "$t_call" "$t_end"
+    trace_span "client.detect_format" "$t_start" "$t_end"
 }
 
 # Apply format to user input
@@ -115,6 +154,31 @@ health_check() {
     echo "$response" | jq -r '.result.status // "unknown"'
 }
 
+# Runtime metrics in OpenMetrics text format
+metrics() {
+    local response
+    response=$(daemon_call "metrics" "{}")
+
+    if [ $? -ne 0 ]; then
+        return 1
+    fi
+
+    echo "$response" | jq -r '.result.text // empty'
+}
+
+# Sample the daemon for N seconds (default 10); prints the collapsed-stack file path
+profile() {
+    local seconds="${1:-10}"
+    local response
+    response=$(daemon_call "profile" "{\"action\":\"start\",\"seconds\":$seconds}")
+
+    if [ $? -ne 0 ]; then
+        return 1
+    fi
+
+    echo "$response" | jq -r '.result.output // .error.message'
+}
+
 # Start daemon if not running
 ensure_daemon() {
     if ! is_daemon_running; then
@@ -139,12 +203,16 @@ ensure_daemon() {
 }
 
 # Export functions for sourcing
+export -f trace_begin
+export -f trace_span
 export -f is_daemon_running
 export -f daemon_call
 export -f detect_format
 export -f apply_format
 export -f check_always_on
 export -f health_check
+export -f metrics
+export -f profile
 export -f ensure_daemon
 
 # If called directly (not sourced), execute command
@@ -171,11 +239,17 @@ if [ "${BASH_SOURCE[0]}" = "${0}" ]; then
         health)
             health_check
             ;;
+        metrics)
+            metrics
+            ;;
+        profile)
+            profile "$2"
+            ;;
         ensure)
             ensure_daemon
             ;;
         *)
-            echo "Usage: $0 {is_running|detect_format|apply_format|check_always_on|health|ensure}"
+            echo "Usage: $0 {is_running|detect_format|apply_format|check_always_on|health|metrics|profile|ensure}"
             exit 1
             ;;
     esac
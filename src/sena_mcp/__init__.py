@@ -6,6 +6,6 @@ __version__ = "1.0.0"
 __author__ = "SENA Team"
 __license__ = "MIT"
 
-from .server import app
+from .server import mcp as app
 
 __all__ = ["app"]
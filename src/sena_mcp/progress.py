@@ -0,0 +1,103 @@
+"""
+SENA MCP Progress - throttled MCP progress notifications for SENA tools
+
+Multi-step tools run their synchronous work in a worker thread and report
+each step through a ProgressReporter. The reporter forwards steps to the
+client as MCP progress notifications, at most one per min_interval seconds.
+The final step is always sent.
+
+Configuration:
+    SENA_PROGRESS_INTERVAL - minimum seconds between notifications (default 0.1)
+"""
+
+import asyncio
+import os
+import time
+from functools import partial
+from typing import Any, Callable, List, Optional
+
+import anyio
+
+# Minimum seconds between progress notifications for one tool call
+PROGRESS_MIN_INTERVAL = float(os.environ.get("SENA_PROGRESS_INTERVAL", "0.1"))
+
+# Signature of the progress callback passed to multi-step tools:
+# progress(completed_steps, total_steps, message)
+ProgressCallback = Callable[[int, int, str], None]
+
+
+class ProgressReporter:
+    """
+    Thread-safe, rate-limited bridge from tool steps to MCP notifications
+
+    Calling the reporter from a worker thread schedules the notification on
+    the server's event loop without blocking the worker. Steps arriving
+    faster than min_interval are dropped, except the final step.
+    """
+
+    def __init__(self, ctx: Any, loop: asyncio.AbstractEventLoop,
+                 min_interval: Optional[float] = None):
+        self.ctx = ctx
+        self.loop = loop
+        self.min_interval = PROGRESS_MIN_INTERVAL if min_interval is None else min_interval
+        self.sent = 0
+        self.dropped = 0
+
+        self._last_sent = float("-inf")
+        self._pending: List[asyncio.Future] = []
+
+    def __call__(self, completed: int, total: int, message: str = "") -> None:
+        now = time.monotonic()
+        if completed < total and now - self._last_sent < self.min_interval:
+            self.dropped += 1
+            return
+
+        self._last_sent = now
+        self.sent += 1
+        coro = self.ctx.report_progress(completed, total, message=message)
+        self._pending.append(asyncio.run_coroutine_threadsafe(coro, self.loop))
+
+    async def flush(self) -> None:
+        """Wait until every scheduled notification has been sent"""
+        pending, self._pending = self._pending, []
+        for future in pending:
+            try:
+                await asyncio.wrap_future(future)
+            except Exception:
+                # Progress is best effort; never fail the tool call over it
+                pass
+
+
+def report_step(progress: Optional[ProgressCallback], completed: int, total: int,
+                message: str) -> None:
+    """Report a step if the caller asked for progress"""
+    if progress is not None:
+        progress(completed, total, message)
+
+
+def _has_progress_token(ctx: Any) -> bool:
+    """Whether the client asked for progress on this request"""
+    if ctx is None:
+        return False
+    try:
+        meta = ctx.request_context.meta
+    except (AttributeError, ValueError):
+        return False
+    return meta is not None and getattr(meta, "progressToken", None) is not None
+
+
+async def run_with_progress(ctx: Any, func: Callable[..., Any], **kwargs: Any) -> Any:
+    """
+    Run a multi-step tool in a worker thread with progress notifications
+
+    func must accept a `progress` keyword argument. Without a context or a
+    client progress token, func runs without a reporter.
+    """
+    if not _has_progress_token(ctx):
+        return await anyio.to_thread.run_sync(partial(func, **kwargs))
+
+    reporter = ProgressReporter(ctx, asyncio.get_running_loop())
+    try:
+        return await anyio.to_thread.run_sync(partial(func, progress=reporter, **kwargs))
+    finally:
+        await reporter.flush()
@@ -15,7 +15,9 @@ Official MCP server for use with Claude Desktop.
 import asyncio
 from pathlib import Path
 from typing import Any, Dict, List, Optional
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
+
+from .progress import ProgressCallback, report_step, run_with_progress
 
 # Initialize FastMCP server
 mcp = FastMCP("SENA")
@@ -260,11 +262,11 @@ def sena_format_table(
     }
 
 
-@mcp.tool()
 def sena_analyze_code(
     code: str,
     language: str,
-    focus: str = "all"
+    focus: str = "all",
+    progress: Optional[ProgressCallback] = None
 ) -> Dict[str, Any]:
     """
     Comprehensive code quality analysis using SENA methodologies.
@@ -293,6 +295,7 @@ def sena_analyze_code(
     output.append("╚══════════════════════════════════════════════════════════════╝")
     output.append("")
 
+    report_step(progress, 0, 3, "Code overview")
     output.append("════════════════════════════════════════════════════════════════")
     output.append("  CODE OVERVIEW")
     output.append("════════════════════════════════════════════════════════════════")
@@ -302,6 +305,7 @@ def sena_analyze_code(
     output.append(f"Lines: {len(code.splitlines())}")
     output.append("")
 
+    report_step(progress, 1, 3, "Quality metrics")
     output.append("════════════════════════════════════════════════════════════════")
     output.append("  QUALITY METRICS")
     output.append("════════════════════════════════════════════════════════════════")
@@ -316,6 +320,7 @@ def sena_analyze_code(
     output.append("└──────────────────────────────────────────────────────────────┘")
     output.append("")
 
+    report_step(progress, 2, 3, "Issues & recommendations")
     output.append("════════════════════════════════════════════════════════════════")
     output.append("  ISSUES & RECOMMENDATIONS")
     output.append("════════════════════════════════════════════════════════════════")
@@ -331,6 +336,7 @@ def sena_analyze_code(
     output.append("")
 
     result = "\n".join(output)
+    report_step(progress, 3, 3, "Complete")
 
     return {
         "status": "success",
@@ -342,6 +348,19 @@ def sena_analyze_code(
     }
 
 
+@mcp.tool(name="sena_analyze_code", description=sena_analyze_code.__doc__)
+async def _sena_analyze_code_tool(
+    code: str,
+    language: str,
+    focus: str = "all",
+    ctx: Optional[Context] = None
+) -> Dict[str, Any]:
+    """MCP entry point: runs sena_analyze_code in a worker thread with progress"""
+    return await run_with_progress(
+        ctx, sena_analyze_code, code=code, language=language, focus=focus
+    )
+
+
 @mcp.tool()
 def sena_get_health() -> Dict[str, Any]:
     """
@@ -388,11 +407,11 @@ def sena_get_health() -> Dict[str, Any]:
 # PHASE 3 AUTONOMOUS SKILLS
 # ============================================================================
 
-@mcp.tool()
 def sena_auto_code_review(
     code: str,
     language: str,
-    filename: str = "code"
+    filename: str = "code",
+    progress: Optional[ProgressCallback] = None
 ) -> Dict[str, Any]:
     """
     Autonomous code review with quality metrics and suggestions.
@@ -422,6 +441,7 @@ def sena_auto_code_review(
     output.append(f"Analyzing code in {filename} ({language})")
     output.append("")
 
+    report_step(progress, 0, 4, "Code quality assessment")
     output.append("════════════════════════════════════════════════════════════════")
     output.append("  CODE QUALITY ASSESSMENT")
     output.append("════════════════════════════════════════════════════════════════")
@@ -437,6 +457,7 @@ def sena_auto_code_review(
     output.append("└──────────────────────────────────────────────────────────────┘")
     output.append("")
 
+    report_step(progress, 1, 4, "Strengths")
     output.append("════════════════════════════════════════════════════════════════")
     output.append("  STRENGTHS")
     output.append("════════════════════════════════════════════════════════════════")
@@ -444,6 +465,7 @@ def sena_auto_code_review(
     output.append("✅ [Identify positive aspects of the code]")
     output.append("")
 
+    report_step(progress, 2, 4, "Suggestions for improvement")
     output.append("════════════════════════════════════════════════════════════════")
     output.append("  SUGGESTIONS FOR IMPROVEMENT")
     output.append("════════════════════════════════════════════════════════════════")
@@ -451,6 +473,7 @@ def sena_auto_code_review(
     output.append("💡 [Concrete improvement suggestions]")
     output.append("")
 
+    report_step(progress, 3, 4, "Recommendation")
     output.append("════════════════════════════════════════════════════════════════")
     output.append("  RECOMMENDATION")
     output.append("════════════════════════════════════════════════════════════════")
@@ -459,6 +482,7 @@ def sena_auto_code_review(
     output.append("")
 
     result = "\n".join(output)
+    report_step(progress, 4, 4, "Complete")
 
     return {
         "status": "success",
@@ -471,11 +495,24 @@ def sena_auto_code_review(
     }
 
 
-@mcp.tool()
+@mcp.tool(name="sena_auto_code_review", description=sena_auto_code_review.__doc__)
+async def _sena_auto_code_review_tool(
+    code: str,
+    language: str,
+    filename: str = "code",
+    ctx: Optional[Context] = None
+) -> Dict[str, Any]:
+    """MCP entry point: runs sena_auto_code_review in a worker thread with progress"""
+    return await run_with_progress(
+        ctx, sena_auto_code_review, code=code, language=language, filename=filename
+    )
+
+
 def sena_auto_optimize(
     code: str,
     language: str,
-    focus: str = "all"
+    focus: str = "all",
+    progress: Optional[ProgressCallback] = None
 ) -> Dict[str, Any]:
     """
     Autonomous performance optimization suggestions.
@@ -503,6 +540,7 @@ def sena_auto_optimize(
     output.append("╚══════════════════════════════════════════════════════════════╝")
     output.append("")
 
+    report_step(progress, 0, 4, "Performance analysis")
     output.append("════════════════════════════════════════════════════════════════")
     output.append("  PERFORMANCE ANALYSIS")
     output.append("════════════════════════════════════════════════════════════════")
@@ -512,6 +550,7 @@ def sena_auto_optimize(
     output.append(f"Lines: {len(code.splitlines())}")
     output.append("")
 
+    report_step(progress, 1, 4, "Complexity assessment")
     output.append("════════════════════════════════════════════════════════════════")
     output.append("  COMPLEXITY ASSESSMENT")
     output.append("════════════════════════════════════════════════════════════════")
@@ -520,6 +559,7 @@ def sena_auto_optimize(
     output.append("Optimization Potential: [Estimate improvement ratio]")
     output.append("")
 
+    report_step(progress, 2, 4, "Optimization opportunities")
     output.append("════════════════════════════════════════════════════════════════")
     output.append("  OPTIMIZATION OPPORTUNITIES")
     output.append("════════════════════════════════════════════════════════════════")
@@ -531,6 +571,7 @@ def sena_auto_optimize(
     output.append("└──────────────────────────────────────────────────────────────┘")
     output.append("")
 
+    report_step(progress, 3, 4, "Recommended optimizations")
     output.append("════════════════════════════════════════════════════════════════")
     output.append("  RECOMMENDED OPTIMIZATIONS")
     output.append("════════════════════════════════════════════════════════════════")
@@ -539,6 +580,7 @@ def sena_auto_optimize(
     output.append("")
 
     result = "\n".join(output)
+    report_step(progress, 4, 4, "Complete")
 
     return {
         "status": "success",
@@ -551,11 +593,24 @@ def sena_auto_optimize(
     }
 
 
-@mcp.tool()
+@mcp.tool(name="sena_auto_optimize", description=sena_auto_optimize.__doc__)
+async def _sena_auto_optimize_tool(
+    code: str,
+    language: str,
+    focus: str = "all",
+    ctx: Optional[Context] = None
+) -> Dict[str, Any]:
+    """MCP entry point: runs sena_auto_optimize in a worker thread with progress"""
+    return await run_with_progress(
+        ctx, sena_auto_optimize, code=code, language=language, focus=focus
+    )
+
+
 def sena_auto_security_scan(
     code: str,
     language: str,
-    severity_threshold: str = "medium"
+    severity_threshold: str = "medium",
+    progress: Optional[ProgressCallback] = None
 ) -> Dict[str, Any]:
     """
     Autonomous security vulnerability scanning.
@@ -585,6 +640,7 @@ def sena_auto_security_scan(
     output.append("╚══════════════════════════════════════════════════════════════╝")
     output.append("")
 
+    report_step(progress, 0, 4, "Security scan overview")
     output.append("════════════════════════════════════════════════════════════════")
     output.append("  SECURITY SCAN OVERVIEW")
     output.append("════════════════════════════════════════════════════════════════")
@@ -594,6 +650,7 @@ def sena_auto_security_scan(
     output.append(f"Lines Scanned: {len(code.splitlines())}")
     output.append("")
 
+    report_step(progress, 1, 4, "OWASP top 10 check")
     output.append("════════════════════════════════════════════════════════════════")
     output.append("  OWASP TOP 10 CHECK")
     output.append("════════════════════════════════════════════════════════════════")
@@ -614,6 +671,7 @@ def sena_auto_security_scan(
     output.append("└──────────────────────────────────────────────────────────────┘")
     output.append("")
 
+    report_step(progress, 2, 4, "Detected issues")
     output.append("════════════════════════════════════════════════════════════════")
     output.append("  DETECTED ISSUES")
     output.append("════════════════════════════════════════════════════════════════")
@@ -623,6 +681,7 @@ def sena_auto_security_scan(
     output.append("💡 Medium: [List medium-severity issues]")
     output.append("")
 
+    report_step(progress, 3, 4, "Secure fixes")
     output.append("════════════════════════════════════════════════════════════════")
     output.append("  SECURE FIXES")
     output.append("════════════════════════════════════════════════════════════════")
@@ -631,6 +690,7 @@ def sena_auto_security_scan(
     output.append("")
 
     result = "\n".join(output)
+    report_step(progress, 4, 4, "Complete")
 
     return {
         "status": "success",
@@ -643,6 +703,19 @@ def sena_auto_security_scan(
     }
 
 
+@mcp.tool(name="sena_auto_security_scan", description=sena_auto_security_scan.__doc__)
+async def _sena_auto_security_scan_tool(
+    code: str,
+    language: str,
+    severity_threshold: str = "medium",
+    ctx: Optional[Context] = None
+) -> Dict[str, Any]:
+    """MCP entry point: runs sena_auto_security_scan in a worker thread with progress"""
+    return await run_with_progress(
+        ctx, sena_auto_security_scan, code=code, language=language, severity_threshold=severity_threshold
+    )
+
+
 # ============================================================================
 # KNOWLEDGE BASE RESOURCES
 # ============================================================================
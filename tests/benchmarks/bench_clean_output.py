@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+SENA Clean Output Benchmark
+Compares the combined single-pass filter against per-pattern re.search
+over a multi-megabyte synthetic transcript
+"""
+
+import io
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'controller'))
+
+from sena_clean_output_100 import SENACleanOutput100, filter_stream
+
+TRANSCRIPT_BLOCK = """⏺ Bash(ls -la)
+Output:
+file1.txt
+file2.txt
+
+Let me check the contents...
+⏺ Read(file1.txt)
+Hello World, this is regular assistant output that must be kept.
+  Read(notes.md)
+Tool ran without output
+The analysis shows three modules with high coupling.
+
+<thinking>
+This is internal thinking
+</thinking>
+
+Looking for patterns...
+⏺ Grep(pattern="test")
+test.txt: This is a test
+I'll summarize the findings below.
+| Module | Lines | Status |
+| core   | 1200  | ok     |
+"""
+
+# Mostly regular output, closer to a real session log
+PROSE_BLOCK = (
+    "The quarterly report shows revenue growth across all regions, with strength in Europe.\n" * 18
+    + "⏺ Bash(ls -la)\n"
+)
+
+
+def legacy_process_output(cleaner: SENACleanOutput100, text: str) -> str:
+    """Original implementation: one uncompiled re.search per pattern per line"""
+    text = re.sub(cleaner.thinking_pattern, '', text, flags=re.DOTALL)
+    cleaned_lines = []
+
+    for line in text.split('\n'):
+        filtered = False
+        if line.strip():
+            for pattern in cleaner.tool_marker_patterns + cleaner.tool_patterns:
+                if re.search(pattern, line):
+                    filtered = True
+                    break
+            if not filtered:
+                for pattern in cleaner.verbose_patterns:
+                    if re.search(pattern, line, re.IGNORECASE):
+                        filtered = True
+                        break
+        if not filtered:
+            cleaned_lines.append(line)
+
+    result = re.sub(r'\n{3,}', '\n\n', '\n'.join(cleaned_lines))
+    return result.strip()
+
+
+def per_line_process_output(cleaner: SENACleanOutput100, text: str) -> str:
+    """Combined regex applied once per line"""
+    text = cleaner.thinking_regex.sub('', text)
+    lines = [line for line in text.split('\n') if not cleaner.should_filter_line(line)]
+    return cleaner.blank_lines_regex.sub('\n\n', '\n'.join(lines)).strip()
+
+
+def timed(func, *args):
+    """Run func once and return (result, seconds)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    target_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 8.0
+    repeats = int(target_mb * 1024 * 1024 / len(TRANSCRIPT_BLOCK.encode('utf-8'))) + 1
+    transcript = TRANSCRIPT_BLOCK * repeats
+    size_mb = len(transcript.encode('utf-8')) / (1024 * 1024)
+
+    cleaner = SENACleanOutput100()
+
+    legacy, legacy_time = timed(legacy_process_output, cleaner, transcript)
+    per_line, per_line_time = timed(per_line_process_output, cleaner, transcript)
+    buffer, buffer_time = timed(cleaner.process_output, transcript)
+
+    assert per_line == legacy, "per-line combined filter diverged from legacy output"
+    assert buffer == legacy, "buffer filter diverged from legacy output"
+
+    print(f"Transcript: {size_mb:.1f} MB, {transcript.count(chr(10)):,} lines")
+    print(f"{'Mode':<28} {'Seconds':>9} {'MB/s':>9} {'Speedup':>9}")
+    for name, seconds in [
+        ('legacy per-pattern search', legacy_time),
+        ('combined regex per line', per_line_time),
+        ('combined regex per buffer', buffer_time),
+    ]:
+        print(f"{name:<28} {seconds:>9.3f} {size_mb / seconds:>9.1f} "
+              f"{legacy_time / seconds:>8.1f}x")
+
+    # Pipe filter mode (--filter) over a tool-heavy and a prose-heavy input
+    print()
+    print(f"{'Pipe filter input':<28} {'Seconds':>9} {'MB/s':>9}")
+    for name, block in [('tool-heavy transcript', TRANSCRIPT_BLOCK), ('prose-heavy log', PROSE_BLOCK)]:
+        data = (block * (int(target_mb * 1024 * 1024 / len(block.encode('utf-8'))) + 1)).encode('utf-8')
+        _, seconds = timed(filter_stream, io.BytesIO(data), io.BytesIO())
+        print(f"{name:<28} {seconds:>9.3f} {len(data) / (1024 * 1024) / seconds:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+SENA Command Policy Benchmark
+Decisions per second over a generated corpus of commands: the old
+substring validator (alone, and with the shlex.split the old _prepare
+did after it), the compiled policy on unique commands (cold), and the
+policy on a repeating workload (memoized)
+"""
+
+import random
+import shlex
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'controller'))
+
+from sena_command_policy import CommandPolicy
+from sena_silent_executor import SENASilentExecutor
+
+TEMPLATES = [
+    'git status', 'git log --oneline -n {n}', 'git diff HEAD~{n} -- src/file_{n}.py',
+    'git push --force origin branch_{n}', 'git -c core.pager=less show {n}',
+    'ls -la dir_{n}', 'cat notes/file_{n}.md', 'grep -rn "pattern {n}" src/module_{n}',
+    'find . -name "*_{n}.py" -type f', 'find . -name "*_{n}.tmp" -delete',
+    'rm -rf build/out_{n}', 'rm -rf /', 'python3 scripts/run_{n}.py --flag {n}',
+    'wc -l data/file_{n}.csv', 'curl http://example.com/{n}', 'ls dir_{n}; rm -rf dir_{n}',
+    'head -n {n} ' + ' '.join(f'logs/part_{i}.log' for i in range(20)),
+]
+
+
+def legacy_validate(safe_commands, command: str) -> bool:
+    """The substring validator SENASilentExecutor used before the policy engine"""
+    cmd_name = command.split()[0] if command.strip() else ''
+    if cmd_name not in safe_commands:
+        return False
+    for pattern in [';', '&&', '||', '|', '>', '<', '`', '$(', 'rm -rf /', 'dd if=',
+                    'mkfs', 'format', ':(){', 'fork', 'exec']:
+        if pattern in command:
+            return False
+    return True
+
+
+def rate(commands, decide) -> float:
+    start = time.perf_counter()
+    for command in commands:
+        decide(command)
+    return len(commands) / (time.perf_counter() - start)
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rng = random.Random(7)
+    unique = [rng.choice(TEMPLATES).format(n=i) for i in range(size)]
+    repeating = [rng.choice(TEMPLATES).format(n=rng.randrange(50)) for _ in range(size)]
+
+    safe_commands = SENASilentExecutor().safe_commands
+    print(f"{size:,} commands per run, decisions per second")
+    print(f"{'legacy substring validator':<32}{rate(unique, lambda c: legacy_validate(safe_commands, c)):>14,.0f}")
+    print(f"{'legacy validator + shlex.split':<32}"
+          f"{rate(unique, lambda c: legacy_validate(safe_commands, c) and shlex.split(c)):>14,.0f}")
+    print(f"{'policy, unique commands':<32}{rate(unique, CommandPolicy(safe_commands, cache_size=0).evaluate):>14,.0f}")
+    print(f"{'policy, repeating workload':<32}{rate(repeating, CommandPolicy(safe_commands).evaluate):>14,.0f}")
+
+    policy = CommandPolicy(safe_commands, cache_size=0)
+    rules = {}
+    for command in unique:
+        decision = policy.evaluate(command)
+        rules[decision.rule] = rules.get(decision.rule, 0) + 1
+    print()
+    for rule, count in sorted(rules.items(), key=lambda item: -item[1]):
+        print(f"  {rule:<28}{count:>10,}")
+
+
+if __name__ == "__main__":
+    main()
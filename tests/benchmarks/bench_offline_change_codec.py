@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+OfflineSync Change Codec Benchmark
+Log size and encode/decode time for a generated stream of changes (1M by
+default): the JSON-lines log with SHA-256 change ids OfflineSync wrote
+before, against offline_change_codec with (author, counter) ids
+"""
+
+import gc
+import hashlib
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'archive' / 'experimental'))
+
+from offline_change_codec import ChangeDecoder, ChangeEncoder, make_change_id
+
+AUTHORS = [f'sena-device-{i}-1760000000' for i in range(4)]
+CHUNK = 100_000
+
+
+def generate(rng: random.Random, count: int, clocks, start: float):
+    """count changes from random authors, each ticking its own clock entry"""
+    changes = []
+    for i in range(count):
+        author = rng.choice(AUTHORS)
+        clock = clocks[author]
+        clock[author] += 1
+        # Now and then an author has merged another replica's changes
+        if rng.random() < 0.05:
+            other = rng.choice(AUTHORS)
+            clock[other] = max(clock[other], clocks[other][other])
+        deleted = rng.random() < 0.1
+        changes.append({
+            'id': None,
+            'timestamp': start + i * 0.001,
+            'operation': 'delete' if deleted else 'update',
+            'collection': 'default',
+            'key': f'user.settings.{rng.randrange(20_000)}',
+            'value': None if deleted else {'theme': rng.choice(['dark', 'light']), 'n': rng.randrange(1000)},
+            'author': author,
+            'vector_clock': dict(clock),
+        })
+    return changes
+
+
+def legacy_id(author: str) -> str:
+    """The id OfflineSync generated before (CRDT._generate_change_id)"""
+    data = f"{author}{time.time()}{id(object())}"
+    return hashlib.sha256(data.encode()).hexdigest()[:16]
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(7)
+    clocks = {author: {other: 0 for other in AUTHORS} for author in AUTHORS}
+
+    results = {name: {'bytes': 0, 'encode': 0.0, 'decode': 0.0} for name in ('json', 'binary')}
+    encoder, decoder = ChangeEncoder(), ChangeDecoder()
+    done = 0
+    while done < total:
+        changes = generate(rng, min(CHUNK, total - done), clocks, start=1.76e9 + done)
+
+        # Each timed phase starts from a collected heap holding only this chunk
+        gc.collect()
+        start = time.perf_counter()
+        lines = []
+        for change in changes:
+            change['id'] = legacy_id(change['author'])
+            lines.append((json.dumps(change) + '\n').encode())
+        blob = b''.join(lines)
+        results['json']['encode'] += time.perf_counter() - start
+        results['json']['bytes'] += len(blob)
+
+        gc.collect()
+        start = time.perf_counter()
+        decoded = [json.loads(line) for line in blob.splitlines()]
+        results['json']['decode'] += time.perf_counter() - start
+        assert decoded == changes
+        del decoded, lines, blob
+
+        gc.collect()
+        start = time.perf_counter()
+        parts = []
+        for change in changes:
+            change['id'] = make_change_id(change['author'], change['vector_clock'][change['author']])
+            parts.append(encoder.encode(change))
+        blob = b''.join(parts)
+        results['binary']['encode'] += time.perf_counter() - start
+        results['binary']['bytes'] += len(blob)
+
+        gc.collect()
+        start = time.perf_counter()
+        decoded, consumed = decoder.decode(blob)
+        results['binary']['decode'] += time.perf_counter() - start
+        assert consumed == len(blob) and decoded == changes
+        del decoded, parts, blob
+
+        done += len(changes)
+
+    print(f"{total:,} changes")
+    print(f"{'format':<10}{'MB':>10}{'B/change':>10}{'encode/s':>14}{'decode/s':>14}")
+    for name, result in results.items():
+        print(f"{name:<10}{result['bytes'] / 1e6:>10.1f}{result['bytes'] / total:>10.1f}"
+              f"{total / result['encode']:>14,.0f}{total / result['decode']:>14,.0f}")
+    json_result, binary_result = results['json'], results['binary']
+    print(f"\nbinary log is {json_result['bytes'] / binary_result['bytes']:.1f}x smaller, "
+          f"encodes {json_result['encode'] / binary_result['encode']:.1f}x and "
+          f"decodes {json_result['decode'] / binary_result['decode']:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+SENA Runtime Metrics Benchmark
+Per-call overhead of counter and histogram recording at increasing thread
+counts: shared dict (the old daemon stats), a single locked metric, and
+per-thread shards
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'controller'))
+
+from sena_runtime_metrics import MetricsRegistry, bucket_index
+
+
+class LockedMetric:
+    """Single shared counter and histogram behind one lock"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.count = 0
+        self.buckets = {}
+
+    def record(self, seconds):
+        index = bucket_index(int(seconds * 1_000_000))
+        with self.lock:
+            self.count += 1
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+
+
+def run_threads(threads: int, calls: int, record) -> float:
+    """Run record(seconds) calls spread over threads; return seconds elapsed"""
+    barrier = threading.Barrier(threads + 1)
+
+    def work():
+        barrier.wait()
+        for _ in range(calls // threads):
+            record(0.0005)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 400_000
+
+    def baseline(seconds):
+        pass
+
+    stats = {'requests_handled': 0, 'requests_by_type': {}}
+
+    def shared_dict(seconds):
+        # Old SENADaemon stats: racy read-modify-write on a shared dict
+        stats['requests_handled'] += 1
+        stats['requests_by_type']['detect_format'] = \
+            stats['requests_by_type'].get('detect_format', 0) + 1
+
+    locked = LockedMetric()
+
+    registry = MetricsRegistry()
+    counter = registry.counter('calls_total', method='detect_format')
+    histogram = registry.histogram('call_seconds', method='detect_format')
+
+    def sharded(seconds):
+        counter.inc()
+        histogram.observe(seconds)
+
+    lookup_registry = MetricsRegistry()
+
+    def sharded_lookup(seconds):
+        lookup_registry.counter('calls_total', method='detect_format').inc()
+        lookup_registry.histogram('call_seconds', method='detect_format').observe(seconds)
+
+    modes = [
+        ('no-op baseline', baseline),
+        ('shared dict (racy)', shared_dict),
+        ('locked metric', locked.record),
+        ('per-thread shards', sharded),
+        ('shards + name lookup', sharded_lookup),
+    ]
+
+    print(f"{calls:,} recorded calls per run (counter + histogram)")
+    print(f"{'Mode':<22}" + ''.join(f"{f'{t} thr ns':>12}" for t in (1, 4, 16, 64)))
+    for name, record in modes:
+        cells = []
+        for threads in (1, 4, 16, 64):
+            seconds = run_threads(threads, calls, record)
+            cells.append(f"{seconds / calls * 1e9:>12.0f}")
+        print(f"{name:<22}" + ''.join(cells))
+
+    print()
+    print(f"Sharded counter total: {int(counter.value):,} "
+          f"(expected {sum(calls // t * t for t in (1, 4, 16, 64)):,})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+SENA Silent Executor Benchmark
+Per-call latency of cheap whitelisted commands: subprocess.run, a bare
+os.posix_spawn (what a warm spawn helper would save), and execute() with
+and without the in-process builtins
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'controller'))
+
+from sena_silent_executor import SENASilentExecutor
+
+
+def posix_spawn(argv):
+    """Spawn with one stdout pipe and no Popen bookkeeping"""
+    read_fd, write_fd = os.pipe()
+    pid = os.posix_spawn(shutil.which(argv[0]), argv, os.environ, file_actions=[
+        (os.POSIX_SPAWN_DUP2, write_fd, 1),
+        (os.POSIX_SPAWN_CLOSE, read_fd),
+    ])
+    os.close(write_fd)
+    while os.read(read_fd, 65536):
+        pass
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+
+
+def per_call_us(calls: int, func) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    sample = Path(tempfile.mkdtemp()) / 'sample.txt'
+    sample.write_text(''.join(f'line {i}\n' for i in range(10_000)))
+    commands = ['pwd', 'date', 'whoami', f'wc -l {sample}']
+
+    spawned = SENASilentExecutor(use_builtins=False)
+    builtin = SENASilentExecutor()
+
+    modes = [
+        ('subprocess.run', lambda c: (lambda: subprocess.run(c.split(), capture_output=True))),
+        ('os.posix_spawn', lambda c: (lambda: posix_spawn(c.split()))),
+        ('execute (spawn)', lambda c: (lambda: spawned.execute(c, silent=False))),
+        ('execute (builtin)', lambda c: (lambda: builtin.execute(c, silent=False))),
+    ]
+
+    print(f"{calls} calls per cell, microseconds per call")
+    print(f"{'Mode':<20}" + ''.join(f"{c.split()[0] + (' -l' if c.startswith('wc') else ''):>12}"
+                                    for c in commands))
+    for name, make in modes:
+        print(f"{name:<20}" + ''.join(f"{per_call_us(calls, make(c)):>12.0f}" for c in commands))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Tests for the OfflineSync binary change codec
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'archive' / 'experimental'))
+
+from offline_change_codec import (ChangeDecoder, ChangeEncoder, decode_changes, encode_changes,
+                                  make_change_id)
+
+
+def change(author, clock, key='k', operation='update', value=None, change_id=None, **extra):
+    return {
+        'id': change_id or make_change_id(author, clock.get(author, 0)),
+        'timestamp': 1760000000.123456 + clock.get(author, 0),
+        'operation': operation,
+        'collection': extra.get('collection', 'default'),
+        'key': key,
+        'value': value,
+        'author': author,
+        'vector_clock': clock,
+    }
+
+
+CHANGES = [
+    change('a', {'a': 1}, value={'theme': 'dark'}),
+    change('a', {'a': 2}, key='ü.key', value=[1, 'two', None]),
+    change('b', {'a': 2, 'b': 1}, operation='delete'),
+    # Counters may go down (a remote change with an older clock) and entries may disappear
+    change('c', {'c': 400, 'b': 1}, value='x' * 300, collection='settings'),
+    change('a', {'a': 3}, value=0, operation='create'),
+    change('a', {'a': 2 ** 40}, value=False),
+]
+
+
+def test_round_trip_and_size():
+    """Test every field survives encoding, including clock decreases, dropped entries and large counters"""
+    data = encode_changes(CHANGES)
+    assert decode_changes(data) == CHANGES
+    assert len(data) < sum(len(json.dumps(c)) for c in CHANGES) / 2
+
+
+def test_legacy_ids_are_kept():
+    """Test ids that are not (author, counter) are stored explicitly"""
+    legacy = [change('a', {'a': 1}, change_id='0123456789abcdef', value=1), change('a', {'a': 2}, value=2)]
+    data = encode_changes(legacy)
+    decoded = decode_changes(data)
+    assert [c['id'] for c in decoded] == ['0123456789abcdef', 'a:2']
+    assert b'0123456789abcdef' in data and b'a:2' not in data
+
+
+def test_truncated_stream_resumes_at_record_boundary():
+    """Test a torn final record is left unconsumed and the stream continues after it"""
+    encoder = ChangeEncoder()
+    parts = [encoder.encode(c) for c in CHANGES[:4]]
+    data = b''.join(parts)
+    torn = data[:-5]
+
+    decoder = ChangeDecoder()
+    decoded, consumed = decoder.decode(torn)
+    # Table records ahead of the torn change are complete and consumed
+    assert decoded == CHANGES[:3]
+    assert len(data) - len(parts[-1]) < consumed < len(torn)
+
+    resumed = decoder.encoder()
+    log = torn[:consumed] + b''.join(resumed.encode(c) for c in CHANGES[3:])
+    assert decode_changes(log) == CHANGES
+    with pytest.raises(ValueError):
+        decode_changes(torn)
+
+
+def test_invalid_input_is_rejected():
+    """Test bad magic and unknown operations raise, and a failed encode leaves the stream usable"""
+    with pytest.raises(ValueError):
+        ChangeDecoder().decode(b'{"id": 1}\n')
+    encoder = ChangeEncoder()
+    with pytest.raises(ValueError):
+        encoder.encode(change('a', {'a': 1}, operation='merge'))
+    with pytest.raises(TypeError):
+        encoder.encode(change('new-author', {'new-author': 1}, key='new-key', value=object()))
+    data = b''.join(encoder.encode(c) for c in CHANGES)
+    assert decode_changes(data) == CHANGES
+
+
+@pytest.mark.parametrize('corrupt', [
+    lambda data, tail: data + b'\x7f\x01\x00',                  # unknown record tag
+    lambda data, tail: data + tail.replace(b'"two"', b'"tw\x00"'),  # bad value JSON
+    # Change record whose author index is past the author table
+    lambda data, tail: data + b'\x03\x0c\x00\x7f\x00' + bytes(8) + b'\x00\x00' + tail,
+])
+def test_corrupt_record_stops_decoding_at_last_good_record(corrupt):
+    """Test a malformed record is reported in error and the decoder resumes before it"""
+    encoder = ChangeEncoder()
+    data = b''.join(encoder.encode(c) for c in CHANGES[:1])
+    tail = encoder.encode(CHANGES[1])
+
+    decoder = ChangeDecoder()
+    damaged = corrupt(data, tail)
+    decoded, consumed = decoder.decode(damaged)
+    assert decoder.error and 'Corrupt record' in decoder.error
+    # Table records ahead of the bad change may be kept
+    assert decoded == CHANGES[:1] and len(data) <= consumed < len(data) + len(tail)
+    with pytest.raises(ValueError):
+        decode_changes(damaged)
+
+    # The stream continues from the last good record
+    resumed = decoder.encoder()
+    log = damaged[:consumed] + b''.join(resumed.encode(c) for c in CHANGES[1:])
+    assert decode_changes(log) == CHANGES
@@ -0,0 +1,144 @@
+"""
+Tests for the OfflineSync group-commit change log
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'archive' / 'experimental'))
+
+from offline_change_codec import ChangeDecoder, ChangeEncoder, decode_changes, make_change_id
+from offline_change_log import GroupCommitLog
+
+
+class FailingFile:
+    """Wraps the log's file; write() writes a few bytes, then raises ENOSPC while failing"""
+
+    def __init__(self, file):
+        self.file = file
+        self.failing = True
+
+    def write(self, data):
+        if self.failing:
+            self.file.write(data[:3])
+            raise OSError(28, 'No space left on device')
+        return self.file.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+
+def test_concurrent_appends_share_commits(tmp_path):
+    """Test records appended during the group window are written together, in order per thread"""
+    log = GroupCommitLog(tmp_path / 'changes.log', durability='flush', flush_interval=0.02)
+    barrier = threading.Barrier(8)
+
+    def writer(n):
+        barrier.wait()
+        tickets = [log.append(f'{n}:{i}\n'.encode()) for i in range(50)]
+        assert all(ticket.wait(5) for ticket in tickets)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = log.get_stats()
+    log.close()
+
+    lines = (tmp_path / 'changes.log').read_text().splitlines()
+    assert len(lines) == 400 and stats['records'] == 400
+    assert stats['records_per_commit'] > 1
+    for n in range(8):
+        assert [line for line in lines if line.startswith(f'{n}:')] == [f'{n}:{i}' for i in range(50)]
+
+
+@pytest.mark.parametrize('durability, fsyncs', [('none', False), ('flush', False), ('fsync', True)])
+def test_durability_levels(tmp_path, durability, fsyncs):
+    """Test only fsync durability fsyncs, and every level commits what it was given"""
+    log = GroupCommitLog(tmp_path / 'changes.log', durability=durability, flush_interval=0.0)
+    for i in range(20):
+        assert log.append(b'record\n').wait(5)
+    stats = log.get_stats()
+    log.close()
+
+    assert (tmp_path / 'changes.log').read_bytes() == b'record\n' * 20
+    assert (stats['fsyncs'] == stats['commits']) if fsyncs else stats['fsyncs'] == 0
+    assert stats['write_amplification'] >= 1.0
+
+
+def test_close_commits_open_batch_and_rejects_appends(tmp_path):
+    """Test close() writes records still inside a long group window"""
+    log = GroupCommitLog(tmp_path / 'changes.log', durability='none', flush_interval=60)
+    ticket = log.append(b'pending\n')
+    log.close()
+
+    assert ticket.committed
+    assert (tmp_path / 'changes.log').read_bytes() == b'pending\n'
+    with pytest.raises(ValueError):
+        log.append(b'late\n')
+    with pytest.raises(ValueError):
+        GroupCommitLog(tmp_path / 'other.log', durability='sometimes')
+
+
+def test_failed_write_stops_commits_until_truncate(tmp_path):
+    """Test a write error fails its batch and later ones, drops the partial write, and truncate() resumes"""
+    log = GroupCommitLog(tmp_path / 'changes.log', durability='fsync', flush_interval=0.0)
+    log.append(b'first\n').wait(5)
+    log._file = FailingFile(log._file)
+
+    failed = log.append(b'lost record\n')
+    assert failed.wait(5) is False and not failed.committed
+    assert isinstance(failed.error, OSError) and log.failed is failed.error
+
+    # Later records may depend on the lost ones, so they are not written either
+    log._file.failing = False
+    dependent = log.append(b'dependent\n')
+    assert dependent.wait(5) is False and dependent.error is failed.error
+
+    log.truncate(len(b'first\n'))
+    assert log.failed is None
+    assert log.append(b'second\n').wait(5)
+    assert log.sync(timeout=5)
+    stats = log.get_stats()
+    log.close()
+
+    assert (tmp_path / 'changes.log').read_bytes() == b'first\nsecond\n'
+    assert stats['failed_commits'] == 2 and stats['records'] == 2
+
+
+def test_encoded_stream_recovers_from_failed_commit(tmp_path):
+    """Test re-encoding lost changes from the file's decoder state keeps the binary log readable"""
+    def change(author, counter, key):
+        return {'id': make_change_id(author, counter), 'timestamp': float(counter), 'operation': 'update',
+                'collection': 'default', 'key': key, 'value': counter, 'author': author,
+                'vector_clock': {author: counter}}
+
+    changes = [change('a', 1, 'k1'), change('b', 1, 'k2'), change('b', 2, 'k3')]
+    path = tmp_path / 'change_log.bin'
+    log = GroupCommitLog(path, durability='flush', flush_interval=0.0)
+    encoder = ChangeEncoder()
+    assert log.append(encoder.encode(changes[0])).wait(5)
+
+    # The lost record carried the 'b' and 'k2' table entries the next one refers to
+    log._file = FailingFile(log._file)
+    assert not log.append(encoder.encode(changes[1])).wait(5)
+    log._file.failing = False
+    assert not log.append(encoder.encode(changes[2])).wait(5)
+
+    # Recover as OfflineSync does: decode the file, truncate, re-append what it lacks
+    decoder = ChangeDecoder()
+    decoded, consumed = decoder.decode(path.read_bytes())
+    log.truncate(consumed)
+    encoder = decoder.encoder()
+    written = {c['id'] for c in decoded}
+    for lost in changes:
+        if lost['id'] not in written:
+            log.append(encoder.encode(lost))
+    assert log.sync(timeout=5)
+    log.close()
+
+    assert decode_changes(path.read_bytes()) == changes
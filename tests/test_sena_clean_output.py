@@ -0,0 +1,86 @@
+"""
+Tests for SENA Clean Output
+"""
+
+import io
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'controller'))
+
+from sena_clean_output_100 import SENACleanOutput100, SENACleanOutputStream, filter_stream, run_filter
+
+
+def test_should_filter_line():
+    """Test combined line filter matches every pattern family"""
+    cleaner = SENACleanOutput100()
+    assert cleaner.should_filter_line("⏺ Bash(ls -la)")
+    assert cleaner.should_filter_line("  Read(file.txt)")
+    assert cleaner.should_filter_line("TOOL RAN WITHOUT OUTPUT")
+    assert not cleaner.should_filter_line("Bash is a shell")
+    assert not cleaner.should_filter_line("   ")
+
+
+def test_process_output_single_pass():
+    """Test buffer filter removes tool traces and thinking blocks"""
+    cleaner = SENACleanOutput100()
+    text = "⏺ Bash(ls)\nkeep me\n<thinking>\nhidden\n</thinking>\n\n\n\nLet me check\nlast line"
+    assert cleaner.process_output(text) == "keep me\n\nlast line"
+
+
+def test_buffer_filter_does_not_span_lines():
+    """Test buffer patterns stay within a single line"""
+    cleaner = SENACleanOutput100()
+    text = "⏺\nBash(ls)\nLet me\nstay"
+    assert cleaner.filter_lines(text) == "⏺\nLet me\nstay"
+
+
+def test_stream_matches_batch_output():
+    """Test streaming filter emits the batch result regardless of chunking"""
+    cleaner = SENACleanOutput100()
+    text = (
+        "\n  intro\n⏺ Read(a.txt)\nkeep<thinking>\nsecret\n</thinking> this\n\n\n\n"
+        "Tool ran without output\nI'll check\nfinal line\n\n"
+    )
+    for size in (1, 3, 7, len(text)):
+        stream = SENACleanOutputStream(cleaner)
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        output = ''.join(stream.feed(chunk) for chunk in chunks) + stream.close()
+        assert output == cleaner.process_output(text)
+
+
+def test_stream_emits_completed_lines_immediately():
+    """Test streaming filter does not wait for the end of input"""
+    stream = SENACleanOutputStream()
+    assert stream.feed("first line\n⏺ Bash(ls)\nsec") == "first line"
+    assert stream.feed("ond <think") == ""
+    assert stream.feed("ing>hidden</thinking>\n") == "\nsecond"
+    assert stream.close() == ""
+
+
+def test_stream_bounds_long_lines():
+    """Test overlong lines are decided early instead of buffered"""
+    stream = SENACleanOutputStream(max_line_length=8)
+    assert stream.feed("abcdefghij") == "abcdefghij"
+    assert stream.feed("klm\n") == "klm"
+    assert stream.feed("⏺ Bash(" + "x" * 20) == ""
+    assert stream.feed("y\nend") == ""
+    assert stream.close() == "\nend"
+
+
+def test_filter_stream_pipe():
+    """Test pipe filter mode over small blocks with undecodable bytes"""
+    infile = io.BytesIO("⏺ Bash(ls)\nhello\n".encode('utf-8') + b"\xff raw\nLet me see\nbye")
+    outfile = io.BytesIO()
+    written = filter_stream(infile, outfile, block_size=3)
+    assert outfile.getvalue() == b"hello\n\xff raw\nbye\n"
+    assert written == len(outfile.getvalue())
+
+
+def test_run_filter_rejects_bad_block_size(capsys):
+    """Test a missing, non-numeric or non-positive --block-size is a usage error, not a traceback"""
+    for argv in (['--filter', '--block-size'], ['--filter', '--block-size', 'big'],
+                 ['--filter', '--block-size', '0']):
+        assert run_filter(argv) == 2
+        captured = capsys.readouterr()
+        assert captured.out == '' and 'Usage:' in captured.err
@@ -0,0 +1,110 @@
+"""
+Tests for SENA Command History
+"""
+
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'controller'))
+
+from sena_command_history import CommandHistoryStore, open_history_store
+from sena_silent_executor import SENASilentExecutor
+
+
+def test_history_queries_by_name_exit_code_and_time(tmp_path):
+    """Test filtered queries and persistence across reopening"""
+    path = tmp_path / 'history.db'
+    store = CommandHistoryStore(path)
+    now = time.time()
+    store.record('git status', 0, 3.5, timestamp=now - 7200)
+    store.record('git log', 128, 2.0, timestamp=now - 60)
+    store.record('ls -la', 0, 1.0, timestamp=now - 30)
+    store.record('grep foo bar.txt', 1, timestamp=now)
+
+    assert [row['command'] for row in store.query(name='git')] == ['git log', 'git status']
+    assert [row['command'] for row in store.query(exit_code=0)] == ['ls -la', 'git status']
+    recent = store.query(since=now - 3600, until=now - 10)
+    assert [row['command'] for row in recent] == ['ls -la', 'git log']
+    assert recent[1]['success'] is False and recent[1]['duration_ms'] == 2.0
+    store.close()
+
+    reopened = CommandHistoryStore(path)
+    assert len(reopened.query(limit=10)) == 4
+    reopened.close()
+
+    conn = sqlite3.connect(path)
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    plan = ' '.join(row[3] for row in conn.execute(
+        'EXPLAIN QUERY PLAN SELECT * FROM commands WHERE name = ? AND ts >= ?', ('git', 0)))
+    assert 'commands_name_ts' in plan
+    conn.close()
+
+
+def test_history_prunes_to_max_rows(tmp_path):
+    """Test old rows are deleted once max_rows is exceeded"""
+    store = CommandHistoryStore(tmp_path / 'history.db', max_rows=100)
+    for i in range(600):
+        store.record(f'echo {i}', 0)
+    rows = store.query(limit=1000)
+    store.close()
+
+    assert 100 <= len(rows) < 600
+    assert rows[0]['command'] == 'echo 599'
+
+
+def test_executor_writes_history_off_the_call_path(tmp_path, monkeypatch):
+    """Test executed commands (spawned and builtin) reach the on-disk history"""
+    # 'ls missing' must fail: run where nothing else exists
+    monkeypatch.chdir(tmp_path)
+    store = CommandHistoryStore(tmp_path / 'history.db')
+    executor = SENASilentExecutor(history_store=store)
+    executor.execute('echo one')
+    executor.execute('pwd')
+    executor.execute('ls missing')
+
+    assert [row['name'] for row in executor.query_history()] == ['ls', 'pwd', 'echo']
+    failed = executor.query_history(exit_code=2)
+    assert len(failed) == 1 and failed[0]['duration_ms'] > 0
+    store.close()
+
+
+def test_writer_survives_failed_transactions_and_close_is_final(tmp_path):
+    """Test a failing insert drops its batch without stopping the writer, and closed stores raise"""
+    path = tmp_path / 'history.db'
+    store = CommandHistoryStore(path)
+    conn = sqlite3.connect(path)
+    conn.execute('ALTER TABLE commands RENAME TO moved')
+    conn.commit()
+
+    store.record('echo lost', 0)
+    assert store.flush(timeout=5) is True
+    assert store.errors == 1 and 'commands' in store.last_error
+
+    conn.execute('ALTER TABLE moved RENAME TO commands')
+    conn.commit()
+    conn.close()
+    store.record('echo kept', 0)
+    assert [row['command'] for row in store.query()] == ['echo kept']
+
+    store.close()
+    with pytest.raises(ValueError):
+        store.query()
+    with pytest.raises(ValueError):
+        store.record('echo late', 0)
+
+
+def test_unopenable_database_falls_back_to_memory_history(tmp_path):
+    """Test a database that cannot be set up yields no store instead of raising"""
+    path = tmp_path / 'history.db'
+    path.write_bytes(b'not a sqlite database' * 100)
+    with pytest.raises(sqlite3.Error):
+        CommandHistoryStore(path)
+
+    assert open_history_store(path) is None
+    executor = SENASilentExecutor(history_store=open_history_store(path))
+    executor.execute('echo one')
+    assert [entry['command'] for entry in executor.query_history()] == ['echo one']
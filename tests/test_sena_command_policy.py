@@ -0,0 +1,104 @@
+"""
+Tests for SENA Command Policy
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'controller'))
+
+from sena_command_policy import CommandPolicy
+from sena_silent_executor import SENASilentExecutor
+
+
+@pytest.fixture(scope='module')
+def policy():
+    return CommandPolicy(SENASilentExecutor().safe_commands)
+
+
+@pytest.mark.parametrize('command, rule', [
+    ('git status --short', 'git.allow'),
+    ('git push origin main', 'git.allow'),
+    ('git commit -c HEAD', 'git.allow'),
+    ('rm -rf build/tmp', 'rm.allow'),
+    ('python3 script.py -c config.json', 'python3.allow'),
+    ('cat executor_format.log', 'cat.allow'),
+    ('git -c core.pager=sh log', 'git.forbidden-option'),
+    ('git push --force-with-lease origin', 'git.forbidden-option'),
+    ('git push --forc origin', 'git.forbidden-option'),
+    ('git diff --output-indicator-new=+', 'git.allow'),
+    ('git rebase -i HEAD~3', 'git.subcommand'),
+    # Values of global options are not the subcommand, and options after them are still checked
+    ('git --namespace status -c core.fsmonitor=CMD status', 'git.forbidden-option'),
+    ('git -C status -c core.fsmonitor=CMD status', 'git.forbidden-option'),
+    ('git --git-dir status -c core.fsmonitor=CMD status', 'git.forbidden-option'),
+    ('git --namespace push --exec-path=/tmp push', 'git.forbidden-option'),
+    ('git --work-tree diff --config-env=x diff', 'git.forbidden-option'),
+    ('git -C status push --force', 'git.forbidden-option'),
+    ('git -C sub --no-pager status', 'git.allow'),
+    ('git --git-dir=.git log', 'git.allow'),
+    ('git --frobnicate status', 'git.unknown-option'),
+    ('git push --exec=/tmp/evil origin', 'git.forbidden-option'),
+    ('git push --receive-pack=/tmp/evil origin', 'git.forbidden-option'),
+    ('git fetch --upload-pack=/tmp/evil origin', 'git.forbidden-option'),
+    ('git pull --upload-pa=/tmp/evil origin', 'git.forbidden-option'),
+    ('git grep -O/tmp/evil foo', 'git.forbidden-option'),
+    ('git grep --open-files-in-pager=vi foo', 'git.forbidden-option'),
+    ('git push origin +main', 'git.push-refspec'),
+    ('git push origin :old-branch', 'git.push-refspec'),
+    ('git push origin main:main', 'git.allow'),
+    ('rm -fr /', 'rm.protected-target'),
+    ('rm --recursive ~/', 'rm.protected-target'),
+    ('rm -r src/..', 'rm.protected-target'),
+    ('rm -rf /usr', 'rm.protected-target'),
+    ('rm -rf //', 'rm.protected-target'),
+    ('rm -rf /home/x/..', 'rm.protected-target'),
+    ('rm -rf ../sibling', 'rm.protected-target'),
+    ('rm -rf build//out', 'rm.allow'),
+    ('rm /tmp/file.txt', 'rm.allow'),
+    ('chmod -R 755 /etc', 'chmod.protected-target'),
+    ('mv //* backup', 'mv.protected-target'),
+    ('find . -name x -execdir ls', 'find.forbidden-option'),
+    ('python3 -Bc pass', 'python3.forbidden-option'),
+    ('python3 -W ignore -c "import os"', 'python3.forbidden-option'),
+    ('python3 -X dev -c pass', 'python3.forbidden-option'),
+    ('python3 -BWignore -c pass', 'python3.forbidden-option'),
+    ('python3 -W ignore script.py -c config.json', 'python3.allow'),
+    ('python3 -m pytest -c setup.cfg', 'python3.allow'),
+    ('python3 --frobnicate script.py', 'python3.unknown-option'),
+    ('sort -ro out.txt in.txt', 'sort.forbidden-option'),
+    ('ls && whoami', 'shell-syntax'),
+    ('echo "unterminated', 'syntax'),
+    ('curl http://example.com', 'not-whitelisted'),
+    ('   ', 'empty'),
+])
+def test_policy_reports_matched_rule(policy, command, rule):
+    """Test each command is decided by the expected rule"""
+    decision = policy.evaluate(command)
+    assert decision.rule == rule
+    assert decision.allowed == rule.endswith('.allow')
+
+
+def test_recursive_rm_is_confined_to_working_directory(policy, tmp_path, monkeypatch):
+    """Test absolute targets are allowed inside the working directory and decisions track cwd"""
+    monkeypatch.chdir(tmp_path)
+    assert policy.evaluate(f'rm -rf {tmp_path}/build').allowed
+    assert not policy.evaluate(f'rm -rf {tmp_path}').allowed
+
+    monkeypatch.chdir(tmp_path.parent)
+    assert policy.evaluate(f'rm -rf {tmp_path}/build').allowed
+    assert not policy.evaluate(f'rm -rf {tmp_path.parent}').allowed
+
+
+def test_executor_reports_blocking_rule():
+    """Test blocked commands carry the rule and parsed commands reuse the policy argv"""
+    executor = SENASilentExecutor()
+    blocked = executor.execute('git -c alias.x=!sh x')
+    assert blocked['security_blocked'] is True and blocked['rule'] == 'git.forbidden-option'
+    blocked = executor.execute('git --namespace status -c "core.fsmonitor=touch pwned" status')
+    assert blocked['security_blocked'] is True and blocked['rule'] == 'git.forbidden-option'
+
+    result = executor.execute("echo 'two words'", silent=False)
+    assert result['stdout'] == 'two words\n'
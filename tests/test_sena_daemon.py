@@ -0,0 +1,109 @@
+"""
+Tests for SENA Daemon request handling
+"""
+
+import importlib
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'controller'))
+
+
+@pytest.fixture(scope='module')
+def daemon(tmp_path_factory):
+    """Daemon instance with its socket, PID and log files under a temporary HOME"""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv('HOME', str(tmp_path_factory.mktemp('home')))
+        sys.modules.pop('sena_daemon', None)
+        sena_daemon = importlib.import_module('sena_daemon')
+        sena_daemon.REGISTRY.clear()
+        yield sena_daemon.SENADaemon()
+
+
+def test_requests_are_measured(daemon):
+    """Test every method call is counted and timed, and stats exposes it"""
+    for _ in range(3):
+        response = daemon._handle_request({'method': 'detect_format', 'params': {'user_input': 'table'}, 'id': 1})
+        assert 'result' in response
+    daemon._handle_request({'method': 'bogus', 'id': 2})
+
+    stats = daemon._handle_request({'method': 'stats', 'id': 3})['result']
+    metrics = stats['metrics']
+
+    requests = {(s['labels']['method'], s['labels']['outcome']): s['value']
+                for s in metrics['sena_daemon_requests_total']['series']}
+    assert requests[('detect_format', 'ok')] == 3
+    assert requests[('unknown', 'not_found')] == 1
+
+    latency = {s['labels']['method']: s for s in metrics['sena_daemon_request_seconds']['series']}
+    assert latency['detect_format']['count'] == 3
+    assert 0 < latency['detect_format']['p50'] <= latency['detect_format']['p99']
+    assert metrics['sena_daemon_uptime_seconds']['series'][0]['value'] >= 0
+    assert stats['requests_by_type']['detect_format'] == 3
+
+
+def test_metrics_method_returns_openmetrics(daemon):
+    """Test the metrics method renders the registry as OpenMetrics text"""
+    daemon.exporter.min_interval = 0
+    daemon._handle_request({'method': 'health_check', 'id': 1})
+    result = daemon._handle_request({'method': 'metrics', 'id': 2})['result']
+
+    assert result['content_type'].startswith('application/openmetrics-text')
+    assert 'sena_daemon_requests_total{method="health_check",outcome="ok"} 1' in result['text']
+    assert result['text'].endswith('# EOF\n')
+
+
+def test_requests_are_logged_as_json(daemon):
+    """Test each request produces a JSON log line with id, method and latency"""
+    import sena_daemon
+
+    daemon._handle_request({'method': 'check_always_on', 'id': 42})
+    sena_daemon.LOG_LISTENER.stop()
+    sena_daemon.LOG_LISTENER.start()
+
+    entries = [json.loads(line) for line in sena_daemon.LOG_FILE.read_text().splitlines()]
+    entry = [e for e in entries if e.get('method') == 'check_always_on'][-1]
+    assert entry['message'] == 'request'
+    assert entry['rpc_id'] == 42 and entry['outcome'] == 'ok'
+    assert entry['latency_ms'] >= 0 and entry['request_id'] >= 1
+
+
+def test_trace_id_propagates_to_formatter(daemon, tmp_path, monkeypatch):
+    """Test a request trace id reaches the formatter span"""
+    import sena_daemon
+    from sena_tracing import Tracer, load_trace
+
+    tracer = Tracer(tmp_path / 'trace.json')
+    monkeypatch.setattr(sena_daemon, 'TRACER', tracer)
+    daemon._handle_request({'method': 'detect_format', 'params': {'user_input': 'table'},
+                            'id': 1, 'trace_id': 'hook-1'})
+    daemon._handle_request({'method': 'detect_format', 'params': {'user_input': 'table'}, 'id': 2})
+    daemon._trace_stages('hook-1', 'detect_format', 0, 10, 20, 30, 40)
+
+    events = {event['name']: event for event in load_trace(tmp_path / 'trace.json')}
+    assert set(events) == {'daemon.handle', 'formatter.detect_format_needed', 'daemon.request',
+                           'daemon.recv', 'daemon.parse', 'daemon.send'}
+    assert all(event['args']['trace_id'] == 'hook-1' for event in events.values())
+    assert events['formatter.detect_format_needed']['args']['parent'] == 'daemon.handle'
+
+
+def test_profile_method_runs_in_background(daemon, tmp_path, monkeypatch):
+    """Test the profile method returns at once and writes a collapsed-stack file"""
+    import sena_daemon
+
+    output = tmp_path / 'daemon.folded'
+    monkeypatch.setattr(sena_daemon, 'default_output', lambda: output)
+
+    started = daemon._handle_request({'method': 'profile', 'params': {'seconds': 30, 'interval_ms': 2}, 'id': 1})
+    assert started['result']['running'] is True
+    assert 'error' in daemon._handle_request({'method': 'profile', 'id': 2})
+
+    for _ in range(200):
+        daemon._handle_request({'method': 'detect_format', 'params': {'user_input': 'make a table'}, 'id': 3})
+
+    stopped = daemon._handle_request({'method': 'profile', 'params': {'action': 'stop'}, 'id': 4})['result']
+    assert stopped['running'] is False and stopped['output'] == str(output)
+    assert output.exists()
@@ -0,0 +1,46 @@
+"""
+Tests for SENA Logging
+"""
+
+import json
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'controller'))
+
+import sena_logging
+from sena_logging import setup_async_logging
+
+
+def test_json_lines_with_extras(tmp_path):
+    """Test records are written as JSON with extra fields as keys"""
+    logger = logging.getLogger('sena_test_json')
+    listener = setup_async_logging(tmp_path / 'sena.log', logger, console=False)
+    logger.info('request', extra={'request_id': 7, 'method': 'stats', 'latency_ms': 0.25})
+    try:
+        raise ValueError('boom')
+    except ValueError:
+        logger.exception('failed')
+    listener.stop()
+
+    first, second = [json.loads(line) for line in (tmp_path / 'sena.log').read_text().splitlines()]
+    assert first['message'] == 'request'
+    assert (first['request_id'], first['method'], first['latency_ms']) == (7, 'stats', 0.25)
+    assert first['level'] == 'INFO' and first['logger'] == 'sena_test_json'
+    assert 'ValueError: boom' in second['message']
+
+
+def test_log_file_rotates_by_size(tmp_path, monkeypatch):
+    """Test the log file rotates once it reaches the size limit"""
+    monkeypatch.setattr(sena_logging, 'LOG_MAX_BYTES', 2000)
+    monkeypatch.setattr(sena_logging, 'LOG_BACKUPS', 2)
+    logger = logging.getLogger('sena_test_rotate')
+    listener = setup_async_logging(tmp_path / 'sena.log', logger, console=False)
+    for i in range(200):
+        logger.info('line %d', i)
+    listener.stop()
+
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert files == ['sena.log', 'sena.log.1', 'sena.log.2']
+    assert all(p.stat().st_size <= 2000 for p in tmp_path.iterdir())
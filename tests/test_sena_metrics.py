@@ -0,0 +1,199 @@
+"""
+Tests for SENA Metrics
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'controller'))
+
+import sena_metrics
+from sena_metrics import (
+    PROBE_WORKERS,
+    HealthSnapshotCache,
+    SourceMetricsStore,
+    _has_version_marker,
+    check_sena_config,
+    get_phase_status,
+    get_test_results,
+    run_probes,
+)
+
+
+def _counting_compute(paths):
+    """Compute function that records how often it runs"""
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"present": sum(1 for p in paths if p.exists())}
+
+    return compute, calls
+
+
+def test_health_snapshot_served_from_cache(tmp_path):
+    """Test snapshot is computed once and refreshed on change"""
+    paths = [tmp_path / 'memory' / 'patterns.md']
+    compute, calls = _counting_compute(paths)
+    cache = HealthSnapshotCache(compute, paths)
+
+    assert cache.get()["present"] == 0
+    assert cache.get()["present"] == 0
+    assert len(calls) == 1
+
+    paths[0].parent.mkdir()
+    paths[0].write_text('patterns')
+    assert cache.get(max_staleness=0)["present"] == 1
+    assert len(calls) == 2
+
+
+def test_health_snapshot_polling_detects_change(tmp_path):
+    """Test the stat polling backend notices modified files"""
+    paths = [tmp_path / 'VERSION']
+    compute, calls = _counting_compute(paths)
+    cache = HealthSnapshotCache(compute, paths)
+    cache.watcher.close()
+    cache.watcher._libc = None
+
+    cache.get()
+    paths[0].write_text('3.3.1')
+    assert cache.get(max_staleness=60)["present"] == 0
+    assert cache.get(max_staleness=0.0001)["present"] == 1
+    assert cache.get()["cache"]["backend"] == "poll"
+
+
+def test_version_marker_cached_by_signature(tmp_path):
+    """Test marker lookups reuse results until the file changes"""
+    source = tmp_path / 'module.py'
+    source.write_text('"""Module - v3.3.1"""\n' + 'x = 1\n' * 50000)
+    assert _has_version_marker(source)
+
+    source.write_text('"""Module - v3.5.0"""\n')
+    assert not _has_version_marker(source)
+
+
+def test_source_metrics_reread_only_changed(tmp_path):
+    """Test line counts are cached per file signature"""
+    (tmp_path / 'sena_a.py').write_text('a = 1\nb = 2\n')
+    (tmp_path / 'sena_b.py').write_text('c = 3')
+    (tmp_path / 'other.py').write_text('ignored\n')
+
+    store = SourceMetricsStore()
+    assert store.totals(tmp_path) == (2, 3)
+    assert store.totals(tmp_path) == (2, 3)
+    assert store.reads == 2
+
+    (tmp_path / 'sena_b.py').write_text('c = 3\nd = 4\ne = 5\n')
+    (tmp_path / 'auto_integration.py').write_text('x\n')
+    assert store.totals(tmp_path) == (3, 6)
+    assert store.reads == 4
+
+    (tmp_path / 'sena_a.py').unlink()
+    assert store.totals(tmp_path) == (2, 4)
+
+
+def test_test_results_from_junit_report(tmp_path):
+    """Test results come from the junit report, one suite per module"""
+    report = tmp_path / 'results.xml'
+    report.write_text(
+        '<testsuites><testsuite name="pytest">'
+        '<testcase classname="tests.test_sena_metrics" name="a" time="0.5"/>'
+        '<testcase classname="tests.test_sena_metrics" name="b" time="0.25"><failure/></testcase>'
+        '<testcase classname="tests.test_server" name="c"><skipped/></testcase>'
+        '</testsuite></testsuites>'
+    )
+    results = get_test_results(report)
+    assert results["test_suites"]["sena_metrics"]["tests_passing"] == 1
+    assert results["test_suites"]["sena_metrics"]["status"] == "failed"
+    assert results["test_suites"]["sena_metrics"]["seconds"] == 0.75
+    assert results["overall"] == {
+        "tests_passing": 1, "tests_total": 3, "pass_rate": 50.0, "status": "some_failing"
+    }
+
+    assert get_test_results(tmp_path / 'missing.xml')["overall"]["status"] == "no_report"
+
+
+def test_probes_run_concurrently_with_timeout():
+    """Test a hung probe times out without delaying the others"""
+    release = threading.Event()
+
+    def fail():
+        raise ValueError("bad json")
+
+    start = time.monotonic()
+    values, timings = run_probes({
+        "hung": lambda: release.wait(10),
+        "slow": lambda: time.sleep(0.05) or "slow",
+        "fast": lambda: "fast",
+        "broken": fail,
+    }, timeout=0.3)
+    elapsed = time.monotonic() - start
+    release.set()
+
+    assert elapsed < 1.0
+    assert values == {"hung": None, "slow": "slow", "fast": "fast", "broken": None}
+    assert [timings[name]["status"] for name in values] == ["timeout", "ok", "ok", "error"]
+    assert timings["slow"]["ms"] >= 50
+    assert "bad json" in timings["broken"]["error"]
+
+
+def test_queued_probe_gets_its_own_timeout_and_wedged_pool_is_retired():
+    """Test a probe queued behind busy workers is timed from its start, and a hang retires the pool"""
+    probes = {f"busy{i}": lambda: time.sleep(0.2) or "busy" for i in range(PROBE_WORKERS)}
+    probes["queued"] = lambda: time.sleep(0.2) or "queued"
+    values, timings = run_probes(probes, timeout=0.3)
+    assert values["queued"] == "queued" and timings["queued"]["status"] == "ok"
+
+    pool = sena_metrics._probe_executor()
+    release = threading.Event()
+    values, timings = run_probes({"hung": lambda: release.wait(10)}, timeout=0.05)
+    assert timings["hung"]["status"] == "timeout"
+    assert sena_metrics._probe_executor() is not pool
+
+    values, _ = run_probes({"fast": lambda: "fast"}, timeout=0.3)
+    release.set()
+    assert values == {"fast": "fast"}
+
+
+def test_config_check_reports_probes(tmp_path, monkeypatch):
+    """Test config check reads settings through probes"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    (tmp_path / '.claude').mkdir()
+    (tmp_path / '.claude' / '.sena_always_on').touch()
+    (tmp_path / '.claude' / 'settings.json').write_text('{"hooks": {"userPromptSubmit": []}}')
+
+    config = check_sena_config()
+    assert config["modes"]["always_on"] is True
+    assert config["hooks"]["user_prompt_submit"] is True
+    assert set(config["probes"]) == {"always_on", "clean_output_100", "auto_progress_100", "settings"}
+
+    (tmp_path / '.claude' / 'settings.json').write_text('{broken')
+    assert check_sena_config()["settings"]["error"] == "Failed to parse settings.json"
+
+
+def test_config_check_rejects_non_object_settings(tmp_path, monkeypatch):
+    """Test settings.json holding valid JSON that is not an object is reported, not raised"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    (tmp_path / '.claude').mkdir()
+    for text in ('[1, 2]', '"hooks"', 'null'):
+        (tmp_path / '.claude' / 'settings.json').write_text(text)
+        assert check_sena_config()["settings"]["hooks_configured"] is False
+
+    (tmp_path / '.claude' / 'settings.json').write_text('{"hooks": ["userPromptSubmit"]}')
+    assert check_sena_config()["hooks"] == {"user_prompt_submit": False, "assistant_response_submit": False}
+
+
+def test_phase_status_counts_mcp_servers_only_from_an_object(tmp_path, monkeypatch):
+    """Test a .mcp.json of the wrong shape counts no servers instead of raising"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    (tmp_path / '.claude').mkdir()
+    mcp_config = tmp_path / '.claude' / '.mcp.json'
+
+    for text, servers in (('[1, 2]', 0), ('{"mcpServers": 5}', 0), ('{"mcpServers": ["a"]}', 0),
+                          ('{"mcpServers": {"a": {}, "b": {}}}', 2)):
+        mcp_config.write_text(text)
+        phase2 = get_phase_status()["phases"]["phase2_access_expansion"]
+        assert phase2["mcp_servers_configured"] == servers
+        assert phase2["status"] == "in_progress"
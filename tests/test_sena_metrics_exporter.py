@@ -0,0 +1,61 @@
+"""
+Tests for SENA Metrics Exporter
+"""
+
+import sys
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'controller'))
+
+from sena_metrics_exporter import CONTENT_TYPE, OpenMetricsExporter, render_openmetrics, start_http_exporter
+from sena_runtime_metrics import MetricsRegistry
+
+
+def _registry():
+    registry = MetricsRegistry()
+    registry.counter('sena_requests_total', 'Requests "handled"', method='stats').inc(2)
+    registry.gauge('sena_queue_depth').set(1.5)
+    histogram = registry.histogram('sena_request_seconds', 'Latency', method='stats')
+    for seconds in (0.0002, 0.003, 0.003, 20.0):
+        histogram.observe(seconds)
+    return registry
+
+
+def test_render_openmetrics():
+    """Test counter, gauge and histogram exposition"""
+    lines = render_openmetrics(_registry()).splitlines()
+
+    assert '# TYPE sena_requests counter' in lines
+    assert '# HELP sena_requests Requests \\"handled\\"' in lines
+    assert 'sena_requests_total{method="stats"} 2' in lines
+    assert 'sena_queue_depth 1.5' in lines
+    assert 'sena_request_seconds_bucket{method="stats",le="0.00025"} 1' in lines
+    assert 'sena_request_seconds_bucket{method="stats",le="0.005"} 3' in lines
+    assert 'sena_request_seconds_bucket{method="stats",le="10"} 3' in lines
+    assert 'sena_request_seconds_bucket{method="stats",le="+Inf"} 4' in lines
+    assert 'sena_request_seconds_count{method="stats"} 4' in lines
+    assert lines[-1] == '# EOF'
+
+
+def test_exporter_caches_render():
+    """Test scrapes within min_interval reuse the rendered text"""
+    registry = _registry()
+    exporter = OpenMetricsExporter(registry, min_interval=60)
+    first = exporter.render()
+    registry.counter('sena_requests_total', method='stats').inc()
+    assert exporter.render() == first
+    assert exporter.renders == 1
+
+
+def test_http_exporter():
+    """Test /metrics is served over HTTP"""
+    server = start_http_exporter(0, exporter=OpenMetricsExporter(_registry()))
+    try:
+        url = f'http://127.0.0.1:{server.server_address[1]}/metrics'
+        with urllib.request.urlopen(url, timeout=5) as response:
+            assert response.headers['Content-Type'] == CONTENT_TYPE
+            assert response.read().decode('utf-8').endswith('# EOF\n')
+    finally:
+        server.shutdown()
+        server.server_close()
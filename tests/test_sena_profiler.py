@@ -0,0 +1,59 @@
+"""
+Tests for SENA Profiler
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'controller'))
+
+from sena_profiler import MIN_INTERVAL, SamplingProfiler
+
+
+def _spin(seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        sum(i for i in range(200))
+
+
+def test_profiler_writes_collapsed_stacks(tmp_path):
+    """Test samples of the target thread are written as 'stack count' lines"""
+    output = tmp_path / 'profile.folded'
+    profiler = SamplingProfiler(interval=0.002)
+    profiler.start(seconds=0.3, output=output, thread_ids=[threading.get_ident()])
+    _spin(0.5)
+    assert not profiler.running
+
+    lines = output.read_text().splitlines()
+    assert profiler.samples > 10
+    assert sum(int(line.rsplit(' ', 1)[1]) for line in lines) == profiler.samples
+    assert any('_spin (test_sena_profiler.py:' in line for line in lines)
+    assert all(line.split(';')[-1].split(' (')[0] != 'wait' for line in lines)
+
+
+def test_profiler_stop_early_skips_idle_threads(tmp_path):
+    """Test stop() ends sampling and idle threads are not sampled"""
+    release = threading.Event()
+    waiter = threading.Thread(target=release.wait)
+    waiter.start()
+
+    profiler = SamplingProfiler(interval=0.002)
+    profiler.start(seconds=60, output=tmp_path / 'profile.folded', thread_ids=[waiter.ident])
+    time.sleep(0.1)
+    profiler.stop()
+    release.set()
+    waiter.join()
+
+    assert not profiler.running
+    assert profiler.samples == 0 and profiler.idle_samples > 0
+    assert (tmp_path / 'profile.folded').read_text() == ''
+
+
+def test_profiler_clamps_non_positive_interval():
+    """Test an interval of zero or below is raised to MIN_INTERVAL instead of spinning"""
+    assert SamplingProfiler(interval=0).interval == MIN_INTERVAL
+    assert SamplingProfiler(interval=-5).interval == MIN_INTERVAL
+    assert SamplingProfiler(interval=float('nan')).interval == MIN_INTERVAL
+    assert SamplingProfiler(interval=0.002).interval == 0.002
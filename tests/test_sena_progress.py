@@ -0,0 +1,55 @@
+"""
+Tests for SENA Progress Engine
+"""
+
+import io
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'controller'))
+
+from sena_progress_auto_100 import ProgressEngine, SENAProgressAuto100
+
+
+def test_generate_progress_bar_unchanged():
+    """Test cached bar rendering keeps the original format"""
+    progress = SENAProgressAuto100()
+    assert progress.generate_progress_bar(0.0, width=4) == "[🦁░░░]   0%"
+    assert progress.generate_progress_bar(0.5, width=4) == "[█🦁░░]  50%"
+    assert progress.generate_progress_bar(1.0, width=4) == "[███🦁] 100% ✅"
+
+
+def test_engine_renders_only_visible_changes():
+    """Test a large loop triggers few renders and ends complete"""
+    stream = io.StringIO()
+    engine = ProgressEngine(stream=stream, max_refresh=0)
+    task = engine.add_task("Scanning", total=1_000_000)
+
+    for _ in range(1_000_000):
+        task.advance()
+    engine.close()
+
+    # At most one render per percentage or bar cell step, plus the initial frame
+    assert engine.renders <= 100 + 40 + 1
+    assert stream.getvalue().rstrip().endswith("100% ✅")
+
+
+def test_engine_rate_limits_redraws():
+    """Test redraws are coalesced to the refresh rate but completion is drawn"""
+    stream = io.StringIO()
+    with ProgressEngine(stream=stream, max_refresh=0.001) as engine:
+        items = list(engine.track(range(500), "Reading"))
+
+    assert items == list(range(500))
+    assert engine.renders == 2
+    assert "100% ✅" in stream.getvalue()
+
+
+def test_engine_counts_without_total():
+    """Test tasks without a total show a running count"""
+    stream = io.StringIO()
+    with ProgressEngine(stream=stream) as engine:
+        for _ in engine.track(iter(range(1234)), "Streaming"):
+            pass
+
+    assert engine.frame().endswith("1,234 items")
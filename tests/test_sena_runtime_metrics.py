@@ -0,0 +1,109 @@
+"""
+Tests for SENA Runtime Metrics
+"""
+
+import asyncio
+import random
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'controller'))
+
+from sena_runtime_metrics import MetricsRegistry, REGISTRY, _Sharded, bucket_bounds, bucket_index
+
+
+def test_bucket_index_is_monotonic_and_bounded():
+    """Test every value falls inside its bucket and error stays below 1%"""
+    previous = -1
+    for value in list(range(5000)) + [random.randrange(1, 1 << 40) for _ in range(5000)]:
+        index = bucket_index(value)
+        low, high = bucket_bounds(index)
+        assert low <= value <= high
+        assert (high - low) <= max(1, value) / 100
+        if value < 5000:
+            assert index >= previous
+            previous = index
+
+
+def test_histogram_percentiles():
+    """Test percentiles track exact values within bucket precision"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram('latency_seconds', method='a')
+    samples = [random.uniform(0.0001, 0.5) for _ in range(20000)]
+    for sample in samples:
+        histogram.observe(sample)
+
+    samples.sort()
+    summary = histogram.summary()
+    assert summary['count'] == len(samples)
+    for p in (50, 95, 99):
+        exact = samples[int(p / 100 * len(samples)) - 1]
+        assert summary[f'p{p}'] == pytest.approx(exact, rel=0.02)
+    assert summary['max'] == round(samples[-1], 6)
+
+
+def test_registry_labels_and_types():
+    """Test label sets are distinct series and types cannot change"""
+    registry = MetricsRegistry()
+    registry.counter('requests_total', 'Requests', method='a').inc()
+    registry.counter('requests_total', method='a').inc(2)
+    registry.counter('requests_total', method='b').inc()
+    registry.gauge('depth').set_function(lambda: 7)
+
+    snapshot = registry.snapshot()
+    series = snapshot['requests_total']['series']
+    assert snapshot['requests_total']['help'] == 'Requests'
+    assert [(s['labels'], s['value']) for s in series] == [({'method': 'a'}, 3), ({'method': 'b'}, 1)]
+    assert snapshot['depth']['series'][0]['value'] == 7
+
+    with pytest.raises(ValueError):
+        registry.histogram('requests_total', method='a')
+
+
+def test_sharded_recording_across_threads():
+    """Test concurrent recording loses no updates and retires finished threads"""
+    registry = MetricsRegistry()
+    counter = registry.counter('calls_total')
+    histogram = registry.histogram('call_seconds')
+
+    def work():
+        for _ in range(10000):
+            counter.inc()
+            histogram.observe(0.001)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.value == 80000
+    assert histogram.summary()['count'] == 80000
+    assert histogram.summary()['p99'] == pytest.approx(0.001, rel=0.01)
+    assert counter._shards == [] and histogram._shards == []
+
+    class Incomplete(_Sharded):
+        def _new_shard(self):
+            return {}
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_metrics_mcp_tools_are_instrumented():
+    """Test every FastMCP tool call is counted and timed"""
+    from sena_metrics_mcp import mcp
+
+    REGISTRY.clear()
+    asyncio.run(mcp.call_tool('sena_phase_status', {}))
+    with pytest.raises(Exception):
+        asyncio.run(mcp.call_tool('no_such_tool', {}))
+
+    snapshot = REGISTRY.snapshot()
+    calls = {(s['labels']['tool'], s['labels']['outcome']): s['value']
+             for s in snapshot['sena_mcp_tool_calls_total']['series']}
+    assert calls == {('sena_phase_status', 'ok'): 1, ('unknown', 'error'): 1}
+    assert snapshot['sena_mcp_tool_seconds']['series'][0]['count'] == 1
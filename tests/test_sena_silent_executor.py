@@ -0,0 +1,244 @@
+"""
+Tests for SENA Silent Executor
+"""
+
+import asyncio
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'controller'))
+
+from sena_silent_executor import BoundedOutput, SENASilentExecutor
+
+
+@pytest.fixture(scope='module')
+def scripts(tmp_path_factory):
+    """Directory for helper scripts; the policy rejects ';', so no -c one-liners"""
+    return tmp_path_factory.mktemp('scripts')
+
+
+@pytest.fixture(scope='module')
+def sleep_command(scripts):
+    """Whitelisted command that sleeps for the given seconds"""
+    script = scripts / 'sleep.py'
+    script.write_text('import sys, time\ntime.sleep(float(sys.argv[1]))\n')
+    return lambda seconds: f'python3 {script} {seconds}'
+
+
+def test_execute_many_yields_results_as_they_complete(sleep_command):
+    """Test parallel commands finish in completion order, not submission order"""
+    executor = SENASilentExecutor(max_concurrency=4)
+    commands = [sleep_command(0.4), 'echo fast', 'rm -rf / ; echo', 'pwd']
+
+    async def run():
+        return [index async for index, _ in executor.execute_many(commands)]
+
+    start = time.monotonic()
+    order = asyncio.run(run())
+    assert order[-1] == 0 and sorted(order) == [0, 1, 2, 3]
+    assert time.monotonic() - start < 1.5
+
+    results = executor.execute_parallel(commands, silent=False)
+    assert results[1]['stdout'] == 'fast\n'
+    assert results[2]['security_blocked'] is True
+
+
+def test_execute_async_respects_concurrency_limit(sleep_command):
+    """Test no more than max_concurrency commands run at once"""
+    executor = SENASilentExecutor(max_concurrency=2)
+    sleep = sleep_command(0.2)
+
+    start = time.monotonic()
+    results = executor.execute_parallel([sleep] * 4)
+    elapsed = time.monotonic() - start
+
+    assert all(result['success'] for result in results)
+    assert 0.4 <= elapsed < 1.5
+
+
+def test_execute_async_timeout_and_cancellation_kill_the_process(sleep_command):
+    """Test a timed out or cancelled command does not keep running"""
+    executor = SENASilentExecutor()
+    sleep = sleep_command(10)
+
+    result = asyncio.run(executor.execute_async(sleep, timeout=0.2))
+    assert result['success'] is False and 'timed out after 0.2 seconds' in result['error']
+
+    async def cancel_midway():
+        task = asyncio.ensure_future(executor.execute_async(sleep))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return True
+        return False
+
+    start = time.monotonic()
+    assert asyncio.run(cancel_midway()) is True
+    assert time.monotonic() - start < 2
+
+
+def test_get_history_after_async_runs():
+    """Test async commands are recorded and history slicing works"""
+    executor = SENASilentExecutor()
+    executor.execute_parallel(['echo one', 'echo two', 'echo three'])
+
+    history = executor.get_history(limit=2)
+    assert len(history) == 2
+    executor.clear_history()
+    assert executor.get_history() == []
+
+
+def test_bounded_output_keeps_head_and_tail():
+    """Test the middle of a long stream is dropped but counted"""
+    output = BoundedOutput(head_bytes=4, tail_bytes=3)
+    for chunk in (b'ab', b'cdef', b'ghij'):
+        output.write(chunk)
+
+    assert output.total == 10 and output.dropped == 3
+    assert output.getvalue() == 'abcdhij'
+    assert output.write('é'.encode()[:1]) == '' and output.finish() == '\ufffd'
+
+
+def test_stream_bounds_large_output(tmp_path):
+    """Test huge output is reported in full size but streams retain only head/tail"""
+    big = tmp_path / 'big.txt'
+    big.write_bytes(b'x' * (3 * 1024 * 1024 - 4) + b'END\n')
+    executor = SENASilentExecutor(head_bytes=1024, tail_bytes=1024)
+
+    events = list(executor.stream(f'cat {big}'))
+    result = events[-1][1]
+    assert sum(len(data) for name, data in events if name == 'stdout') == 3 * 1024 * 1024
+    assert result['success'] and result['truncated']
+    assert result['stdout_bytes'] == 3 * 1024 * 1024
+    assert result['dropped_bytes'] == 3 * 1024 * 1024 - 2048
+    assert result['stdout'] == 'x' * 1024 + 'x' * 1020 + 'END\n'
+
+    async def run():
+        return [item async for item in executor.execute_stream(f'cat {big}')]
+
+    events = asyncio.run(run())
+    assert sum(len(data) for name, data in events if name == 'stdout') == 3 * 1024 * 1024
+    assert events[-1][0] == 'exit' and events[-1][1]['stdout_bytes'] == 3 * 1024 * 1024
+
+    bounded = SENASilentExecutor(head_bytes=1024, tail_bytes=1024, bound_output=True)
+    assert bounded.execute(f'cat {big}', silent=False)['truncated']
+
+
+def test_execute_captures_full_output(tmp_path):
+    """Test non-streaming calls return large output unmodified by default"""
+    big = tmp_path / 'big.txt'
+    data = ''.join(f'line {i}\n' for i in range(300_000))
+    big.write_text(data)
+    executor = SENASilentExecutor(head_bytes=1024, tail_bytes=1024)
+
+    result = executor.execute(f'cat {big}', silent=False)
+    assert result['stdout'] == data and not result['truncated'] and result['dropped_bytes'] == 0
+    assert executor.execute_with_output(f'cat {big}') == data
+    assert asyncio.run(executor.execute_async(f'cat {big}', silent=False))['stdout'] == data
+    assert executor.execute(f'cat {big}')['output_length'] == len(data)
+
+
+def test_stream_yields_first_chunk_before_exit(scripts):
+    """Test output is delivered while the command is still running"""
+    executor = SENASilentExecutor()
+    script = scripts / 'ticker.py'
+    script.write_text(
+        'import sys, time\nsys.stdout.write("ready\\n")\nsys.stdout.flush()\n'
+        'time.sleep(0.5)\nsys.stdout.write("done\\n")\n'
+    )
+    command = f'python3 {script}'
+
+    start = time.monotonic()
+    events = executor.stream(command)
+    assert next(events) == ('stdout', 'ready\n')
+    assert time.monotonic() - start < 0.4
+    name, result = list(events)[-1]
+    assert name == 'exit' and result['stdout'] == 'ready\ndone\n'
+
+
+def test_builtins_match_coreutils(tmp_path):
+    """Test in-process builtins print exactly what the real commands print"""
+    small, large = tmp_path / 'small.txt', tmp_path / 'large.txt'
+    small.write_text('a b\nc d e\nfoo')
+    large.write_text('x\n' * 20000)
+
+    builtin = SENASilentExecutor()
+    spawned = SENASilentExecutor(use_builtins=False)
+    for command in ['pwd', 'whoami', 'date -u', f'wc -l {small}', f'wc -c {large}',
+                    f'wc -lc {small}', f'wc -l {small} {large}', f'wc -c -l {small} {large}']:
+        assert builtin.execute(command, silent=False)['stdout'] == \
+            spawned.execute(command, silent=False)['stdout'], command
+
+
+def test_builtins_fall_back_to_real_command(tmp_path, monkeypatch):
+    """Test unsupported arguments run the real command"""
+    import sena_silent_executor
+
+    spawned = []
+    real_popen = subprocess.Popen
+    monkeypatch.setattr(sena_silent_executor.subprocess, 'Popen',
+                        lambda *args, **kwargs: spawned.append(args[0]) or real_popen(*args, **kwargs))
+
+    executor = SENASilentExecutor()
+    assert executor.execute('pwd')['success']
+    assert spawned == []
+
+    missing = executor.execute(f'wc -l {tmp_path / "missing"}', silent=False)
+    assert missing['exit_code'] == 1 and 'No such file' in missing['stderr']
+    assert executor.execute('date +%Y', silent=False)['stdout'] == time.strftime('%Y\n')
+    assert [argv[0] for argv in spawned] == ['wc', 'date']
+
+
+def test_cache_reuses_read_only_results_until_inputs_change(tmp_path, monkeypatch):
+    """Test cat is served from cache until the file changes or a write runs"""
+    import sena_silent_executor
+
+    spawned = []
+    real_popen = subprocess.Popen
+    monkeypatch.setattr(sena_silent_executor.subprocess, 'Popen',
+                        lambda *args, **kwargs: spawned.append(args[0]) or real_popen(*args, **kwargs))
+
+    notes = tmp_path / 'notes.txt'
+    notes.write_text('one\n')
+    executor = SENASilentExecutor(cache_ttl=60)
+
+    first = executor.execute(f'cat {notes}', silent=False)
+    second = executor.execute(f'cat {notes}', silent=False)
+    assert second['cached'] is True and second['stdout'] == first['stdout'] == 'one\n'
+    assert len(spawned) == 1
+
+    notes.write_text('one\ntwo\n')
+    assert executor.execute(f'cat {notes}', silent=False)['stdout'] == 'one\ntwo\n'
+
+    executor.execute(f'touch {tmp_path / "other"}')
+    assert executor.cache.entries == {}
+    assert 'cached' not in executor.execute(f'cat {notes}', silent=False)
+    assert len(spawned) == 4
+
+
+def test_cache_ttl_size_bound_and_git_index(tmp_path, monkeypatch):
+    """Test entries expire, the LRU is bounded and git keys on the index"""
+    monkeypatch.chdir(tmp_path)
+    executor = SENASilentExecutor(cache_ttl=0.2, cache_size=2)
+    for name in 'abc':
+        (tmp_path / name).write_text(name)
+        executor.execute(f'cat {name}')
+    assert [key[1][1] for key in executor.cache.entries] == ['b', 'c']
+
+    time.sleep(0.25)
+    assert 'cached' not in executor.execute('cat c')
+
+    executor.cache.ttl = 60
+    subprocess.run(['git', 'init', '-q'], check=True)
+    clean = executor.execute('git status --porcelain', silent=False)
+    assert executor.execute('git status --porcelain', silent=False)['cached'] is True
+
+    subprocess.run(['git', 'add', 'a'], check=True)
+    staged = executor.execute('git status --porcelain', silent=False)
+    assert 'cached' not in staged and staged['stdout'] != clean['stdout']
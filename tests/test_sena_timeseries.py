@@ -0,0 +1,114 @@
+"""
+Tests for SENA Time Series
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'controller'))
+
+from sena_runtime_metrics import MetricsRegistry
+from sena_timeseries import (DEFAULT_CAPACITY, MAX_SIZE, TimeSeriesRecorder, TimeSeriesStore, flatten_snapshot,
+                             frame_size, retention_capacity)
+
+
+def test_ring_buffer_wraps_and_downsamples(tmp_path):
+    """Test the ring keeps the newest frames and queries downsample them"""
+    path = tmp_path / 'metrics.tsdb'
+    store = TimeSeriesStore(path, capacity=50, max_series=4)
+    assert path.stat().st_size == store.records_offset + 50 * (4 + 4 + 4 * 8)
+
+    for minute in range(120):
+        store.append([('latency', float(minute)), ('calls_total', minute * 10.0)],
+                     timestamp=60 * minute)
+
+    assert store.written == 120
+    # The oldest frame is left out in case an append is overwriting it
+    assert len(list(store.records())) == 49 * 2
+    series = store.query('latency', start=0, end=60 * 119, points=5, agg='max')
+    assert list(series) == ['latency']
+    # Only the last 50 minutes survive the wrap
+    assert series['latency'][0][1] >= 70
+    assert series['latency'][-1] == (int(4 * 60 * 119 / 5), 119.0)
+    store.close()
+
+
+def test_reopen_keeps_series_and_reader_sees_writes(tmp_path):
+    """Test ids survive reopening and a read-only map sees new samples"""
+    path = tmp_path / 'metrics.tsdb'
+    writer = TimeSeriesStore(path, capacity=16, max_series=4)
+    writer.append([('a', 1.0), ('b', 2.0)], timestamp=100)
+    writer.close()
+
+    writer = TimeSeriesStore(path, capacity=16, max_series=4)
+    reader = TimeSeriesStore(path, readonly=True)
+    writer.append([('b', 3.0), ('c', 4.0)], timestamp=160)
+
+    assert writer.ids == {'a': 0, 'b': 1, 'c': 2}
+    assert reader.query('b', start=0, end=200, points=1, agg='last') == {'b': [(0, 3.0)]}
+    assert reader.query('', start=0, end=200, points=200)['c'] == [(160, 4.0)]
+
+    # A file with a different layout is reinitialized
+    writer.close()
+    assert TimeSeriesStore(path, capacity=32, max_series=4).written == 0
+    reader.close()
+
+
+class RacingReader(TimeSeriesStore):
+    """Read-only store whose writer appends right after each header read, before the copy"""
+
+    def __init__(self, path, writer, appends):
+        self.writer = writer
+        self.appends = appends
+        super().__init__(path, readonly=True)
+
+    @property
+    def written(self) -> int:
+        written = super().written
+        if self.appends:
+            self.writer.append(self.appends.pop(), timestamp=1000)
+        return written
+
+
+def test_reader_drops_slots_overwritten_during_copy(tmp_path):
+    """Test records overwritten while a reader copies the ring are not returned"""
+    path = tmp_path / 'metrics.tsdb'
+    writer = TimeSeriesStore(path, capacity=6, max_series=2)
+    for minute in range(10):
+        writer.append([('a', float(minute)), ('b', float(minute))], timestamp=60 * minute)
+
+    reader = RacingReader(path, writer, [[('a', -1.0), ('b', -1.0)]])
+    records = list(reader.records())
+
+    # The ring held minutes 4-9; the append overwrote minute 4 and the next may be overwriting minute 5
+    assert [value for _, _, value in records] == [6.0, 6.0, 7.0, 7.0, 8.0, 8.0, 9.0, 9.0]
+    # A later read sees the appended minute as the newest records
+    assert [value for _, _, value in reader.records()][-2:] == [-1.0, -1.0]
+    reader.close()
+    writer.close()
+
+
+def test_default_ring_keeps_a_week_in_a_few_mb(tmp_path):
+    """Test the default ring keeps a week of per-minute frames in about 5 MB"""
+    assert DEFAULT_CAPACITY == 7 * 24 * 60
+    assert retention_capacity(3600) == 7 * 24
+    assert retention_capacity(0.5) == MAX_SIZE // frame_size()
+
+    store = TimeSeriesStore(tmp_path / 'metrics.tsdb')
+    assert store.size < 6 << 20
+    store.close()
+
+
+def test_recorder_samples_registry(tmp_path):
+    """Test registry snapshots are flattened into one series per value"""
+    registry = MetricsRegistry()
+    registry.counter('requests_total', method='stats').inc(3)
+    registry.histogram('request_seconds', method='stats').observe(0.002)
+
+    names = [name for name, _ in flatten_snapshot(registry.snapshot())]
+    assert 'requests_total{method="stats"}' in names
+    assert 'request_seconds_p99{method="stats"}' in names
+
+    store = TimeSeriesStore(tmp_path / 'metrics.tsdb', capacity=64)
+    recorder = TimeSeriesRecorder(store, registry, interval=3600)
+    assert recorder.sample() == len(names)
@@ -0,0 +1,56 @@
+"""
+Tests for SENA Tracing
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'controller'))
+
+from sena_tracing import Tracer, load_trace
+
+
+def test_spans_nest_under_active_trace(tmp_path):
+    """Test spans carry the trace id and their parent, and flush as Chrome events"""
+    tracer = Tracer(tmp_path / 'trace.json')
+    with tracer.activate('t1'):
+        with tracer.span('daemon.handle', method='stats'):
+            with tracer.span('formatter.detect_format_needed'):
+                pass
+    tracer.add('client.nc_roundtrip', 100, 250, {'trace_id': 't1'})
+    tracer.flush(force=True)
+
+    events = {event['name']: event for event in load_trace(tmp_path / 'trace.json')}
+    inner, outer = events['formatter.detect_format_needed'], events['daemon.handle']
+    assert inner['args'] == {'trace_id': 't1', 'parent': 'daemon.handle'}
+    assert outer['args'] == {'method': 'stats', 'trace_id': 't1'}
+    assert outer['ph'] == 'X' and outer['cat'] == 'daemon'
+    assert outer['ts'] <= inner['ts'] and inner['ts'] + inner['dur'] <= outer['ts'] + outer['dur']
+    assert events['client.nc_roundtrip']['dur'] == 150
+
+
+def test_no_spans_without_trace(tmp_path):
+    """Test span() is a no-op when no trace is active"""
+    tracer = Tracer(tmp_path / 'trace.json')
+    with tracer.span('daemon.handle'):
+        pass
+    tracer.flush(force=True)
+    assert not (tmp_path / 'trace.json').exists()
+
+
+def test_trace_file_accepts_appends_from_other_writers(tmp_path):
+    """Test the unterminated array stays loadable across writers and flushes"""
+    path = tmp_path / 'trace.json'
+    tracer = Tracer(path, flush_every=2)
+    tracer.ensure_file()
+    with path.open('a') as f:
+        f.write('{"name":"client.jq_escape","ph":"X","ts":1,"dur":2,"pid":1,"tid":1,"args":{}},\n')
+    with tracer.activate():
+        with tracer.span('a'):
+            pass
+        tracer.flush()
+        assert len(load_trace(path)) == 1
+        with tracer.span('b'):
+            pass
+        tracer.flush()
+    assert [event['name'] for event in load_trace(path)] == ['client.jq_escape', 'a', 'b']
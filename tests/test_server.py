@@ -4,6 +4,7 @@ Tests for SENA MCP Server
 
 import pytest
 from sena_mcp.server import (
+    VERSION,
     sena_brilliant_thinking,
     sena_verify_truth,
     sena_format_table,
@@ -72,7 +73,7 @@ def test_get_health():
     """Test health check tool"""
     result = sena_get_health()
     assert result["status"] == "healthy"
-    assert result["version"] == "1.0.0"
+    assert result["version"] == VERSION
     assert result["mode"] == "mcp"
     assert "brilliant_thinking" in result["components"]
     assert result["components"]["brilliant_thinking"] == "operational"
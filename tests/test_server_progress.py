@@ -0,0 +1,62 @@
+"""
+Tests for SENA MCP progress notifications
+"""
+
+import asyncio
+
+from mcp.shared.memory import create_connected_server_and_client_session
+
+import sena_mcp.progress
+from sena_mcp.progress import ProgressReporter
+from sena_mcp.server import mcp, sena_analyze_code
+
+
+async def _call_with_progress(name, arguments):
+    """Call a tool over an in-memory session, collecting progress updates"""
+    updates = []
+
+    async def on_progress(progress, total, message):
+        updates.append((progress, total, message))
+
+    async with create_connected_server_and_client_session(mcp._mcp_server) as client:
+        result = await client.call_tool(name, arguments, progress_callback=on_progress)
+
+    return result, updates
+
+
+def test_tool_reports_progress(monkeypatch):
+    """Test multi-step tools send one notification per step"""
+    monkeypatch.setattr(sena_mcp.progress, "PROGRESS_MIN_INTERVAL", 0.0)
+    result, updates = asyncio.run(_call_with_progress(
+        "sena_analyze_code", {"code": "x = 1", "language": "python"}
+    ))
+
+    assert not result.isError
+    assert updates[0] == (0, 3, "Code overview")
+    assert updates[-1] == (3, 3, "Complete")
+    assert [step for step, _, _ in updates] == sorted(step for step, _, _ in updates)
+
+
+def test_progress_is_throttled():
+    """Test intermediate steps are dropped within the interval, final is kept"""
+    sent = []
+
+    class FakeContext:
+        async def report_progress(self, progress, total=None, message=None):
+            sent.append(progress)
+
+    async def run():
+        reporter = ProgressReporter(FakeContext(), asyncio.get_running_loop(), min_interval=60)
+        await asyncio.to_thread(lambda: [reporter(i, 100, "") for i in range(101)])
+        await reporter.flush()
+        return reporter
+
+    reporter = asyncio.run(run())
+    assert sent == [0, 100]
+    assert reporter.dropped == 99
+
+
+def test_sync_call_unchanged():
+    """Test tools still work as plain functions without progress"""
+    result = sena_analyze_code(code="x = 1", language="python")
+    assert result["status"] == "success"